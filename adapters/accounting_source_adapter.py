@@ -1,23 +1,75 @@
 from __future__ import annotations
 
-from typing import Protocol
+from datetime import datetime
+from typing import Callable, Iterator, Optional, Protocol
 from typing import Sequence
 
-from common.ingestion_types import SourceInvoicePayload
+from common.ingestion_types import IngestionSource, SourceChangeBatch, SourceInvoicePayload
+from common.source_resilience import CircuitBreaker, ResilientSource, RetryPolicy
 from ports.outbound.accounting_source_port import AccountingSourcePort
+from ports.outbound.async_accounting_source_port import AsyncAccountingSourcePort
+from ports.outbound.ingestion_alert_port import IngestionAlertPort, report_circuit_transition
 
 
 class AccountingClient(Protocol):
-    def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> Sequence[SourceInvoicePayload]:
+        ...
+
+    def iter_new_invoices(self, timeout: Optional[float] = None) -> Iterator[SourceInvoicePayload]:
+        ...
+
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+        ...
+
+
+class AsyncAccountingClient(Protocol):
+    async def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
         ...
 
 
 class AccountingSourceAdapter(AccountingSourcePort):
-    def __init__(self, client: AccountingClient) -> None:
+    def __init__(
+        self,
+        client: AccountingClient,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        alert_port: Optional[IngestionAlertPort] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
         self._client = client
+        self._source = ResilientSource(
+            "Accounting",
+            circuit_breaker=circuit_breaker,
+            retry_policy=retry_policy,
+            on_transition=(
+                lambda previous, current: report_circuit_transition(
+                    alert_port, IngestionSource.ACCOUNTING_SYSTEM, previous, current, occurred_at=clock())
+            ) if alert_port is not None else None,
+        )
 
-    def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> Sequence[SourceInvoicePayload]:
+        return self._source.fetch(self._client.fetch_new_invoices, timeout)
+
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        # Chunking needs the client's streaming call; materializing the feed would defeat the bounded memory.
+        return self._source.fetch_chunks(self._client.iter_new_invoices, chunk_size, timeout)
+
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+        # Safe to retry: the same watermark always asks for the same page of changes.
+        return self._source.call(lambda: self._client.fetch_changes_since(watermark, limit))
+
+
+class AsyncAccountingSourceAdapter(AsyncAccountingSourcePort):
+    def __init__(self, client: AsyncAccountingClient) -> None:
+        self._client = client
+
+    async def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
         try:
-            return self._client.fetch_new_invoices()
+            return await self._client.fetch_new_invoices()
         except Exception as exc:
             raise RuntimeError("Accounting source fetch failed") from exc
+
@@ -1,23 +1,68 @@
 from __future__ import annotations
 
-from typing import Protocol
+from datetime import datetime
+from typing import Callable, Iterator, Optional, Protocol
 from typing import Sequence
 
-from common.ingestion_types import SourceInvoicePayload
+from common.ingestion_types import IngestionSource, SourceInvoicePayload
+from common.source_resilience import CircuitBreaker, ResilientSource, RetryPolicy
 from ports.outbound.ap_email_source_port import ApEmailSourcePort
+from ports.outbound.async_ap_email_source_port import AsyncApEmailSourcePort
+from ports.outbound.ingestion_alert_port import IngestionAlertPort, report_circuit_transition
 
 
 class ApEmailClient(Protocol):
-    def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> Sequence[SourceInvoicePayload]:
+        ...
+
+    def iter_new_invoices(self, timeout: Optional[float] = None) -> Iterator[SourceInvoicePayload]:
+        ...
+
+
+class AsyncApEmailClient(Protocol):
+    async def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
         ...
 
 
 class ApEmailAdapter(ApEmailSourcePort):
-    def __init__(self, client: ApEmailClient) -> None:
+    def __init__(
+        self,
+        client: ApEmailClient,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        alert_port: Optional[IngestionAlertPort] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
         self._client = client
+        self._source = ResilientSource(
+            "AP email",
+            circuit_breaker=circuit_breaker,
+            retry_policy=retry_policy,
+            on_transition=(
+                lambda previous, current: report_circuit_transition(
+                    alert_port, IngestionSource.AP_EMAIL, previous, current, occurred_at=clock())
+            ) if alert_port is not None else None,
+        )
+
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> Sequence[SourceInvoicePayload]:
+        return self._source.fetch(self._client.fetch_new_invoices, timeout)
 
-    def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        # Chunking needs the client's streaming call; materializing the feed would defeat the bounded memory.
+        return self._source.fetch_chunks(self._client.iter_new_invoices, chunk_size, timeout)
+
+
+class AsyncApEmailAdapter(AsyncApEmailSourcePort):
+    def __init__(self, client: AsyncApEmailClient) -> None:
+        self._client = client
+
+    async def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
         try:
-            return self._client.fetch_new_invoices()
+            return await self._client.fetch_new_invoices()
         except Exception as exc:
             raise RuntimeError("AP email source fetch failed") from exc
+
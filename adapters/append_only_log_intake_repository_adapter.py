@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Mapping, Optional, Sequence
+
+from common.ingestion_types import (
+    HistoryPurgeResult,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionHistoryEntry,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+)
+from ports.outbound.intake_repository_port import IntakeRepositoryPort
+
+# Format version 2: every record is compact JSON behind a (length, CRC-32) header, so files stay
+# readable across interpreter upgrades and a torn or zero-filled tail is detected rather than decoded.
+# Snapshot version 3 uses the same records: a [generation, invoice count] header, then one per invoice.
+_SNAPSHOT_MAGIC = b"INTKSNP3"
+_LOG_MAGIC = b"INTKWAL2"
+_SNAPSHOT_FILE = "snapshot.bin"
+_LOG_FILE = re.compile(r"^wal-(\d{12})\.log$")
+_RECORD_HEADER = struct.Struct("<II")
+_SAVE = 0
+_APPEND = 1
+_PURGE = 2
+_RESTORE_BATCH_SIZE = 10_000
+
+
+def _append_record(event: IngestionHistoryAppend) -> list[Any]:
+    return [_APPEND, event.dedupe_key, event.source.value, event.processed_at.isoformat(), event.status]
+
+
+def _log_name(generation: int) -> str:
+    return f"wal-{generation:012d}.log"
+
+
+def _pack(record: Any) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _unpack(view: memoryview, offset: int) -> Optional[tuple[Any, int]]:
+    # Returns the record at `offset` and the offset after it, or None when it is incomplete or corrupt.
+    if offset + _RECORD_HEADER.size > len(view):
+        return None
+    length, checksum = _RECORD_HEADER.unpack_from(view, offset)
+    end = offset + _RECORD_HEADER.size + length
+    if length == 0 or end > len(view):
+        return None
+    payload = view[offset + _RECORD_HEADER.size:end]
+    if zlib.crc32(payload) != checksum:
+        return None
+    return json.loads(bytes(payload)), end
+
+
+def _encode_invoice(invoice: IngestedInvoice) -> list[Any]:
+    metadata = invoice.metadata
+    return [
+        invoice.dedupe_key,
+        metadata.invoice_number,
+        metadata.supplier,
+        metadata.amount,
+        metadata.invoice_date.isoformat(),
+        invoice.file_hash,
+        [
+            [event.source.value, event.ingested_at.isoformat(), event.status, event.first_seen_at.isoformat(), event.seen_count]
+            for event in invoice.history
+        ],
+    ]
+
+
+def _decode_invoice(record: Sequence[Any]) -> IngestedInvoice:
+    dedupe_key, invoice_number, supplier, amount, invoice_date, file_hash, history = record
+    return IngestedInvoice(
+        dedupe_key=dedupe_key,
+        metadata=InvoiceMetadata(
+            invoice_number=invoice_number,
+            supplier=supplier,
+            amount=amount,
+            invoice_date=datetime.fromisoformat(invoice_date),
+        ),
+        file_hash=file_hash,
+        history=[
+            IngestionHistoryEntry(
+                source=IngestionSource(source),
+                ingested_at=datetime.fromisoformat(ingested_at),
+                status=status,
+                first_seen_at=datetime.fromisoformat(first_seen_at),
+                seen_count=seen_count,
+            )
+            for source, ingested_at, status, first_seen_at, seen_count in history
+        ],
+    )
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[memoryview]:
+    if path.stat().st_size == 0:
+        yield memoryview(b"")
+        return
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+class AppendOnlyLogIntakeRepositoryAdapter(IntakeRepositoryPort):
+    def __init__(
+        self,
+        directory: str,
+        state: IntakeRepositoryPort,
+        fsync_batch_size: int = 64,
+        snapshot_every: int = 100_000,
+    ) -> None:
+        # `state` is the materialized view the log is replayed into and must start empty.
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._state = state
+        self._fsync_batch_size = fsync_batch_size
+        self._snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._unsynced_records = 0
+        self._records_since_snapshot = 0
+        self._generation = self._recover()
+        self._log = self._open_log(self._generation)
+
+    def find_by_dedupe_key(self, dedupe_key: str) -> Optional[IngestedInvoice]:
+        return self._state.find_by_dedupe_key(dedupe_key)
+
+    def find_many_by_dedupe_keys(self, dedupe_keys: Sequence[str]) -> Mapping[str, IngestedInvoice]:
+        return self._state.find_many_by_dedupe_keys(dedupe_keys)
+
+    def save_new(self, invoice: IngestedInvoice) -> IngestedInvoice:
+        return self.save_many([invoice])[0]
+
+    def save_many(self, invoices: Sequence[IngestedInvoice]) -> Sequence[IngestedInvoice]:
+        with self._lock:
+            self._write([[_SAVE, _encode_invoice(invoice)] for invoice in invoices])
+            saved = self._state.save_many(invoices)
+            self._snapshot_if_due()
+            return saved
+
+    def append_history(self, dedupe_key: str, source: IngestionSource, processed_at: datetime, status: str) -> IngestedInvoice:
+        return self.append_history_many([
+            IngestionHistoryAppend(dedupe_key=dedupe_key, source=source, processed_at=processed_at, status=status)
+        ])[0]
+
+    def append_history_many(self, events: Sequence[IngestionHistoryAppend]) -> Sequence[IngestedInvoice]:
+        with self._lock:
+            existing = self._state.find_many_by_dedupe_keys(list({event.dedupe_key for event in events}))
+            missing = [event.dedupe_key for event in events if event.dedupe_key not in existing]
+            if missing:
+                raise KeyError(missing[0])
+            self._write([_append_record(event) for event in events])
+            appended = self._state.append_history_many(events)
+            self._snapshot_if_due()
+            return appended
+
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        return self.save_new_or_append_history_many([candidate])[0]
+
+    def save_new_or_append_history_many(
+        self,
+        candidates: Sequence[IngestionCandidate],
+    ) -> Sequence[tuple[IngestedInvoice, bool]]:
+        # Outcomes are decided up front under the lock so the log is written before the state changes,
+        # like every other writer; the state then resolves the batch the same way.
+        with self._lock:
+            known = set(self._state.find_many_by_dedupe_keys(
+                list({candidate.invoice.dedupe_key for candidate in candidates})))
+            records: list[list[Any]] = []
+            for candidate in candidates:
+                if candidate.invoice.dedupe_key in known:
+                    records.extend(_append_record(event) for event in candidate.duplicate_events)
+                else:
+                    known.add(candidate.invoice.dedupe_key)
+                    records.append([_SAVE, _encode_invoice(candidate.invoice)])
+            self._write(records)
+            results = self._state.save_new_or_append_history_many(candidates)
+            self._snapshot_if_due()
+            return results
+
+    def list_by_source_sorted(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        return self._state.list_by_source_sorted(source=source, newest_first=newest_first, limit=limit, after=after)
+
+    def purge_history_before(self, cutoff: datetime) -> HistoryPurgeResult:
+        with self._lock:
+            self._write([[_PURGE, cutoff.isoformat()]])
+            result = self._state.purge_history_before(cutoff)
+            self._snapshot_if_due()
+            return result
+
+    def change_version(self) -> int:
+        return self._state.change_version()
+
+    def iter_dedupe_keys(self) -> Iterator[str]:
+        return self._state.iter_dedupe_keys()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced_records = 0
+
+    def snapshot(self) -> None:
+        self._snapshot_lock.acquire()
+        with self._lock:
+            generation, invoices = self._rotate()
+        self._write_snapshot(generation, invoices)
+
+    def close(self) -> None:
+        # Waits for a background snapshot so the directory is left with a complete one.
+        with self._snapshot_lock:
+            with self._lock:
+                self.flush()
+                self._log.close()
+
+    def _open_log(self, generation: int) -> BinaryIO:
+        log = (self._directory / _log_name(generation)).open("ab")
+        if log.tell() == 0:
+            log.write(_LOG_MAGIC)
+        return log
+
+    def _write(self, records: Sequence[list[Any]]) -> None:
+        self._log.write(b"".join(_pack(record) for record in records))
+        self._unsynced_records += len(records)
+        self._records_since_snapshot += len(records)
+        if self._unsynced_records >= self._fsync_batch_size:
+            self.flush()
+
+    def _snapshot_if_due(self) -> None:
+        # Writers only rotate the log and capture the invoices; encoding and fsyncing the snapshot runs on a
+        # background thread, and a snapshot still in flight makes later ones wait for the next threshold.
+        if self._records_since_snapshot < self._snapshot_every or not self._snapshot_lock.acquire(blocking=False):
+            return
+        generation, invoices = self._rotate()
+        threading.Thread(target=self._write_snapshot, args=(generation, invoices), daemon=True).start()
+
+    def _rotate(self) -> tuple[int, Sequence[IngestedInvoice]]:
+        # Called holding both locks; the snapshot lock is given back if rotating fails. Returned invoices are
+        # copies, so the state can move on while they are written; the new generation's log holds the rest.
+        try:
+            self.flush()
+            self._log.close()
+            invoices = self._state.find_many_by_dedupe_keys(list(self._state.iter_dedupe_keys()))
+            self._generation += 1
+            self._log = self._open_log(self._generation)
+        except BaseException:
+            self._snapshot_lock.release()
+            raise
+        self._records_since_snapshot = 0
+        return self._generation, list(invoices.values())
+
+    def _write_snapshot(self, generation: int, invoices: Sequence[IngestedInvoice]) -> None:
+        # Runs holding the snapshot lock, which it releases, so snapshots replace each other in order.
+        try:
+            temporary = self._directory / f"{_SNAPSHOT_FILE}.tmp"
+            with temporary.open("wb") as handle:
+                handle.write(_SNAPSHOT_MAGIC)
+                handle.write(_pack([generation, len(invoices)]))
+                for invoice in invoices:
+                    handle.write(_pack(_encode_invoice(invoice)))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self._directory / _SNAPSHOT_FILE)
+            self._remove_logs_before(generation)
+        finally:
+            self._snapshot_lock.release()
+
+    def _recover(self) -> int:
+        generation = 0
+        snapshot_path = self._directory / _SNAPSHOT_FILE
+        if snapshot_path.exists():
+            with _mapped(snapshot_path) as view:
+                header = _unpack(view, len(_SNAPSHOT_MAGIC)) if view[:len(_SNAPSHOT_MAGIC)] == _SNAPSHOT_MAGIC else None
+                if header is None:
+                    raise RuntimeError(f"Unrecognized or corrupt intake snapshot: {snapshot_path}")
+                (generation, count), offset = header
+                # Invoices are decoded one record at a time straight from the mapping and restored in batches.
+                batch: list[IngestedInvoice] = []
+                for restored in range(count):
+                    unpacked = _unpack(view, offset)
+                    if unpacked is None:
+                        raise RuntimeError(f"Truncated intake snapshot after {restored} invoices: {snapshot_path}")
+                    record, offset = unpacked
+                    batch.append(_decode_invoice(record))
+                    if len(batch) == _RESTORE_BATCH_SIZE:
+                        self._state.save_many(batch)
+                        batch = []
+                self._state.save_many(batch)
+
+        self._remove_logs_before(generation)
+        tail = sorted(
+            int(match.group(1))
+            for match in (_LOG_FILE.match(path.name) for path in self._directory.iterdir())
+            if match
+        )
+        for log_generation in tail:
+            self._replay(self._directory / _log_name(log_generation))
+        return tail[-1] if tail else generation
+
+    def _replay(self, path: Path) -> None:
+        offset = len(_LOG_MAGIC)
+        with _mapped(path) as view:
+            if len(view) >= len(_LOG_MAGIC) and view[:len(_LOG_MAGIC)] != _LOG_MAGIC:
+                raise RuntimeError(f"Unrecognized intake log: {path}")
+            while (unpacked := _unpack(view, offset)) is not None:
+                record, offset = unpacked
+                if record[0] == _SAVE:
+                    self._state.save_new(_decode_invoice(record[1]))
+                elif record[0] == _PURGE:
+                    self._state.purge_history_before(datetime.fromisoformat(record[1]))
+                else:
+                    _, dedupe_key, source, ingested_at, status = record
+                    self._state.append_history(
+                        dedupe_key=dedupe_key,
+                        source=IngestionSource(source),
+                        processed_at=datetime.fromisoformat(ingested_at),
+                        status=status,
+                    )
+                self._records_since_snapshot += 1
+        if offset != path.stat().st_size:
+            # Drop a record torn by a crash mid-write (short, zero-filled or failing its CRC) so new
+            # appends start on a record boundary; a file torn inside its header is restarted.
+            with path.open("r+b") as handle:
+                handle.truncate(offset if offset <= path.stat().st_size else 0)
+
+    def _remove_logs_before(self, generation: int) -> None:
+        for path in self._directory.iterdir():
+            match = _LOG_FILE.match(path.name)
+            if match and int(match.group(1)) < generation:
+                path.unlink()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
+
+from common.ingestion_types import (
+    HistoryPurgeResult,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    IntakeCursor,
+)
+from ports.outbound.intake_repository_port import IntakeRepositoryPort
+
+_FILTER_MAGIC = b"INTKBLM1"
+_FILTER_HEADER = struct.Struct("<8sQI")
+
+
+@dataclass(frozen=True)
+class BloomFilterStats:
+    hits: int
+    misses: int
+    false_positives: int
+
+
+class BloomFilterIntakeRepositoryAdapter(IntakeRepositoryPort):
+    # Keys are only ever added: purged invoices stay in the filter and show up as false positives.
+    # The persisted filter is consumed on open and rewritten on close, so after a crash, or if
+    # another process wrote to the backend, the filter is rebuilt from iter_dedupe_keys instead.
+    def __init__(
+        self,
+        repository: IntakeRepositoryPort,
+        expected_invoices: int,
+        false_positive_rate: float = 0.01,
+        filter_path: Optional[str] = None,
+    ) -> None:
+        self._repository = repository
+        self._filter_path = Path(filter_path) if filter_path is not None else None
+        self._bit_count = max(
+            8, math.ceil(-expected_invoices * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._hash_count = max(1, round(self._bit_count / max(expected_invoices, 1) * math.log(2)))
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._false_positives = 0
+        self._bits = self._load() or self._rebuild()
+
+    def stats(self) -> BloomFilterStats:
+        with self._lock:
+            return BloomFilterStats(hits=self._hits, misses=self._misses, false_positives=self._false_positives)
+
+    def find_by_dedupe_key(self, dedupe_key: str) -> Optional[IngestedInvoice]:
+        return self.find_many_by_dedupe_keys([dedupe_key]).get(dedupe_key)
+
+    def find_many_by_dedupe_keys(self, dedupe_keys: Sequence[str]) -> Mapping[str, IngestedInvoice]:
+        maybe_present = [dedupe_key for dedupe_key in dedupe_keys if self._might_contain(dedupe_key)]
+        found = self._repository.find_many_by_dedupe_keys(maybe_present) if maybe_present else {}
+        with self._lock:
+            self._misses += len(dedupe_keys) - len(maybe_present)
+            self._hits += len(found)
+            self._false_positives += len(maybe_present) - len(found)
+        return found
+
+    def save_new(self, invoice: IngestedInvoice) -> IngestedInvoice:
+        self._add([invoice.dedupe_key])
+        return self._repository.save_new(invoice)
+
+    def save_many(self, invoices: Sequence[IngestedInvoice]) -> Sequence[IngestedInvoice]:
+        self._add(invoice.dedupe_key for invoice in invoices)
+        return self._repository.save_many(invoices)
+
+    def append_history(self, dedupe_key: str, source: IngestionSource, processed_at: datetime, status: str) -> IngestedInvoice:
+        return self._repository.append_history(dedupe_key, source, processed_at, status)
+
+    def append_history_many(self, events: Sequence[IngestionHistoryAppend]) -> Sequence[IngestedInvoice]:
+        return self._repository.append_history_many(events)
+
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        self._add([candidate.invoice.dedupe_key])
+        return self._repository.save_new_or_append_history(candidate)
+
+    def save_new_or_append_history_many(
+        self,
+        candidates: Sequence[IngestionCandidate],
+    ) -> Sequence[tuple[IngestedInvoice, bool]]:
+        self._add(candidate.invoice.dedupe_key for candidate in candidates)
+        return self._repository.save_new_or_append_history_many(candidates)
+
+    def list_by_source_sorted(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        return self._repository.list_by_source_sorted(source=source, newest_first=newest_first, limit=limit, after=after)
+
+    def purge_history_before(self, cutoff: datetime) -> HistoryPurgeResult:
+        return self._repository.purge_history_before(cutoff)
+
+    def change_version(self) -> int:
+        return self._repository.change_version()
+
+    def iter_dedupe_keys(self) -> Iterator[str]:
+        return self._repository.iter_dedupe_keys()
+
+    def close(self) -> None:
+        if self._filter_path is None:
+            return
+        temporary = self._filter_path.with_name(f"{self._filter_path.name}.tmp")
+        with self._lock, temporary.open("wb") as handle:
+            handle.write(_FILTER_HEADER.pack(_FILTER_MAGIC, self._bit_count, self._hash_count))
+            handle.write(self._bits)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._filter_path)
+
+    def _load(self) -> Optional[bytearray]:
+        if self._filter_path is None or not self._filter_path.exists():
+            return None
+        raw = self._filter_path.read_bytes()
+        self._filter_path.unlink()
+        if len(raw) < _FILTER_HEADER.size:
+            return None
+        magic, bit_count, hash_count = _FILTER_HEADER.unpack_from(raw)
+        bits = bytearray(raw[_FILTER_HEADER.size:])
+        if (magic, bit_count, hash_count) != (_FILTER_MAGIC, self._bit_count, self._hash_count):
+            return None
+        return bits if len(bits) == (bit_count + 7) // 8 else None
+
+    def _rebuild(self) -> bytearray:
+        self._bits = bytearray((self._bit_count + 7) // 8)
+        self._add(self._repository.iter_dedupe_keys())
+        return self._bits
+
+    def _positions(self, dedupe_key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(dedupe_key.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self._bit_count for index in range(self._hash_count))
+
+    def _might_contain(self, dedupe_key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(dedupe_key))
+
+    def _add(self, dedupe_keys: Iterable[str]) -> None:
+        with self._lock:
+            bits = self._bits
+            for dedupe_key in dedupe_keys:
+                for position in self._positions(dedupe_key):
+                    bits[position >> 3] |= 1 << (position & 7)
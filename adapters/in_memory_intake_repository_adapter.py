@@ -1,36 +1,248 @@
 from __future__ import annotations
 
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import ExitStack
+from dataclasses import replace
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import Iterator, Mapping, Optional, Sequence
 
-from common.ingestion_types import IngestedInvoice, IngestionSource
+from common.ingestion_types import (
+    HistoryPurgeResult,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionHistoryEntry,
+    IngestionSource,
+    IntakeCursor,
+    history_partition,
+    history_partition_start,
+)
 from ports.outbound.intake_repository_port import IntakeRepositoryPort
 
+_RecencyEntry = tuple[datetime, str]
+_MonthPartition = dict[str, list[IngestionHistoryEntry]]
+
 
 class InMemoryIntakeRepositoryAdapter(IntakeRepositoryPort):
-    def __init__(self) -> None:
+    def __init__(self, lock_stripes: int = 64, compact_duplicates: bool = False) -> None:
+        # Writers serialize per dedupe key on a striped lock; the shared recency indexes
+        # have their own short-lived lock so unrelated invoices never wait on each other's writes.
+        self._key_locks = [threading.RLock() for _ in range(lock_stripes)]
+        self._compact_duplicates = compact_duplicates
+        self._index_lock = threading.Lock()
+        # Invoice heads without history; reads assemble the history from the month partitions.
         self._items: dict[str, IngestedInvoice] = {}
+        self._latest_ingested_at: dict[str, datetime] = {}
+        self._sources_by_key: dict[str, set[IngestionSource]] = {}
+        # Ascending (latest ingested_at, dedupe_key) entries; the None key indexes all sources.
+        self._recency_index: dict[Optional[IngestionSource], list[_RecencyEntry]] = {
+            None: [],
+            **{source: [] for source in IngestionSource},
+        }
+        # Month partition -> dedupe key -> that invoice's entries for the month, so expiring a month drops
+        # one bucket; `_months_by_key` lists each key's months in order.
+        self._partitions: dict[str, _MonthPartition] = {}
+        self._months_by_key: dict[str, list[str]] = {}
+        self._version = 0
 
     def find_by_dedupe_key(self, dedupe_key: str) -> Optional[IngestedInvoice]:
-        return self._items.get(dedupe_key)
+        head = self._items.get(dedupe_key)
+        return self._materialize(head) if head is not None else None
+
+    def find_many_by_dedupe_keys(self, dedupe_keys: Sequence[str]) -> Mapping[str, IngestedInvoice]:
+        heads = ((dedupe_key, self._items.get(dedupe_key)) for dedupe_key in dedupe_keys)
+        return {dedupe_key: self._materialize(head) for dedupe_key, head in heads if head is not None}
 
     def save_new(self, invoice: IngestedInvoice) -> IngestedInvoice:
-        self._items[invoice.dedupe_key] = invoice
+        dedupe_key = invoice.dedupe_key
+        with self._key_lock(dedupe_key):
+            with self._index_lock:
+                self._version += 1
+                self._unindex(dedupe_key)
+                self._drop_history(dedupe_key)
+                self._items[dedupe_key] = replace(invoice, history=[])
+                for event in invoice.history:
+                    self._month_entries(dedupe_key, event.ingested_at).append(event)
+                if invoice.history:
+                    self._index(
+                        dedupe_key=dedupe_key,
+                        latest=invoice.latest_ingested_at,
+                        sources={event.source for event in invoice.history},
+                    )
         return invoice
 
+    def save_many(self, invoices: Sequence[IngestedInvoice]) -> Sequence[IngestedInvoice]:
+        return [self.save_new(invoice) for invoice in invoices]
+
     def append_history(self, dedupe_key: str, source: IngestionSource, processed_at: datetime, status: str) -> IngestedInvoice:
-        invoice = self._items[dedupe_key]
-        invoice.record_event(source=source, ingested_at=processed_at, status=status)
-        return invoice
+        with self._key_lock(dedupe_key):
+            head = self._items[dedupe_key]
+            with self._index_lock:
+                self._version += 1
+                entries = self._month_entries(dedupe_key, processed_at)
+                previous = self._latest_ingested_at.get(dedupe_key)
+                self._index(
+                    dedupe_key=dedupe_key,
+                    latest=processed_at if previous is None or processed_at > previous else previous,
+                    sources={source},
+                )
+            # Compaction only folds into a sighting from the same month, so every entry stays in the
+            # partition its ingested_at belongs to.
+            replace(head, history=entries).record_event(
+                source=source, ingested_at=processed_at, status=status, compact=self._compact_duplicates)
+            return self._materialize(head)
 
-    def list_by_source_sorted(self, source: Optional[IngestionSource], newest_first: bool = True) -> Sequence[IngestedInvoice]:
-        filtered = [
-            invoice
-            for invoice in self._items.values()
-            if source is None or any(event.source == source for event in invoice.history)
+    def append_history_many(self, events: Sequence[IngestionHistoryAppend]) -> Sequence[IngestedInvoice]:
+        return [
+            self.append_history(
+                dedupe_key=event.dedupe_key,
+                source=event.source,
+                processed_at=event.processed_at,
+                status=event.status,
+            )
+            for event in events
         ]
-        return sorted(
-            filtered,
-            key=lambda invoice: max(event.ingested_at for event in invoice.history),
-            reverse=newest_first,
+
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        dedupe_key = candidate.invoice.dedupe_key
+        with self._key_lock(dedupe_key):
+            if dedupe_key not in self._items:
+                return self.save_new(candidate.invoice), True
+            for event in candidate.duplicate_events:
+                self.append_history(
+                    dedupe_key=dedupe_key,
+                    source=event.source,
+                    processed_at=event.processed_at,
+                    status=event.status,
+                )
+            return self._materialize(self._items[dedupe_key]), False
+
+    def save_new_or_append_history_many(
+        self,
+        candidates: Sequence[IngestionCandidate],
+    ) -> Sequence[tuple[IngestedInvoice, bool]]:
+        return [self.save_new_or_append_history(candidate) for candidate in candidates]
+
+    def list_by_source_sorted(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        with self._index_lock:
+            index = self._recency_index[source]
+            if newest_first:
+                stop = len(index) if after is None else bisect_left(index, (after.ingested_at, after.dedupe_key))
+                start = 0 if limit is None else max(stop - limit, 0)
+                entries = index[start:stop][::-1]
+            else:
+                start = 0 if after is None else bisect_right(index, (after.ingested_at, after.dedupe_key))
+                stop = len(index) if limit is None else start + limit
+                entries = index[start:stop]
+        return [self._materialize(self._items[dedupe_key]) for _, dedupe_key in entries]
+
+    def purge_history_before(self, cutoff: datetime) -> HistoryPurgeResult:
+        # Expired months are dropped whole. An invoice whose latest event is before the boundary has nothing
+        # left, and those form a prefix of the recency index; survivors only lose sources seen in dropped months.
+        boundary = history_partition_start(cutoff)
+        with ExitStack() as stack:
+            for lock in self._key_locks:
+                stack.enter_context(lock)
+            with self._index_lock:
+                expired = sorted(month for month in self._partitions if month < history_partition(boundary))
+                dropped = [self._partitions.pop(month) for month in expired]
+                index = self._recency_index[None]
+                emptied = [dedupe_key for _, dedupe_key in index[:bisect_left(index, (boundary, ""))]]
+                for dedupe_key in emptied:
+                    self._unindex(dedupe_key)
+                    del self._items[dedupe_key]
+                    del self._months_by_key[dedupe_key]
+                for dedupe_key in set().union(*dropped).difference(emptied):
+                    self._months_by_key[dedupe_key] = [
+                        month for month in self._months_by_key[dedupe_key] if month in self._partitions]
+                    self._unindex_sources(dedupe_key, {event.source for event in self._history_of(dedupe_key)})
+                if expired:
+                    self._version += 1
+                oldest_retained_at = next(
+                    (
+                        min(event.ingested_at for entries in self._partitions[month].values() for event in entries)
+                        for month in sorted(self._partitions)
+                        if self._partitions[month]
+                    ),
+                    None,
+                )
+
+        purged = [event.ingested_at for partition in dropped for entries in partition.values() for event in entries]
+        return HistoryPurgeResult(
+            cutoff=boundary,
+            dropped_partitions=tuple(expired),
+            purged_events=len(purged),
+            purged_invoices=len(emptied),
+            newest_purged_at=max(purged, default=None),
+            oldest_retained_at=oldest_retained_at,
         )
+
+    def change_version(self) -> int:
+        return self._version
+
+    def iter_dedupe_keys(self) -> Iterator[str]:
+        return iter(list(self._items))
+
+    def _materialize(self, head: IngestedInvoice) -> IngestedInvoice:
+        return replace(head, history=self._history_of(head.dedupe_key))
+
+    def _history_of(self, dedupe_key: str) -> list[IngestionHistoryEntry]:
+        history: list[IngestionHistoryEntry] = []
+        for month in self._months_by_key.get(dedupe_key, ()):
+            history.extend(self._partitions.get(month, {}).get(dedupe_key, ()))
+        return history
+
+    def _month_entries(self, dedupe_key: str, ingested_at: datetime) -> list[IngestionHistoryEntry]:
+        month = history_partition(ingested_at)
+        months = self._months_by_key.setdefault(dedupe_key, [])
+        if month not in months:
+            insort(months, month)
+        return self._partitions.setdefault(month, {}).setdefault(dedupe_key, [])
+
+    def _drop_history(self, dedupe_key: str) -> None:
+        for month in self._months_by_key.pop(dedupe_key, ()):
+            partition = self._partitions[month]
+            del partition[dedupe_key]
+            if not partition:
+                del self._partitions[month]
+
+    def _key_lock(self, dedupe_key: str) -> threading.RLock:
+        return self._key_locks[hash(dedupe_key) % len(self._key_locks)]
+
+    def _index(self, dedupe_key: str, latest: datetime, sources: set[IngestionSource]) -> None:
+        previous = self._latest_ingested_at.get(dedupe_key)
+        known_sources = self._sources_by_key.setdefault(dedupe_key, set())
+        if previous != latest:
+            for index_source in (None, *known_sources):
+                index = self._recency_index[index_source]
+                if previous is not None:
+                    del index[bisect_left(index, (previous, dedupe_key))]
+                insort(index, (latest, dedupe_key))
+            self._latest_ingested_at[dedupe_key] = latest
+        for source in sources - known_sources:
+            insort(self._recency_index[source], (latest, dedupe_key))
+            known_sources.add(source)
+
+    def _unindex(self, dedupe_key: str) -> None:
+        previous = self._latest_ingested_at.pop(dedupe_key, None)
+        known_sources = self._sources_by_key.pop(dedupe_key, set())
+        if previous is None:
+            return
+        for index_source in (None, *known_sources):
+            index = self._recency_index[index_source]
+            del index[bisect_left(index, (previous, dedupe_key))]
+
+    def _unindex_sources(self, dedupe_key: str, remaining: set[IngestionSource]) -> None:
+        known_sources = self._sources_by_key.get(dedupe_key, set())
+        latest = self._latest_ingested_at[dedupe_key]
+        for source in known_sources - remaining:
+            index = self._recency_index[source]
+            del index[bisect_left(index, (latest, dedupe_key))]
+        known_sources &= remaining
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import threading
+from typing import Mapping, Sequence
+
+from common.ingestion_types import NearDuplicateCandidate
+from ports.outbound.near_duplicate_index_port import NearDuplicateIndexPort
+
+
+class InMemoryNearDuplicateIndexAdapter(NearDuplicateIndexPort):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._blocks: dict[str, list[NearDuplicateCandidate]] = {}
+
+    def add_many(self, entries: Sequence[tuple[str, NearDuplicateCandidate]]) -> None:
+        with self._lock:
+            for blocking_key, candidate in entries:
+                self._blocks.setdefault(blocking_key, []).append(candidate)
+
+    def find_candidates(self, blocking_keys: Sequence[str]) -> Mapping[str, Sequence[NearDuplicateCandidate]]:
+        with self._lock:
+            return {key: list(self._blocks[key]) for key in blocking_keys if key in self._blocks}
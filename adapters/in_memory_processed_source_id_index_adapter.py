@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Mapping, Optional, Sequence
+
+from common.ingestion_types import IngestionSource, ProcessedSourceRecord
+from ports.outbound.processed_source_id_index_port import ProcessedSourceIdIndexPort
+
+
+class InMemoryProcessedSourceIdIndexAdapter(ProcessedSourceIdIndexPort):
+    # Maps each source's processed source_ids to what they were ingested as. Entries expire after
+    # `ttl_seconds` and the oldest are evicted past `max_entries` per source; a forgotten id only costs
+    # the regular dedupe path again.
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl_seconds: Optional[float] = 86_400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[IngestionSource, OrderedDict[str, tuple[float, ProcessedSourceRecord]]] = {}
+
+    def find_many(self, source: IngestionSource, source_ids: Sequence[str]) -> Mapping[str, ProcessedSourceRecord]:
+        found: dict[str, ProcessedSourceRecord] = {}
+        now = self._clock()
+        with self._lock:
+            entries = self._entries.get(source)
+            if entries is None:
+                return found
+            for source_id in source_ids:
+                entry = entries.get(source_id)
+                if entry is None:
+                    continue
+                if entry[0] > now:
+                    found[source_id] = entry[1]
+                else:
+                    del entries[source_id]
+        return found
+
+    def add_many(self, source: IngestionSource, entries: Sequence[tuple[str, ProcessedSourceRecord]]) -> None:
+        # Insertion order is expiry order, so expired and excess entries are both trimmed from the front.
+        now = self._clock()
+        expires_at = now + self._ttl_seconds if self._ttl_seconds is not None else float("inf")
+        with self._lock:
+            indexed = self._entries.setdefault(source, OrderedDict())
+            for source_id, record in entries:
+                indexed[source_id] = (expires_at, record)
+                indexed.move_to_end(source_id)
+            while indexed and (len(indexed) > self._max_entries or next(iter(indexed.values()))[0] <= now):
+                indexed.popitem(last=False)
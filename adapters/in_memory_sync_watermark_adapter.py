@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+from common.ingestion_types import IngestionSource
+from ports.outbound.sync_watermark_port import SyncWatermarkPort
+
+
+class InMemorySyncWatermarkAdapter(SyncWatermarkPort):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watermarks: dict[IngestionSource, str] = {}
+
+    def load(self, source: IngestionSource) -> Optional[str]:
+        with self._lock:
+            return self._watermarks.get(source)
+
+    def save(self, source: IngestionSource, watermark: str) -> None:
+        with self._lock:
+            self._watermarks[source] = watermark
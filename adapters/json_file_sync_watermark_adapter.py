@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from common.ingestion_types import IngestionSource
+from ports.outbound.sync_watermark_port import SyncWatermarkPort
+
+
+class JsonFileSyncWatermarkAdapter(SyncWatermarkPort):
+    # One small JSON object of source -> watermark, replaced atomically so a crash mid-save
+    # leaves the previous watermark in place rather than a torn file.
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def load(self, source: IngestionSource) -> Optional[str]:
+        with self._lock:
+            return self._read().get(source.value)
+
+    def save(self, source: IngestionSource, watermark: str) -> None:
+        with self._lock:
+            watermarks = self._read()
+            watermarks[source.value] = watermark
+            temporary = self._path.with_name(self._path.name + ".tmp")
+            with temporary.open("w", encoding="utf-8") as handle:
+                json.dump(watermarks, handle, sort_keys=True)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self._path)
+
+    def _read(self) -> dict[str, str]:
+        if not self._path.exists():
+            return {}
+        with self._path.open(encoding="utf-8") as handle:
+            return json.load(handle)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+from common.ingestion_types import IngestionHistoryAppend, IngestionSource
+from ports.outbound.ingestion_audit_log_port import IngestionAuditLogPort
+
+
+class JsonLinesIngestionAuditLogAdapter(IngestionAuditLogPort):
+    # Cold storage for the raw event trail: appends are cheap, lookups scan the whole file.
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record_events(self, events: Sequence[IngestionHistoryAppend]) -> None:
+        if not events:
+            return
+        lines = "".join(
+            json.dumps([event.dedupe_key, event.source.value, event.processed_at.isoformat(), event.status]) + "\n"
+            for event in events
+        )
+        with self._lock, self._path.open("a", encoding="utf-8") as log:
+            log.write(lines)
+
+    def list_events(self, dedupe_key: str) -> Sequence[IngestionHistoryAppend]:
+        if not self._path.exists():
+            return []
+        events: list[IngestionHistoryAppend] = []
+        with self._lock, self._path.open(encoding="utf-8") as log:
+            for line in log:
+                key, source, processed_at, status = json.loads(line)
+                if key == dedupe_key:
+                    events.append(IngestionHistoryAppend(
+                        dedupe_key=key,
+                        source=IngestionSource(source),
+                        processed_at=datetime.fromisoformat(processed_at),
+                        status=status,
+                    ))
+        return events
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from common.ingestion_types import AttachmentContent, StoredAttachment
+from ports.outbound.attachment_store_port import AttachmentStorePort
+
+_FILE_HASH = re.compile(r"^[0-9a-f]{16,128}$")
+_SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+class LocalAttachmentStoreAdapter(AttachmentStorePort):
+    # Files live at <root>/<hash[:2]>/<hash>, so identical content is written once however often it arrives.
+    def __init__(self, root: str) -> None:
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def put(self, file_hash: str, content: AttachmentContent) -> StoredAttachment:
+        path = self._path(file_hash)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".incoming-")
+            try:
+                with os.fdopen(descriptor, "wb") as target:
+                    if isinstance(content, (bytes, bytearray, memoryview)):
+                        target.write(content)
+                    else:
+                        position = content.tell()
+                        try:
+                            shutil.copyfileobj(content, target, _COPY_CHUNK_SIZE)
+                        finally:
+                            content.seek(position)
+                    target.flush()
+                    os.fsync(target.fileno())
+                os.replace(temporary, path)
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+        return self._describe(file_hash, path)
+
+    def locate(self, file_hash: str) -> Optional[StoredAttachment]:
+        if not _FILE_HASH.match(file_hash):
+            return None
+        path = self._path(file_hash)
+        return self._describe(file_hash, path) if path.exists() else None
+
+    def _path(self, file_hash: str) -> Path:
+        if not _FILE_HASH.match(file_hash):
+            raise ValueError(f"Not a content hash: {file_hash!r}")
+        return self._root / file_hash[:2] / file_hash
+
+    def _describe(self, file_hash: str, path: Path) -> StoredAttachment:
+        with path.open("rb") as stored:
+            header = stored.read(8)
+        media_type = next(
+            (media_type for signature, media_type in _SIGNATURES if header.startswith(signature)),
+            "application/octet-stream",
+        )
+        return StoredAttachment(file_hash=file_hash, path=str(path), size=path.stat().st_size, media_type=media_type)
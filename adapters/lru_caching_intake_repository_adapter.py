@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Sequence, TypeVar
+
+from common.ingestion_types import (
+    HistoryPurgeResult,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    IntakeCursor,
+)
+from ports.outbound.intake_repository_port import IntakeRepositoryPort
+
+_Result = TypeVar("_Result")
+
+
+@dataclass(frozen=True)
+class IntakeCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LruCachingIntakeRepositoryAdapter(IntakeRepositoryPort):
+    # Every write goes through this adapter and refreshes the cached invoice with what the backend
+    # returned, so the TTL only bounds staleness from writers that bypass it. Misses are not cached.
+    # Backend calls run outside the lock; each one takes a sequence number when it starts, and its
+    # result is only cached if no write to the same key (and no purge) overlapped or followed that start.
+    def __init__(
+        self,
+        repository: IntakeRepositoryPort,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._repository = repository
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, IngestedInvoice]] = OrderedDict()
+        self._hits = self._misses = self._evictions = 0
+        self._sequence = 0
+        self._in_flight = 0
+        self._writing: Counter[str] = Counter()
+        # Key -> sequence at which its last write finished; only needed while older calls are in flight.
+        self._written: dict[str, int] = {}
+        self._purging = 0
+        self._purged_through = 0
+
+    def stats(self) -> IntakeCacheStats:
+        with self._lock:
+            return IntakeCacheStats(
+                hits=self._hits, misses=self._misses, evictions=self._evictions, size=len(self._entries))
+
+    def find_by_dedupe_key(self, dedupe_key: str) -> Optional[IngestedInvoice]:
+        return self.find_many_by_dedupe_keys([dedupe_key]).get(dedupe_key)
+
+    def find_many_by_dedupe_keys(self, dedupe_keys: Sequence[str]) -> Mapping[str, IngestedInvoice]:
+        found: dict[str, IngestedInvoice] = {}
+        missing: list[str] = []
+        now = self._clock()
+        with self._lock:
+            for dedupe_key in dedupe_keys:
+                entry = self._entries.get(dedupe_key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(dedupe_key)
+                    found[dedupe_key] = entry[1]
+                    self._hits += 1
+                else:
+                    if entry is not None:
+                        del self._entries[dedupe_key]
+                    missing.append(dedupe_key)
+                    self._misses += 1
+        if missing:
+            started = self._begin()
+            loaded: Mapping[str, IngestedInvoice] = {}
+            try:
+                loaded = self._repository.find_many_by_dedupe_keys(missing)
+            finally:
+                self._end(started, loaded.values())
+            found.update(loaded)
+        return found
+
+    def save_new(self, invoice: IngestedInvoice) -> IngestedInvoice:
+        return self._write([invoice.dedupe_key], lambda: self._repository.save_new(invoice), lambda saved: [saved])
+
+    def save_many(self, invoices: Sequence[IngestedInvoice]) -> Sequence[IngestedInvoice]:
+        return self._write(
+            [invoice.dedupe_key for invoice in invoices], lambda: self._repository.save_many(invoices), lambda saved: saved)
+
+    def append_history(self, dedupe_key: str, source: IngestionSource, processed_at: datetime, status: str) -> IngestedInvoice:
+        return self._write(
+            [dedupe_key],
+            lambda: self._repository.append_history(dedupe_key, source, processed_at, status),
+            lambda updated: [updated],
+        )
+
+    def append_history_many(self, events: Sequence[IngestionHistoryAppend]) -> Sequence[IngestedInvoice]:
+        return self._write(
+            [event.dedupe_key for event in events],
+            lambda: self._repository.append_history_many(events),
+            lambda updated: updated,
+        )
+
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        return self._write(
+            [candidate.invoice.dedupe_key],
+            lambda: self._repository.save_new_or_append_history(candidate),
+            lambda result: [result[0]],
+        )
+
+    def save_new_or_append_history_many(
+        self,
+        candidates: Sequence[IngestionCandidate],
+    ) -> Sequence[tuple[IngestedInvoice, bool]]:
+        return self._write(
+            [candidate.invoice.dedupe_key for candidate in candidates],
+            lambda: self._repository.save_new_or_append_history_many(candidates),
+            lambda results: [invoice for invoice, _ in results],
+        )
+
+    def list_by_source_sorted(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        return self._repository.list_by_source_sorted(source=source, newest_first=newest_first, limit=limit, after=after)
+
+    def purge_history_before(self, cutoff: datetime) -> HistoryPurgeResult:
+        # The purge result does not name the touched keys, so the whole cache is dropped, and nothing
+        # loaded or written by a call that started before the purge finished is cached afterwards.
+        with self._lock:
+            self._in_flight += 1
+            self._purging += 1
+            self._entries.clear()
+        try:
+            return self._repository.purge_history_before(cutoff)
+        finally:
+            with self._lock:
+                self._purging -= 1
+                self._sequence += 1
+                self._purged_through = self._sequence
+                self._entries.clear()
+                self._settle()
+
+    def change_version(self) -> int:
+        return self._repository.change_version()
+
+    def iter_dedupe_keys(self) -> Iterator[str]:
+        return self._repository.iter_dedupe_keys()
+
+    def _write(
+        self,
+        dedupe_keys: Sequence[str],
+        write: Callable[[], _Result],
+        written: Callable[[_Result], Iterable[IngestedInvoice]],
+    ) -> _Result:
+        keys = set(dedupe_keys)
+        started = self._begin(keys)
+        invoices: Iterable[IngestedInvoice] = ()
+        try:
+            result = write()
+            invoices = written(result)
+            return result
+        finally:
+            self._end(started, invoices, keys)
+
+    def _begin(self, written_keys: Iterable[str] = ()) -> int:
+        with self._lock:
+            self._sequence += 1
+            self._in_flight += 1
+            for dedupe_key in written_keys:
+                self._writing[dedupe_key] += 1
+                self._entries.pop(dedupe_key, None)
+            return self._sequence
+
+    def _end(self, started: int, invoices: Iterable[IngestedInvoice], written_keys: Iterable[str] = ()) -> None:
+        expires_at = self._clock() + self._ttl_seconds
+        with self._lock:
+            self._writing.subtract(written_keys)
+            for dedupe_key in written_keys:
+                if self._writing[dedupe_key] <= 0:
+                    del self._writing[dedupe_key]
+            fresh = not self._purging and self._purged_through < started
+            for invoice in invoices:
+                dedupe_key = invoice.dedupe_key
+                if fresh and dedupe_key not in self._writing and self._written.get(dedupe_key, 0) < started:
+                    self._entries[dedupe_key] = (expires_at, invoice)
+                    self._entries.move_to_end(dedupe_key)
+                else:
+                    self._entries.pop(dedupe_key, None)
+            self._sequence += 1
+            for dedupe_key in written_keys:
+                self._written[dedupe_key] = self._sequence
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            self._settle()
+
+    def _settle(self) -> None:
+        self._in_flight -= 1
+        if not self._in_flight:
+            self._written.clear()
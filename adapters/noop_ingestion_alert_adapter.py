@@ -2,10 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Sequence
+from typing import Optional, Sequence
 
 from common.ingestion_types import IngestionSource
-from ports.outbound.ingestion_alert_port import IngestionAlertPort, IngestionFailureEvent
+from common.source_resilience import CircuitState
+from ports.outbound.ingestion_alert_port import (
+    FAILURE_WINDOWS,
+    CircuitStateEvent,
+    IngestionAlertPort,
+    IngestionFailureEvent,
+    IngestionFailureSummary,
+)
 
 
 @dataclass(frozen=True)
@@ -18,14 +25,55 @@ class IngestionAlertEvent:
 class NoopIngestionAlertAdapter(IngestionAlertPort):
     def __init__(self) -> None:
         self.events: list[IngestionAlertEvent] = []
+        self.circuit_events: list[CircuitStateEvent] = []
 
     def notify_failure(self, source: IngestionSource, error_type: str, occurred_at: datetime) -> None:
         self.events.append(IngestionAlertEvent(
             source=source, error_type=error_type, occurred_at=occurred_at))
 
-    def list_failures(self) -> Sequence[IngestionFailureEvent]:
+    def notify_circuit_state(
+        self,
+        source: IngestionSource,
+        previous: CircuitState,
+        current: CircuitState,
+        occurred_at: datetime,
+    ) -> None:
+        self.circuit_events.append(CircuitStateEvent(
+            source=source, previous=previous, current=current, occurred_at=occurred_at))
+
+    def list_circuit_states(self) -> Sequence[CircuitStateEvent]:
+        latest: dict[IngestionSource, CircuitStateEvent] = {}
+        for event in self.circuit_events:
+            latest[event.source] = event
+        return list(latest.values())
+
+    def list_failures(
+        self,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[IngestionFailureEvent]:
+        events = [event for event in self.events if since is None or event.occurred_at >= since]
+        if limit is not None:
+            events = events[-limit:] if limit else []
         return [
             IngestionFailureEvent(
                 source=event.source, error_type=event.error_type, occurred_at=event.occurred_at)
-            for event in self.events
+            for event in events
+        ]
+
+    def summarize_failures(self, now: datetime) -> Sequence[IngestionFailureSummary]:
+        grouped: dict[tuple[IngestionSource, str], list[datetime]] = {}
+        for event in self.events:
+            grouped.setdefault((event.source, event.error_type), []).append(event.occurred_at)
+        return [
+            IngestionFailureSummary(
+                source=source,
+                error_type=error_type,
+                last_occurred_at=max(occurred),
+                window_counts={
+                    label: sum(1 for at in occurred if now - window < at <= now)
+                    for label, window in FAILURE_WINDOWS.items()
+                },
+            )
+            for (source, error_type), occurred in grouped.items()
         ]
@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
+
+from common.ingestion_types import (
+    DUPLICATE_SEEN,
+    HistoryPurgeResult,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionHistoryEntry,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+    history_partition,
+    history_partition_start,
+)
+from ports.outbound.intake_repository_port import IntakeRepositoryPort
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    id INTEGER PRIMARY KEY,
+    dedupe_key TEXT NOT NULL UNIQUE,
+    invoice_number TEXT NOT NULL,
+    supplier TEXT NOT NULL,
+    amount REAL NOT NULL,
+    invoice_date TEXT NOT NULL,
+    file_hash TEXT,
+    latest_ingested_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_invoices_recency ON invoices (latest_ingested_at, dedupe_key);
+
+-- History lives in one table per month (see _CREATE_PARTITION), listed here so readers find them all.
+CREATE TABLE IF NOT EXISTS history_partitions (
+    month TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS invoice_sources (
+    source TEXT NOT NULL,
+    invoice_id INTEGER NOT NULL REFERENCES invoices (id) ON DELETE CASCADE,
+    dedupe_key TEXT NOT NULL,
+    latest_ingested_at TEXT NOT NULL,
+    PRIMARY KEY (source, invoice_id)
+);
+CREATE INDEX IF NOT EXISTS idx_invoice_sources_recency
+    ON invoice_sources (source, latest_ingested_at, dedupe_key, invoice_id);
+CREATE INDEX IF NOT EXISTS idx_invoice_sources_invoice ON invoice_sources (invoice_id);
+
+CREATE TABLE IF NOT EXISTS intake_version (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO intake_version (id, version) VALUES (0, 0);
+"""
+
+_INVOICE_COLUMNS = "i.id, i.dedupe_key, i.invoice_number, i.supplier, i.amount, i.invoice_date, i.file_hash"
+
+_SELECT_INVOICES_BY_KEYS = f"SELECT {_INVOICE_COLUMNS} FROM invoices i WHERE i.dedupe_key IN ({{placeholders}})"
+# One SELECT per month partition; `part` keeps the months in order within each invoice.
+_SELECT_PARTITION_HISTORY = (
+    "SELECT {part} AS part, id, invoice_id, source, ingested_at, status, first_seen_at, seen_count FROM {table} "
+    "WHERE invoice_id IN ({placeholders})"
+)
+_SELECT_INVOICE_ID = "SELECT id FROM invoices WHERE dedupe_key = ?"
+_INSERT_INVOICE = (
+    "INSERT INTO invoices (dedupe_key, invoice_number, supplier, amount, invoice_date, file_hash, latest_ingested_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_INVOICE_IF_ABSENT = _INSERT_INVOICE.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+_DELETE_INVOICE = "DELETE FROM invoices WHERE dedupe_key = ?"
+_INSERT_HISTORY = (
+    "INSERT INTO {table} (invoice_id, source, ingested_at, status, first_seen_at, seen_count) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_COMPACT_HISTORY = (
+    "UPDATE {table} SET first_seen_at = MIN(first_seen_at, ?), ingested_at = MAX(ingested_at, ?), "
+    "seen_count = seen_count + 1 WHERE invoice_id = ? AND source = ? AND status = ?"
+)
+_RAISE_LATEST = "UPDATE invoices SET latest_ingested_at = MAX(COALESCE(latest_ingested_at, ''), ?) WHERE id = ?"
+_INSERT_SOURCE = (
+    "INSERT OR IGNORE INTO invoice_sources (source, invoice_id, dedupe_key, latest_ingested_at) "
+    "SELECT ?, id, dedupe_key, latest_ingested_at FROM invoices WHERE id = ?"
+)
+_SYNC_SOURCE_LATEST = (
+    "UPDATE invoice_sources SET latest_ingested_at = "
+    "(SELECT latest_ingested_at FROM invoices WHERE invoices.id = invoice_sources.invoice_id) "
+    "WHERE invoice_id = ?"
+)
+
+_CREATE_PARTITION = (
+    """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        invoice_id INTEGER NOT NULL REFERENCES invoices (id) ON DELETE CASCADE,
+        source TEXT NOT NULL,
+        ingested_at TEXT NOT NULL,
+        status TEXT NOT NULL,
+        first_seen_at TEXT NOT NULL,
+        seen_count INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_{table}_invoice ON {table} (invoice_id, id)",
+)
+_REGISTER_PARTITION = "INSERT OR IGNORE INTO history_partitions (month) VALUES (?)"
+_SELECT_PARTITIONS = "SELECT month FROM history_partitions ORDER BY month"
+
+# Expiring a month is a DROP TABLE of its partition; nothing references the partitions, so SQLite drops
+# them without visiting their rows. Invoices left without history are exactly those whose latest event
+# is before the boundary.
+_SELECT_PARTITION_STATS = "SELECT COUNT(*), MAX(ingested_at) FROM {table}"
+_SELECT_PARTITION_INVOICES = "SELECT DISTINCT invoice_id FROM {table}"
+_SELECT_OLDEST_EVENT = "SELECT MIN(ingested_at) FROM {table}"
+_DROP_PARTITION = "DROP TABLE {table}"
+_UNREGISTER_PARTITION = "DELETE FROM history_partitions WHERE month = ?"
+_DELETE_EXPIRED_INVOICES = "DELETE FROM invoices WHERE latest_ingested_at < ?"
+_DELETE_SOURCES = "DELETE FROM invoice_sources WHERE invoice_id IN ({placeholders})"
+_DELETE_STALE_SOURCES = "DELETE FROM invoice_sources WHERE invoice_id IN ({placeholders}) AND NOT EXISTS ({retained})"
+_RETAINED_SOURCE = (
+    "SELECT 1 FROM {table} h WHERE h.invoice_id = invoice_sources.invoice_id AND h.source = invoice_sources.source"
+)
+
+# Bumped inside every write transaction so readers in any process see a new version once it commits.
+_BUMP_VERSION = "UPDATE intake_version SET version = version + 1"
+_SELECT_VERSION = "SELECT version FROM intake_version"
+
+_SELECT_DEDUPE_KEYS_AFTER = "SELECT dedupe_key FROM invoices WHERE dedupe_key > ? ORDER BY dedupe_key LIMIT ?"
+_KEY_PAGE_SIZE = 10_000
+
+# SQLite's default host-parameter limit on older builds is 999.
+_MAX_PARAMETERS = 500
+
+
+def _listing_query(by_source: bool, newest_first: bool, with_cursor: bool) -> str:
+    if by_source:
+        table, recency, conditions = "invoice_sources r JOIN invoices i ON i.id = r.invoice_id", "r", ["r.source = ?"]
+    else:
+        table, recency, conditions = "invoices i", "i", ["i.latest_ingested_at IS NOT NULL"]
+    if with_cursor:
+        conditions.append(f"({recency}.latest_ingested_at, {recency}.dedupe_key) {'<' if newest_first else '>'} (?, ?)")
+    direction = "DESC" if newest_first else "ASC"
+    return (
+        f"SELECT {_INVOICE_COLUMNS} FROM {table} WHERE {' AND '.join(conditions)} "
+        f"ORDER BY {recency}.latest_ingested_at {direction}, {recency}.dedupe_key {direction} LIMIT ?"
+    )
+
+
+_LISTING_QUERIES = {
+    (by_source, newest_first, with_cursor): _listing_query(by_source, newest_first, with_cursor)
+    for by_source in (False, True)
+    for newest_first in (False, True)
+    for with_cursor in (False, True)
+}
+
+
+def _timestamp(value: datetime) -> str:
+    return value.isoformat(timespec="microseconds")
+
+
+def _history_table(month: str) -> str:
+    return f"history_{month.replace('-', '_')}"
+
+
+class SqliteIntakeRepositoryAdapter(IntakeRepositoryPort):
+    def __init__(self, database_path: str, compact_duplicates: bool = False) -> None:
+        self._compact_duplicates = compact_duplicates
+        self._connection = sqlite3.connect(database_path, check_same_thread=False, cached_statements=256)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def find_by_dedupe_key(self, dedupe_key: str) -> Optional[IngestedInvoice]:
+        return self.find_many_by_dedupe_keys([dedupe_key]).get(dedupe_key)
+
+    def find_many_by_dedupe_keys(self, dedupe_keys: Sequence[str]) -> Mapping[str, IngestedInvoice]:
+        found: dict[str, IngestedInvoice] = {}
+        with self._lock:
+            for start in range(0, len(dedupe_keys), _MAX_PARAMETERS):
+                chunk = dedupe_keys[start:start + _MAX_PARAMETERS]
+                rows = self._connection.execute(
+                    _SELECT_INVOICES_BY_KEYS.format(placeholders=",".join("?" * len(chunk))), list(chunk)
+                ).fetchall()
+                found.update((invoice.dedupe_key, invoice) for invoice in self._load(rows))
+        return found
+
+    def save_new(self, invoice: IngestedInvoice) -> IngestedInvoice:
+        return self.save_many([invoice])[0]
+
+    def save_many(self, invoices: Sequence[IngestedInvoice]) -> Sequence[IngestedInvoice]:
+        with self._lock, self._connection:
+            self._connection.executemany(_DELETE_INVOICE, [(invoice.dedupe_key,) for invoice in invoices])
+            for invoice in invoices:
+                self._insert(invoice, _INSERT_INVOICE)
+            self._connection.execute(_BUMP_VERSION)
+        return list(invoices)
+
+    def append_history(self, dedupe_key: str, source: IngestionSource, processed_at: datetime, status: str) -> IngestedInvoice:
+        return self.append_history_many([
+            IngestionHistoryAppend(dedupe_key=dedupe_key, source=source, processed_at=processed_at, status=status)
+        ])[0]
+
+    def append_history_many(self, events: Sequence[IngestionHistoryAppend]) -> Sequence[IngestedInvoice]:
+        if not events:
+            return []
+        with self._lock:
+            with self._connection:
+                self._append(events)
+                self._connection.execute(_BUMP_VERSION)
+            updated = self.find_many_by_dedupe_keys(list(dict.fromkeys(event.dedupe_key for event in events)))
+        return [updated[event.dedupe_key] for event in events]
+
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        return self.save_new_or_append_history_many([candidate])[0]
+
+    def save_new_or_append_history_many(
+        self,
+        candidates: Sequence[IngestionCandidate],
+    ) -> Sequence[tuple[IngestedInvoice, bool]]:
+        if not candidates:
+            return []
+        with self._lock:
+            created: list[bool] = []
+            with self._connection:
+                for candidate in candidates:
+                    is_new = self._insert(candidate.invoice, _INSERT_INVOICE_IF_ABSENT)
+                    if not is_new:
+                        self._append(candidate.duplicate_events)
+                    created.append(is_new)
+                self._connection.execute(_BUMP_VERSION)
+            existing = self.find_many_by_dedupe_keys(
+                [candidate.invoice.dedupe_key for candidate, is_new in zip(candidates, created) if not is_new])
+        return [
+            (candidate.invoice, True) if is_new else (existing[candidate.invoice.dedupe_key], False)
+            for candidate, is_new in zip(candidates, created)
+        ]
+
+    def list_by_source_sorted(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        parameters: list[object] = [source.value] if source is not None else []
+        if after is not None:
+            parameters.extend([_timestamp(after.ingested_at), after.dedupe_key])
+        parameters.append(-1 if limit is None else limit)
+        query = _LISTING_QUERIES[(source is not None, newest_first, after is not None)]
+        with self._lock:
+            return self._load(self._connection.execute(query, parameters).fetchall())
+
+    def purge_history_before(self, cutoff: datetime) -> HistoryPurgeResult:
+        boundary = history_partition_start(cutoff)
+        purged_events = purged_invoices = 0
+        newest_purged: Optional[str] = None
+        oldest_retained: Optional[str] = None
+        with self._lock, self._connection:
+            months = self._months()
+            expired = [month for month in months if month < history_partition(boundary)]
+            retained = [_history_table(month) for month in months[len(expired):]]
+            touched: set[int] = set()
+            for month in expired:
+                table = _history_table(month)
+                count, newest = self._connection.execute(_SELECT_PARTITION_STATS.format(table=table)).fetchone()
+                purged_events += count
+                newest_purged = max(newest_purged or "", newest or "") or None
+                invoices = self._connection.execute(_SELECT_PARTITION_INVOICES.format(table=table))
+                touched.update(row[0] for row in invoices)
+                self._connection.execute(_DROP_PARTITION.format(table=table))
+                self._connection.execute(_UNREGISTER_PARTITION, (month,))
+            if expired:
+                purged_invoices = self._connection.execute(_DELETE_EXPIRED_INVOICES, (_timestamp(boundary),)).rowcount
+                self._delete_stale_sources(sorted(touched), retained)
+                self._connection.execute(_BUMP_VERSION)
+            for table in retained:
+                oldest_retained = self._connection.execute(_SELECT_OLDEST_EVENT.format(table=table)).fetchone()[0]
+                if oldest_retained is not None:
+                    break
+        return HistoryPurgeResult(
+            cutoff=boundary,
+            dropped_partitions=tuple(expired),
+            purged_events=purged_events,
+            purged_invoices=purged_invoices,
+            newest_purged_at=datetime.fromisoformat(newest_purged) if newest_purged is not None else None,
+            oldest_retained_at=datetime.fromisoformat(oldest_retained) if oldest_retained is not None else None,
+        )
+
+    def change_version(self) -> int:
+        with self._lock:
+            return self._connection.execute(_SELECT_VERSION).fetchone()[0]
+
+    def iter_dedupe_keys(self) -> Iterator[str]:
+        # Keyset pages keep the lock and memory bounded while callers consume the keys.
+        last = ""
+        while True:
+            with self._lock:
+                page = [row[0] for row in self._connection.execute(_SELECT_DEDUPE_KEYS_AFTER, (last, _KEY_PAGE_SIZE))]
+            yield from page
+            if len(page) < _KEY_PAGE_SIZE:
+                return
+            last = page[-1]
+
+    def _insert(self, invoice: IngestedInvoice, statement: str) -> bool:
+        metadata = invoice.metadata
+        cursor = self._connection.execute(
+            statement,
+            (
+                invoice.dedupe_key,
+                metadata.invoice_number,
+                metadata.supplier,
+                metadata.amount,
+                _timestamp(metadata.invoice_date),
+                invoice.file_hash,
+                _timestamp(invoice.latest_ingested_at) if invoice.history else None,
+            ),
+        )
+        if cursor.rowcount == 0:
+            return False
+        invoice_id = cursor.lastrowid
+        history_rows: dict[str, list[tuple[int, str, str, str, str, int]]] = {}
+        for event in invoice.history:
+            history_rows.setdefault(self._partition(event.ingested_at), []).append((
+                invoice_id,
+                event.source.value,
+                _timestamp(event.ingested_at),
+                event.status,
+                _timestamp(event.first_seen_at),
+                event.seen_count,
+            ))
+        self._insert_history(history_rows)
+        self._connection.executemany(
+            _INSERT_SOURCE, [(source.value, invoice_id) for source in {event.source for event in invoice.history}])
+        return True
+
+    def _append(self, events: Iterable[IngestionHistoryAppend]) -> None:
+        invoice_ids: dict[str, int] = {}
+        latest_by_id: dict[int, str] = {}
+        sources: set[tuple[str, int]] = set()
+        history_rows: dict[str, list[tuple[int, str, str, str, str, int]]] = {}
+        for event in events:
+            invoice_id = invoice_ids.get(event.dedupe_key)
+            if invoice_id is None:
+                row = self._connection.execute(_SELECT_INVOICE_ID, (event.dedupe_key,)).fetchone()
+                if row is None:
+                    raise KeyError(event.dedupe_key)
+                invoice_id = invoice_ids[event.dedupe_key] = row[0]
+            table = self._partition(event.processed_at)
+            ingested_at = _timestamp(event.processed_at)
+            row = (invoice_id, event.source.value, ingested_at, event.status, ingested_at, 1)
+            if self._compact_duplicates and event.status.startswith(f"{DUPLICATE_SEEN}:"):
+                # Compacted rows are written in order so a later sighting in the batch folds into an earlier one;
+                # only sightings from the same month fold, so every row stays in its month's partition.
+                self._insert_history(history_rows)
+                compacted = self._connection.execute(
+                    _COMPACT_HISTORY.format(table=table),
+                    (ingested_at, ingested_at, invoice_id, event.source.value, event.status),
+                )
+                if compacted.rowcount == 0:
+                    history_rows.setdefault(table, []).append(row)
+            else:
+                history_rows.setdefault(table, []).append(row)
+            latest_by_id[invoice_id] = max(latest_by_id.get(invoice_id, ingested_at), ingested_at)
+            sources.add((event.source.value, invoice_id))
+
+        self._insert_history(history_rows)
+        self._connection.executemany(
+            _RAISE_LATEST, [(latest, invoice_id) for invoice_id, latest in latest_by_id.items()])
+        self._connection.executemany(_INSERT_SOURCE, sorted(sources))
+        self._connection.executemany(_SYNC_SOURCE_LATEST, [(invoice_id,) for invoice_id in latest_by_id])
+
+    def _partition(self, ingested_at: datetime) -> str:
+        # Idempotent, so a month another connection has just created or dropped is (re)created here.
+        month = history_partition(ingested_at)
+        table = _history_table(month)
+        for statement in _CREATE_PARTITION:
+            self._connection.execute(statement.format(table=table))
+        self._connection.execute(_REGISTER_PARTITION, (month,))
+        return table
+
+    def _insert_history(self, rows_by_table: dict[str, list[tuple[int, str, str, str, str, int]]]) -> None:
+        for table, rows in rows_by_table.items():
+            self._connection.executemany(_INSERT_HISTORY.format(table=table), rows)
+        rows_by_table.clear()
+
+    def _months(self) -> list[str]:
+        return [row[0] for row in self._connection.execute(_SELECT_PARTITIONS)]
+
+    def _delete_stale_sources(self, invoice_ids: Sequence[int], retained_tables: Sequence[str]) -> None:
+        # Survivors drop the sources they were only seen under in the expired months.
+        retained = " UNION ALL ".join(_RETAINED_SOURCE.format(table=table) for table in retained_tables)
+        for start in range(0, len(invoice_ids), _MAX_PARAMETERS):
+            chunk = invoice_ids[start:start + _MAX_PARAMETERS]
+            placeholders = ",".join("?" * len(chunk))
+            statement = _DELETE_STALE_SOURCES if retained else _DELETE_SOURCES
+            self._connection.execute(statement.format(placeholders=placeholders, retained=retained), chunk)
+
+    def _load(self, rows: Sequence[tuple]) -> list[IngestedInvoice]:
+        invoices: dict[int, IngestedInvoice] = {}
+        for invoice_id, dedupe_key, invoice_number, supplier, amount, invoice_date, file_hash in rows:
+            invoices[invoice_id] = IngestedInvoice(
+                dedupe_key=dedupe_key,
+                metadata=InvoiceMetadata(
+                    invoice_number=invoice_number,
+                    supplier=supplier,
+                    amount=amount,
+                    invoice_date=datetime.fromisoformat(invoice_date),
+                ),
+                file_hash=file_hash,
+            )
+        tables = [_history_table(month) for month in self._months()]
+        invoice_ids = list(invoices)
+        # Each partition repeats the id list, so chunks shrink as the number of months grows.
+        chunk_size = max(_MAX_PARAMETERS // max(len(tables), 1), 1)
+        for start in range(0, len(invoice_ids) if tables else 0, chunk_size):
+            chunk = invoice_ids[start:start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            query = " UNION ALL ".join(
+                _SELECT_PARTITION_HISTORY.format(part=part, table=table, placeholders=placeholders)
+                for part, table in enumerate(tables)
+            )
+            history = self._connection.execute(f"{query} ORDER BY invoice_id, part, id", chunk * len(tables))
+            for _, _, invoice_id, source, ingested_at, status, first_seen_at, seen_count in history:
+                invoices[invoice_id].history.append(
+                    IngestionHistoryEntry(
+                        source=IngestionSource(source),
+                        ingested_at=datetime.fromisoformat(ingested_at),
+                        status=status,
+                        first_seen_at=datetime.fromisoformat(first_seen_at),
+                        seen_count=seen_count,
+                    )
+                )
+        return list(invoices.values())
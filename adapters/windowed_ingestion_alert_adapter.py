@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Mapping, Optional, Sequence
+
+from common.ingestion_types import IngestionSource
+from common.source_resilience import CircuitState
+from ports.outbound.ingestion_alert_port import (
+    FAILURE_WINDOWS,
+    CircuitStateEvent,
+    IngestionAlertPort,
+    IngestionFailureEvent,
+    IngestionFailureSummary,
+)
+
+
+class _SlidingCounter:
+    # Fixed ring of time buckets with a running total: recording and reading cost O(1) amortized,
+    # and memory stays at `buckets` slots however many failures arrive.
+    def __init__(self, window: timedelta, buckets: int) -> None:
+        self._bucket_seconds = window.total_seconds() / buckets
+        self._counts = [0] * buckets
+        self._head: Optional[int] = None
+        self.total = 0
+
+    def add(self, at: datetime) -> None:
+        bucket = self._bucket(at)
+        self._advance(bucket)
+        if bucket > self._head - len(self._counts):
+            self._counts[bucket % len(self._counts)] += 1
+            self.total += 1
+
+    def count(self, now: datetime) -> int:
+        # Read-only: buckets that have slid out of the window at `now` are left out, not cleared, so a
+        # read ahead of the newest failure cannot expire counts that later failures still fall within.
+        if self._head is None:
+            return 0
+        size = len(self._counts)
+        expired_through = min(self._bucket(now), self._head + size) - size
+        return self.total - sum(self._counts[bucket % size] for bucket in range(self._head - size + 1, expired_through + 1))
+
+    def _bucket(self, at: datetime) -> int:
+        return int(at.timestamp() // self._bucket_seconds)
+
+    def _advance(self, bucket: int) -> None:
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+        for expired in range(max(self._head + 1, bucket - len(self._counts) + 1), bucket + 1):
+            slot = expired % len(self._counts)
+            self.total -= self._counts[slot]
+            self._counts[slot] = 0
+        self._head = bucket
+
+
+class WindowedIngestionAlertAdapter(IngestionAlertPort):
+    # Keeps the most recent `capacity` failures for listing and per-(source, error_type) counters over
+    # FAILURE_WINDOWS; reads in the past relative to the newest failure see the counters as of that failure.
+    # Circuit state changes are not failures: only the latest one per source is kept.
+    def __init__(
+        self,
+        capacity: int = 1_024,
+        windows: Mapping[str, timedelta] = FAILURE_WINDOWS,
+        buckets_per_window: int = 60,
+    ) -> None:
+        self._windows = dict(windows)
+        self._buckets_per_window = buckets_per_window
+        self._lock = threading.Lock()
+        self._recent: deque[IngestionFailureEvent] = deque(maxlen=capacity)
+        self._counters: dict[tuple[IngestionSource, str], dict[str, _SlidingCounter]] = {}
+        self._last_occurred_at: dict[tuple[IngestionSource, str], datetime] = {}
+        self._circuit_states: dict[IngestionSource, CircuitStateEvent] = {}
+
+    def notify_failure(self, source: IngestionSource, error_type: str, occurred_at: datetime) -> None:
+        key = (source, error_type)
+        with self._lock:
+            self._recent.append(IngestionFailureEvent(source=source, error_type=error_type, occurred_at=occurred_at))
+            counters = self._counters.get(key)
+            if counters is None:
+                counters = self._counters[key] = {
+                    label: _SlidingCounter(window, self._buckets_per_window) for label, window in self._windows.items()
+                }
+            for counter in counters.values():
+                counter.add(occurred_at)
+            previous = self._last_occurred_at.get(key)
+            self._last_occurred_at[key] = occurred_at if previous is None else max(previous, occurred_at)
+
+    def notify_circuit_state(
+        self,
+        source: IngestionSource,
+        previous: CircuitState,
+        current: CircuitState,
+        occurred_at: datetime,
+    ) -> None:
+        event = CircuitStateEvent(source=source, previous=previous, current=current, occurred_at=occurred_at)
+        with self._lock:
+            known = self._circuit_states.get(source)
+            if known is None or known.occurred_at <= occurred_at:
+                self._circuit_states[source] = event
+
+    def list_circuit_states(self) -> Sequence[CircuitStateEvent]:
+        with self._lock:
+            return list(self._circuit_states.values())
+
+    def list_failures(
+        self,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[IngestionFailureEvent]:
+        # Sources report late and out of order, so the whole buffer is filtered and ordered by occurred_at.
+        with self._lock:
+            selected = [event for event in self._recent if since is None or event.occurred_at >= since]
+        selected.sort(key=lambda event: event.occurred_at)
+        return selected[-limit:] if limit is not None else selected
+
+    def summarize_failures(self, now: datetime) -> Sequence[IngestionFailureSummary]:
+        with self._lock:
+            return [
+                IngestionFailureSummary(
+                    source=source,
+                    error_type=error_type,
+                    last_occurred_at=self._last_occurred_at[(source, error_type)],
+                    window_counts={label: counter.count(now) for label, counter in counters.items()},
+                )
+                for (source, error_type), counters in self._counters.items()
+            ]
@@ -1,37 +1,99 @@
 from __future__ import annotations
 
-from typing import Annotated, Literal
+import base64
+import binascii
+import hashlib
+import json
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Annotated, Iterator, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 
 from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
-from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from adapters.windowed_ingestion_alert_adapter import WindowedIngestionAlertAdapter
 from api.dependencies.auth import UserContext, check_scope, get_current_user
-from api.schemas.api_response import ApiResponse
+from api.schemas.api_response import ApiResponse, PagedApiResponse
 from api.schemas.invoice_ingestion import (
     IngestionFailureResponse,
-    IngestionHistoryEntryResponse,
+    IngestionFailureWindowResponse,
     InvoiceIntakeItemResponse,
 )
-from common.ingestion_types import IngestionSource
+from api.schemas.invoice_ingestion_json import dump_intake_page, iter_intake_lines
+from common.ingestion_types import IngestedInvoice, IngestionSource, IntakeCursor
 from services.invoice_ingestion_service import InvoiceIngestionService
 
 router = APIRouter(prefix="/v1", tags=["invoice-ingestion"])
 
 _service = InvoiceIngestionService(
     intake_repository=InMemoryIntakeRepositoryAdapter(),
-    alert_port=NoopIngestionAlertAdapter(),
+    alert_port=WindowedIngestionAlertAdapter(),
 )
 
 
+_IntakePage = PagedApiResponse[list[InvoiceIntakeItemResponse]]
+_IntakePageKey = tuple[Optional[str], str, Optional[int], Optional[str]]
+
+_RESPONSE_CACHE_SIZE = 256
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class _IntakeResponseCache:
+    # Serialized pages are reused until the repository's change version moves on.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_IntakePageKey, tuple[int, str, bytes]] = OrderedDict()
+
+    def get(self, key: _IntakePageKey, version: int) -> Optional[tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, key: _IntakePageKey, version: int, body: bytes) -> str:
+        # The ETag hashes the body, so it stays valid across restarts that reset the version.
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        with self._lock:
+            self._entries[key] = (version, etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > _RESPONSE_CACHE_SIZE:
+                self._entries.popitem(last=False)
+        return etag
+
+
+_response_caches: weakref.WeakKeyDictionary[InvoiceIngestionService, _IntakeResponseCache] = (
+    weakref.WeakKeyDictionary())
+_response_caches_lock = threading.Lock()
+
+
 def get_invoice_ingestion_service() -> InvoiceIngestionService:
     return _service
 
 
+def _response_cache_for(service: InvoiceIngestionService) -> _IntakeResponseCache:
+    with _response_caches_lock:
+        cache = _response_caches.get(service)
+        if cache is None:
+            cache = _response_caches[service] = _IntakeResponseCache()
+        return cache
+
+
 @router.get(
     "/invoices/intake",
     summary="List intake invoices for analysts",
-    description="Returns intake queue items filtered by source and sorted by ingestion timestamp.",
+    description=(
+        "Returns intake queue items filtered by source and sorted by ingestion timestamp. "
+        "Pass `limit` to page through the queue and follow `next_cursor` for the next page. "
+        "Responses carry an `ETag`; send it back in `If-None-Match` to get 304 while nothing changed."
+    ),
+    response_model=_IntakePage,
+    responses={304: {"description": "The page has not changed since the given ETag"}},
 )
 def list_intake_invoices(
     _user: Annotated[UserContext, Depends(get_current_user)],
@@ -40,45 +102,177 @@ def list_intake_invoices(
     source: Annotated[Literal["AP email",
                               "Accounting system"] | None, Query()] = None,
     sort: Annotated[Literal["asc", "desc"], Query()] = "desc",
-) -> ApiResponse[list[InvoiceIntakeItemResponse]]:
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    # Read the version before listing: a write that lands in between only makes the cached page newer.
+    cache = _response_cache_for(service)
+    key = (source, sort, limit, cursor)
+    version = service.get_intake_version()
+    cached = cache.get(key, version)
+    if cached is None:
+        body = _render_intake_page(service, source, sort, limit, cursor)
+        etag = cache.put(key, version, body)
+    else:
+        etag, body = cached
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _render_intake_page(
+    service: InvoiceIngestionService,
+    source: Optional[str],
+    sort: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> bytes:
     mapped_source = IngestionSource(source) if source else None
     newest_first = sort == "desc"
+    after = _decode_cursor(cursor) if cursor else None
     items = service.list_for_analyst(
-        source=mapped_source, newest_first=newest_first)
+        source=mapped_source,
+        newest_first=newest_first,
+        limit=limit + 1 if limit is not None else None,
+        after=after,
+    )
+    next_cursor = None
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode_cursor(items[-1])
 
-    response_items = [
-        InvoiceIntakeItemResponse(
-            dedupe_key=item.dedupe_key,
-            invoice_number=item.metadata.invoice_number,
-            supplier=item.metadata.supplier,
-            amount=item.metadata.amount,
-            invoice_date=item.metadata.invoice_date,
-            file_hash=item.file_hash,
-            history=[
-                IngestionHistoryEntryResponse(
-                    source=entry.source.value,
-                    ingested_at=entry.ingested_at,
-                    status=entry.status,
-                )
-                for entry in item.history
-            ],
+    return dump_intake_page(items, next_cursor)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get(
+    "/invoices/intake/export",
+    summary="Export the intake queue as NDJSON",
+    description=(
+        "Streams every intake invoice with its history, one JSON object per line, oldest first. "
+        "`ingested_from` and `ingested_to` bound the latest ingestion timestamp as a half-open range. "
+        "Send `Accept-Encoding: gzip` for a gzip-compressed stream."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def export_intake_invoices(
+    _user: Annotated[UserContext, Depends(get_current_user)],
+    _scope: Annotated[UserContext, Depends(check_scope("finance_ops"))],
+    service: Annotated[InvoiceIngestionService, Depends(get_invoice_ingestion_service)],
+    source: Annotated[Literal["AP email",
+                              "Accounting system"] | None, Query()] = None,
+    ingested_from: Annotated[datetime | None, Query()] = None,
+    ingested_to: Annotated[datetime | None, Query()] = None,
+    accept_encoding: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    # Normalized before streaming starts: a comparison error inside the generator would truncate a 200.
+    ingested_from = _local_naive(ingested_from)
+    ingested_to = _local_naive(ingested_to)
+    if ingested_from is not None and ingested_to is not None and ingested_from >= ingested_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_TIME_RANGE", "message": "ingested_from must be before ingested_to"},
         )
-        for item in items
-    ]
-    return ApiResponse(success=True, data=response_items)
+    invoices = service.export_intake(
+        source=IngestionSource(source) if source else None,
+        ingested_from=ingested_from,
+        ingested_to=ingested_to,
+    )
+    compress = accept_encoding is not None and _accepts_gzip(accept_encoding)
+    headers = {"Content-Disposition": 'attachment; filename="intake-export.ndjson"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _export_chunks(iter_intake_lines(invoices), compress), media_type="application/x-ndjson", headers=headers)
+
+
+def _export_chunks(lines: Iterator[str], compress: bool) -> Iterator[bytes]:
+    # Lines are batched into ~64 KiB writes; the gzip stream is flushed only at the end.
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffered: list[bytes] = []
+    size = 0
+    for line in lines:
+        encoded = line.encode("utf-8")
+        buffered.append(encoded)
+        size += len(encoded)
+        if size >= _EXPORT_CHUNK_BYTES:
+            chunk = b"".join(buffered)
+            buffered.clear()
+            size = 0
+            chunk = compressor.compress(chunk) if compressor is not None else chunk
+            if chunk:
+                yield chunk
+    chunk = b"".join(buffered)
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.partition(";")
+        if name.strip().lower() in ("gzip", "x-gzip"):
+            quality = parameters.strip().removeprefix("q=")
+            try:
+                return not parameters.strip() or float(quality) > 0
+            except ValueError:
+                return False
+    return False
+
+
+@router.get(
+    # Dedupe keys start with the invoice number, which may contain "/" (INV/2026/001).
+    "/invoices/intake/{dedupe_key:path}/file",
+    summary="Download the attached invoice file",
+    description=(
+        "Streams the stored attachment for an intake invoice. Range requests are supported, "
+        "and servers with the pathsend extension send the file without copying it through Python."
+    ),
+    response_class=FileResponse,
+)
+def download_intake_invoice_file(
+    dedupe_key: str,
+    _user: Annotated[UserContext, Depends(get_current_user)],
+    _scope: Annotated[UserContext, Depends(check_scope("finance_analyst"))],
+    service: Annotated[InvoiceIngestionService, Depends(get_invoice_ingestion_service)],
+) -> FileResponse:
+    attachment = service.get_invoice_attachment(dedupe_key)
+    if attachment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "ATTACHMENT_NOT_FOUND", "message": "No stored file for this invoice"},
+        )
+    return FileResponse(
+        attachment.path,
+        media_type=attachment.media_type,
+        filename=attachment.file_hash,
+        content_disposition_type="inline",
+    )
 
 
 @router.get(
     "/ingestion/status",
     summary="List ingestion failures for operations",
-    description="Returns ingestion failure events for AP email and accounting sync.",
+    description=(
+        "Returns recent ingestion failure events for AP email and accounting sync, oldest first. "
+        "`since` drops older events and `limit` keeps only the newest ones."
+    ),
 )
 def list_ingestion_status(
     _user: Annotated[UserContext, Depends(get_current_user)],
     _scope: Annotated[UserContext, Depends(check_scope("finance_ops"))],
     service: Annotated[InvoiceIngestionService, Depends(get_invoice_ingestion_service)],
+    since: Annotated[datetime | None, Query()] = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
 ) -> ApiResponse[list[IngestionFailureResponse]]:
-    failures = service.list_ingestion_failures()
+    failures = service.list_ingestion_failures(since=_local_naive(since), limit=limit)
     response_items = [
         IngestionFailureResponse(
             source=failure.source.value,
@@ -88,3 +282,57 @@ def list_ingestion_status(
         for failure in failures
     ]
     return ApiResponse(success=True, data=response_items)
+
+
+@router.get(
+    "/ingestion/status/windows",
+    summary="Summarize ingestion failures over sliding windows",
+    description=(
+        "Returns failure counts per source and error type over the last 5 minutes, hour and day. "
+        "`as_of` defaults to the current server time."
+    ),
+)
+def list_ingestion_failure_windows(
+    _user: Annotated[UserContext, Depends(get_current_user)],
+    _scope: Annotated[UserContext, Depends(check_scope("finance_ops"))],
+    service: Annotated[InvoiceIngestionService, Depends(get_invoice_ingestion_service)],
+    as_of: Annotated[datetime | None, Query()] = None,
+) -> ApiResponse[list[IngestionFailureWindowResponse]]:
+    summaries = service.summarize_ingestion_failures(_local_naive(as_of) or datetime.now())
+    response_items = [
+        IngestionFailureWindowResponse(
+            source=summary.source.value,
+            error_type=summary.error_type,
+            last_occurred_at=summary.last_occurred_at,
+            window_counts=dict(summary.window_counts),
+        )
+        for summary in summaries
+    ]
+    return ApiResponse(success=True, data=response_items)
+
+
+def _local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    # Repository timestamps are naive server-local time; offsets such as "Z" are converted to it.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _encode_cursor(invoice: IngestedInvoice) -> str:
+    raw = json.dumps([invoice.latest_ingested_at.isoformat(), invoice.dedupe_key])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> IntakeCursor:
+    try:
+        ingested_at, dedupe_key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        parsed = datetime.fromisoformat(ingested_at)
+        # Cursors are minted from naive repository timestamps; anything that doesn't round-trip is forged.
+        if parsed.tzinfo is not None or parsed.isoformat() != ingested_at:
+            raise ValueError("cursor timestamp is not a repository timestamp")
+        return IntakeCursor(ingested_at=parsed, dedupe_key=str(dedupe_key))
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_CURSOR", "message": "Malformed pagination cursor"},
+        ) from exc
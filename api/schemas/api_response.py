@@ -12,3 +12,7 @@ class ApiResponse(BaseModel, Generic[T]):
     success: bool
     data: T | None = None
     error: str | None = None
+
+
+class PagedApiResponse(ApiResponse[T], Generic[T]):
+    next_cursor: str | None = None
@@ -10,6 +10,8 @@ class IngestionHistoryEntryResponse(BaseModel):
     source: Literal["AP email", "Accounting system"]
     ingested_at: datetime
     status: str
+    first_seen_at: datetime
+    seen_count: int = 1
 
 
 class InvoiceIntakeItemResponse(BaseModel):
@@ -26,3 +28,10 @@ class IngestionFailureResponse(BaseModel):
     source: Literal["AP email", "Accounting system"]
     error_type: str
     occurred_at: datetime
+
+
+class IngestionFailureWindowResponse(BaseModel):
+    source: Literal["AP email", "Accounting system"]
+    error_type: str
+    last_occurred_at: datetime
+    window_counts: dict[str, int]
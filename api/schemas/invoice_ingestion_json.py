@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from json.encoder import encode_basestring
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import pydantic_core
+
+from common.ingestion_types import IngestedInvoice, IngestionSource
+
+# Writes the PagedApiResponse[list[InvoiceIntakeItemResponse]] JSON straight from domain objects,
+# byte-for-byte equal to pydantic's output: field order, float and datetime formats included.
+_SOURCE_PREFIXES = {source: f'{{"source":{encode_basestring(source.value)},"ingested_at":' for source in IngestionSource}
+_TIMESTAMP_MEMO_SIZE = 4_096
+
+
+def dump_intake_page(invoices: Sequence[IngestedInvoice], next_cursor: Optional[str]) -> bytes:
+    timestamp = _timestamp_renderer()
+    parts = ['{"success":true,"data":[']
+    for position, invoice in enumerate(invoices):
+        if position:
+            parts.append(",")
+        _write_item(parts.append, invoice, timestamp)
+    parts.append(f'],"error":null,"next_cursor":{"null" if next_cursor is None else encode_basestring(next_cursor)}}}')
+    return "".join(parts).encode("utf-8")
+
+
+def iter_intake_lines(invoices: Iterable[IngestedInvoice]) -> Iterator[str]:
+    # One InvoiceIntakeItemResponse object per line (NDJSON), rendered lazily as invoices arrive.
+    timestamp = _timestamp_renderer()
+    for invoice in invoices:
+        parts: list[str] = []
+        _write_item(parts.append, invoice, timestamp)
+        parts.append("\n")
+        yield "".join(parts)
+
+
+def _write_item(append: Callable[[str], None], invoice: IngestedInvoice, timestamp: Callable[[datetime], str]) -> None:
+    metadata = invoice.metadata
+    append(
+        f'{{"dedupe_key":{encode_basestring(invoice.dedupe_key)},'
+        f'"invoice_number":{encode_basestring(metadata.invoice_number)},'
+        f'"supplier":{encode_basestring(metadata.supplier)},'
+        f'"amount":{_float(metadata.amount)},'
+        f'"invoice_date":{timestamp(metadata.invoice_date)},'
+        f'"file_hash":{"null" if invoice.file_hash is None else encode_basestring(invoice.file_hash)},'
+        '"history":['
+    )
+    for index, entry in enumerate(invoice.history):
+        append(
+            f'{"," if index else ""}{_SOURCE_PREFIXES[entry.source]}{timestamp(entry.ingested_at)},'
+            f'"status":{encode_basestring(entry.status)},'
+            f'"first_seen_at":{timestamp(entry.first_seen_at)},'
+            f'"seen_count":{entry.seen_count:d}}}'
+        )
+    append("]}")
+
+
+def _timestamp_renderer() -> Callable[[datetime], str]:
+    # Listings repeat timestamps heavily (first_seen_at usually equals ingested_at), so naive ones are
+    # memoized; the memo is reset when full so long exports stay in constant memory.
+    rendered: dict[datetime, str] = {}
+
+    def timestamp(value: datetime) -> str:
+        if value.tzinfo is not None:
+            return _datetime(value)
+        text = rendered.get(value)
+        if text is None:
+            if len(rendered) >= _TIMESTAMP_MEMO_SIZE:
+                rendered.clear()
+            text = rendered[value] = _datetime(value)
+        return text
+
+    return timestamp
+
+
+def _float(value: float) -> str:
+    # Python's shortest repr matches pydantic's for plain decimals; exponents and inf/nan differ.
+    text = repr(float(value))
+    if "e" in text or not math.isfinite(value):
+        return pydantic_core.to_json(float(value), inf_nan_mode="null").decode("ascii")
+    return text
+
+
+def _datetime(value: datetime) -> str:
+    # Aware values differ (pydantic writes UTC as "Z"), so only naive ones take the isoformat shortcut.
+    if value.tzinfo is None:
+        return f'"{value.isoformat()}"'
+    return pydantic_core.to_json(value).decode("ascii")
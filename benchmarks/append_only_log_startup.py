@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from adapters.append_only_log_intake_repository_adapter import AppendOnlyLogIntakeRepositoryAdapter
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from common.ingestion_types import IngestedInvoice, IngestionHistoryAppend, IngestionSource, InvoiceMetadata
+
+_BATCH_SIZE = 5_000
+
+
+def _invoice(index: int) -> IngestedInvoice:
+    invoice = IngestedInvoice(
+        dedupe_key=f"inv-{index:08d}|contoso|2026-02-01|100.00",
+        metadata=InvoiceMetadata(
+            invoice_number=f"INV-{index:08d}",
+            supplier="Contoso",
+            amount=100.0,
+            invoice_date=datetime(2026, 2, 1),
+        ),
+        file_hash=None,
+    )
+    invoice.record_event(
+        source=IngestionSource.AP_EMAIL, ingested_at=datetime(2026, 2, 1) + timedelta(seconds=index), status=f"ingested:{index}")
+    return invoice
+
+
+def _open(directory: str, snapshot_every: int) -> AppendOnlyLogIntakeRepositoryAdapter:
+    return AppendOnlyLogIntakeRepositoryAdapter(
+        directory, state=InMemoryIntakeRepositoryAdapter(), fsync_batch_size=_BATCH_SIZE, snapshot_every=snapshot_every)
+
+
+def _populate(repository: AppendOnlyLogIntakeRepositoryAdapter, invoices: int, duplicates: int, tail: int) -> None:
+    for start in range(0, invoices, _BATCH_SIZE):
+        repository.save_many([_invoice(index) for index in range(start, min(start + _BATCH_SIZE, invoices))])
+    events = [
+        IngestionHistoryAppend(
+            dedupe_key=_invoice(index % invoices).dedupe_key,
+            source=IngestionSource.ACCOUNTING_SYSTEM,
+            processed_at=datetime(2026, 3, 1) + timedelta(seconds=index),
+            status=f"duplicate_seen:acct-{index}",
+        )
+        for index in range(duplicates)
+    ]
+    for start in range(0, len(events) - tail, _BATCH_SIZE):
+        repository.append_history_many(events[start:min(start + _BATCH_SIZE, len(events) - tail)])
+    if tail < len(events):
+        repository.snapshot()
+    repository.append_history_many(events[len(events) - tail:])
+    repository.close()
+
+
+def _startup_seconds(directory: str) -> float:
+    started = time.perf_counter()
+    repository = _open(directory, snapshot_every=10**12)
+    elapsed = time.perf_counter() - started
+    repository.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Append-only log startup: full replay vs snapshot plus tail")
+    parser.add_argument("--invoices", type=int, default=100_000)
+    parser.add_argument("--duplicates", type=int, default=400_000)
+    parser.add_argument("--tail", type=int, default=1_000)
+    args = parser.parse_args()
+
+    for label, tail in [("full log replay", args.duplicates), ("snapshot + tail", args.tail)]:
+        with tempfile.TemporaryDirectory() as directory:
+            _populate(_open(directory, snapshot_every=10**12), args.invoices, args.duplicates, tail)
+            on_disk = sum(path.stat().st_size for path in Path(directory).iterdir())
+            print(f"{label:>16}: startup {_startup_seconds(directory):8.3f}s, {on_disk / 1e6:8.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
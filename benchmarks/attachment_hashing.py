@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import time
+from datetime import datetime
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from common.ingestion_types import IngestionSource, InvoiceMetadata, SourceInvoicePayload
+from services.invoice_ingestion_service import InvoiceIngestionService
+
+
+def _payloads(pdfs: list[bytes], as_stream: bool) -> list[SourceInvoicePayload]:
+    return [
+        SourceInvoicePayload(
+            source_id=f"mail-{index}",
+            metadata=InvoiceMetadata(invoice_number="", supplier="", amount=0.0, invoice_date=datetime(2026, 2, 1)),
+            file_hash=None,
+            received_at=datetime(2026, 2, 1),
+            attachment=io.BytesIO(pdf) if as_stream else pdf,
+        )
+        for index, pdf in enumerate(pdfs)
+    ]
+
+
+def _throughput_mb_s(pdfs: list[bytes], workers: int, as_stream: bool, repeat: int) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        service = InvoiceIngestionService(
+            intake_repository=InMemoryIntakeRepositoryAdapter(),
+            alert_port=NoopIngestionAlertAdapter(),
+            attachment_hash_workers=workers,
+        )
+        payloads = _payloads(pdfs, as_stream)
+        started = time.perf_counter()
+        service.ingest_many(source=IngestionSource.AP_EMAIL, payloads=payloads, processed_at=datetime(2026, 2, 1))
+        elapsed += time.perf_counter() - started
+    return sum(len(pdf) for pdf in pdfs) * repeat / elapsed / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Attachment hashing throughput during batch ingestion")
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    worker_counts = sorted({1, os.cpu_count() or 1})
+    print(f"{'pdf MB':>7} {'batch':>6} {'input':>7} " + " ".join(f"{f'{workers} worker MB/s':>16}" for workers in worker_counts))
+    for size_mb in args.sizes_mb:
+        pdfs = [b"%PDF-1.7\n" + os.urandom(size_mb * 1_000_000) for _ in range(args.batch)]
+        for as_stream in (False, True):
+            results = [_throughput_mb_s(pdfs, workers, as_stream, args.repeat) for workers in worker_counts]
+            label = "stream" if as_stream else "buffer"
+            print(f"{size_mb:>7} {args.batch:>6} {label:>7} " + " ".join(f"{result:>16.0f}" for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Sequence
+
+from pydantic import TypeAdapter
+
+from api.schemas.api_response import PagedApiResponse
+from api.schemas.invoice_ingestion import IngestionHistoryEntryResponse, InvoiceIntakeItemResponse
+from api.schemas.invoice_ingestion_json import dump_intake_page
+from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata
+
+_IntakePage = PagedApiResponse[list[InvoiceIntakeItemResponse]]
+_page_adapter = TypeAdapter(_IntakePage)
+
+
+def _invoice(index: int) -> IngestedInvoice:
+    invoice = IngestedInvoice(
+        dedupe_key=f"inv-{index:08d}|contoso|2026-02-01|{100 + index % 997:.2f}",
+        metadata=InvoiceMetadata(
+            invoice_number=f"INV-{index:08d}",
+            supplier="Contoso",
+            amount=100.0 + index % 997,
+            invoice_date=datetime(2026, 2, 1),
+        ),
+        file_hash=f"{index:064x}",
+    )
+    ingested_at = datetime(2026, 2, 1) + timedelta(seconds=index)
+    invoice.record_event(source=IngestionSource.AP_EMAIL, ingested_at=ingested_at, status=f"ingested:mail-{index}")
+    invoice.record_event(
+        source=IngestionSource.ACCOUNTING_SYSTEM, ingested_at=ingested_at, status=f"duplicate_seen:acct-{index}")
+    return invoice
+
+
+def _pydantic_page(invoices: Sequence[IngestedInvoice]) -> bytes:
+    # Mirrors the previous route: build the response models, then let the response model
+    # validate and serialize them again the way FastAPI does for a returned model.
+    page = _IntakePage(
+        success=True,
+        data=[
+            InvoiceIntakeItemResponse(
+                dedupe_key=invoice.dedupe_key,
+                invoice_number=invoice.metadata.invoice_number,
+                supplier=invoice.metadata.supplier,
+                amount=invoice.metadata.amount,
+                invoice_date=invoice.metadata.invoice_date,
+                file_hash=invoice.file_hash,
+                history=[
+                    IngestionHistoryEntryResponse(
+                        source=entry.source.value,
+                        ingested_at=entry.ingested_at,
+                        status=entry.status,
+                        first_seen_at=entry.first_seen_at,
+                        seen_count=entry.seen_count,
+                    )
+                    for entry in invoice.history
+                ],
+            )
+            for invoice in invoices
+        ],
+    )
+    return _page_adapter.dump_json(_page_adapter.validate_python(page, from_attributes=True))
+
+
+def _fast_page(invoices: Sequence[IngestedInvoice]) -> bytes:
+    return dump_intake_page(invoices, None)
+
+
+def _best_ms(render: Callable[[Sequence[IngestedInvoice]], bytes], invoices: Sequence[IngestedInvoice], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(invoices)
+        best = min(best, time.perf_counter() - started)
+    return best * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Intake listing serialization: pydantic models vs direct JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'pydantic ms':>12} {'direct ms':>10} {'speedup':>8} {'identical':>10}")
+    for size in args.sizes:
+        invoices = [_invoice(index) for index in range(size)]
+        identical = _pydantic_page(invoices) == _fast_page(invoices)
+        pydantic_ms = _best_ms(_pydantic_page, invoices, args.repeat)
+        fast_ms = _best_ms(_fast_page, invoices, args.repeat)
+        print(f"{size:>8,} {pydantic_ms:>12.1f} {fast_ms:>10.1f} {pydantic_ms / fast_ms:>7.1f}x {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
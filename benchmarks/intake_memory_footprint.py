@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata
+
+
+@dataclass(frozen=True)
+class _DictInvoiceMetadata:
+    invoice_number: str
+    supplier: str
+    amount: float
+    invoice_date: datetime
+
+
+@dataclass
+class _DictHistoryEntry:
+    source: IngestionSource
+    ingested_at: datetime
+    status: str
+
+
+@dataclass
+class _DictIngestedInvoice:
+    dedupe_key: str
+    metadata: _DictInvoiceMetadata
+    file_hash: Optional[str]
+    history: list[_DictHistoryEntry] = field(default_factory=list)
+
+    def record_event(self, source: IngestionSource, ingested_at: datetime, status: str) -> None:
+        self.history.append(_DictHistoryEntry(source=source, ingested_at=ingested_at, status=status))
+
+
+def _build(metadata_type: type, invoice_type: type, invoices: int, events_per_invoice: int) -> list[object]:
+    started = datetime(2026, 2, 1)
+    built = []
+    for index in range(invoices):
+        invoice = invoice_type(
+            dedupe_key=f"inv-{index:08d}|contoso|2026-02-01|100.00",
+            metadata=metadata_type(
+                invoice_number=f"INV-{index:08d}",
+                supplier="Contoso",
+                amount=100.0,
+                invoice_date=started,
+            ),
+            file_hash=None,
+        )
+        for event in range(events_per_invoice):
+            kind = "ingested" if event == 0 else "duplicate_seen"
+            invoice.record_event(
+                source=IngestionSource.AP_EMAIL,
+                ingested_at=started + timedelta(seconds=event),
+                status=f"{kind}:mail-{index}-{event}",
+            )
+        built.append(invoice)
+    return built
+
+
+def _measure(build: Callable[[], list[object]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    retained = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resident bytes per invoice and per history event")
+    parser.add_argument("--invoices", type=int, default=100_000)
+    parser.add_argument("--events-per-invoice", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'layout':>8} {'bytes/invoice':>15} {'bytes/event':>13}")
+    for label, metadata_type, invoice_type in [
+        ("dict", _DictInvoiceMetadata, _DictIngestedInvoice),
+        ("slotted", InvoiceMetadata, IngestedInvoice),
+    ]:
+        bare = _measure(lambda: _build(metadata_type, invoice_type, args.invoices, 0))
+        full = _measure(lambda: _build(metadata_type, invoice_type, args.invoices, args.events_per_invoice))
+        per_event = (full - bare) / (args.invoices * args.events_per_invoice)
+        print(f"{label:>8} {bare / args.invoices:>15.1f} {per_event:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.sqlite_intake_repository_adapter import SqliteIntakeRepositoryAdapter
+from common.ingestion_types import IngestedInvoice, IngestionSource, IntakeCursor, InvoiceMetadata
+from ports.outbound.intake_repository_port import IntakeRepositoryPort
+
+_BATCH_SIZE = 5_000
+_PAGE_SIZE = 50
+
+
+def _invoice(index: int) -> IngestedInvoice:
+    source = IngestionSource.AP_EMAIL if index % 3 else IngestionSource.ACCOUNTING_SYSTEM
+    invoice = IngestedInvoice(
+        dedupe_key=f"inv-{index:08d}|contoso|2026-02-01|100.00",
+        metadata=InvoiceMetadata(
+            invoice_number=f"INV-{index:08d}",
+            supplier="Contoso",
+            amount=100.0,
+            invoice_date=datetime(2026, 2, 1),
+        ),
+        file_hash=None,
+    )
+    invoice.record_event(source=source, ingested_at=datetime(2026, 2, 1) + timedelta(seconds=index), status=f"ingested:{index}")
+    return invoice
+
+
+def _timed(operation: Callable[[], object], repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    return (time.perf_counter() - started) / repeat
+
+
+def run(repository: IntakeRepositoryPort, size: int) -> dict[str, float]:
+    results: dict[str, float] = {}
+    started = time.perf_counter()
+    for start in range(0, size, _BATCH_SIZE):
+        repository.save_many([_invoice(index) for index in range(start, min(start + _BATCH_SIZE, size))])
+    results["load_s"] = time.perf_counter() - started
+
+    lookup_keys = [_invoice(index).dedupe_key for index in range(0, size, max(size // 1000, 1))]
+    results["lookup_us"] = _timed(lambda: [repository.find_by_dedupe_key(key) for key in lookup_keys]) / len(lookup_keys) * 1e6
+    results["first_page_ms"] = _timed(lambda: repository.list_by_source_sorted(None, limit=_PAGE_SIZE), repeat=20) * 1e3
+    middle = _invoice(size // 2)
+    deep_cursor = IntakeCursor(ingested_at=middle.latest_ingested_at, dedupe_key=middle.dedupe_key)
+    results["deep_page_ms"] = _timed(
+        lambda: repository.list_by_source_sorted(None, limit=_PAGE_SIZE, after=deep_cursor), repeat=20) * 1e3
+    results["source_page_ms"] = _timed(
+        lambda: repository.list_by_source_sorted(
+            IngestionSource.ACCOUNTING_SYSTEM, limit=_PAGE_SIZE, after=deep_cursor), repeat=20) * 1e3
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-memory vs SQLite intake repository benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    columns = ["load_s", "lookup_us", "first_page_ms", "deep_page_ms", "source_page_ms"]
+    print(f"{'backend':>10} {'invoices':>10} " + " ".join(f"{column:>15}" for column in columns))
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            sqlite_repository = SqliteIntakeRepositoryAdapter(str(Path(directory) / "intake.db"))
+            backends: dict[str, IntakeRepositoryPort] = {
+                "memory": InMemoryIntakeRepositoryAdapter(),
+                "sqlite": sqlite_repository,
+            }
+            for name, repository in backends.items():
+                results = run(repository, size)
+                print(f"{name:>10} {size:>10,} " + " ".join(f"{results[column]:>15.3f}" for column in columns))
+            sqlite_repository.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from common.ingestion_types import (
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    InvoiceMetadata,
+)
+
+
+class SimulatedLatencyRepository(InMemoryIntakeRepositoryAdapter):
+    # Stands in for a backend write: the latency is spent inside the key lock, the way a real
+    # store would block while it owns the key; the recency-index update after it is unchanged.
+    def __init__(self, lock_stripes: int, write_latency: float) -> None:
+        super().__init__(lock_stripes=lock_stripes)
+        self._write_latency = write_latency
+
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        with self._key_lock(candidate.invoice.dedupe_key):
+            time.sleep(self._write_latency)
+            return super().save_new_or_append_history(candidate)
+
+
+def _candidate(worker: int, index: int, distinct_invoices: int) -> IngestionCandidate:
+    invoice_number = f"INV-{(worker * 7919 + index) % distinct_invoices}"
+    processed_at = datetime(2026, 2, 19) + timedelta(seconds=index)
+    source = IngestionSource.AP_EMAIL if worker % 2 else IngestionSource.ACCOUNTING_SYSTEM
+    invoice = IngestedInvoice(
+        dedupe_key=invoice_number.lower(),
+        metadata=InvoiceMetadata(
+            invoice_number=invoice_number,
+            supplier="Contoso",
+            amount=100.0,
+            invoice_date=datetime(2026, 2, 1),
+        ),
+        file_hash=None,
+    )
+    invoice.record_event(source=source, ingested_at=processed_at, status=f"ingested:{worker}-{index}")
+    return IngestionCandidate(
+        invoice=invoice,
+        duplicate_events=[
+            IngestionHistoryAppend(invoice.dedupe_key, source, processed_at, f"duplicate_seen:{worker}-{index}")],
+    )
+
+
+def run(threads: int, lock_stripes: int, operations: int, write_latency: float, distinct_invoices: int) -> float:
+    # A zero latency measures the unmodified adapter, index lock and insort included.
+    repository = (
+        SimulatedLatencyRepository(lock_stripes=lock_stripes, write_latency=write_latency)
+        if write_latency else InMemoryIntakeRepositoryAdapter(lock_stripes=lock_stripes)
+    )
+    per_thread = operations // threads
+    workloads = [
+        [_candidate(worker, index, distinct_invoices) for index in range(per_thread)]
+        for worker in range(threads)
+    ]
+    barrier = threading.Barrier(threads + 1)
+
+    def _worker(candidates: list[IngestionCandidate]) -> None:
+        barrier.wait()
+        for candidate in candidates:
+            repository.save_new_or_append_history(candidate)
+
+    workers = [threading.Thread(target=_worker, args=(workload,)) for workload in workloads]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Intake repository find-or-create contention benchmark")
+    parser.add_argument("--operations", type=int, default=4000)
+    parser.add_argument("--write-latency-us", type=float, default=200.0)
+    parser.add_argument("--distinct-invoices", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    write_latency = args.write_latency_us / 1_000_000
+    print(f"{'':>8} {'simulated backend write':>37} {'unmodified adapter':>37}")
+    print(f"{'threads':>8} {'global lock ops/s':>18} {'64 stripes ops/s':>18} "
+          f"{'global lock ops/s':>18} {'64 stripes ops/s':>18}")
+    for threads in args.threads:
+        rates = [
+            run(threads, lock_stripes, args.operations, latency, args.distinct_invoices)
+            for latency in (write_latency, 0.0)
+            for lock_stripes in (1, 64)
+        ]
+        print(f"{threads:>8} " + " ".join(f"{rate:>18,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.in_memory_near_duplicate_index_adapter import InMemoryNearDuplicateIndexAdapter
+from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from common.ingestion_types import IngestionSource, InvoiceMetadata, SourceInvoicePayload
+from domain.near_duplicate_policy import NearDuplicatePolicy
+from services.invoice_ingestion_service import InvoiceIngestionService
+
+_BATCH_SIZE = 5_000
+_SUPPLIERS = 2_000
+
+
+class _CountingPolicy(NearDuplicatePolicy):
+    comparisons = 0
+
+    @staticmethod
+    def matches(left: InvoiceMetadata, right: InvoiceMetadata) -> bool:
+        _CountingPolicy.comparisons += 1
+        return NearDuplicatePolicy.matches(left, right)
+
+
+def _payload(index: int, near_miss: bool = False) -> SourceInvoicePayload:
+    invoice_number = f"INV{index:08d}" if near_miss else f"INV-{index:08d}"
+    return SourceInvoicePayload(
+        source_id=f"{'near' if near_miss else 'mail'}-{index}",
+        metadata=InvoiceMetadata(
+            invoice_number=invoice_number,
+            supplier=f"Supplier {index % _SUPPLIERS} {'Limited' if near_miss else 'Ltd'}",
+            amount=float(100 + index % 997),
+            invoice_date=datetime(2026, 1, 1) + timedelta(days=index % 300 + (1 if near_miss else 0)),
+        ),
+        file_hash=None,
+        received_at=datetime(2026, 2, 1),
+    )
+
+
+def _per_ingest_us(service: InvoiceIngestionService, size: int, probes: int) -> float:
+    started = time.perf_counter()
+    for probe in range(probes):
+        payload = _payload(probe * (size // probes), near_miss=True)
+        service.ingest_ap_email_invoice(
+            source_id=payload.source_id, metadata=payload.metadata, file_hash=None, processed_at=datetime(2026, 2, 2))
+    return (time.perf_counter() - started) / probes * 1e6
+
+
+def _linear_scan_us(size: int, probes: int) -> float:
+    stored = [_payload(index).metadata for index in range(size)]
+    started = time.perf_counter()
+    for probe in range(probes):
+        metadata = _payload(probe * (size // probes), near_miss=True).metadata
+        next((candidate for candidate in stored if NearDuplicatePolicy.matches(candidate, metadata)), None)
+    return (time.perf_counter() - started) / probes * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-ingest near-duplicate cost as the store grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--probes", type=int, default=200)
+    args = parser.parse_args()
+
+    # Ingest time includes the history append on the matched invoice; comparisons isolate the detector.
+    print(f"{'invoices':>10} {'blocked ingest us':>18} {'comparisons/ingest':>19} {'linear scan us':>15}")
+    for size in args.sizes:
+        service = InvoiceIngestionService(
+            intake_repository=InMemoryIntakeRepositoryAdapter(),
+            alert_port=NoopIngestionAlertAdapter(),
+            near_duplicate_index=InMemoryNearDuplicateIndexAdapter(),
+            near_duplicate_policy=_CountingPolicy,
+        )
+        for start in range(0, size, _BATCH_SIZE):
+            service.ingest_many(
+                source=IngestionSource.ACCOUNTING_SYSTEM,
+                payloads=[_payload(index) for index in range(start, min(start + _BATCH_SIZE, size))],
+                processed_at=datetime(2026, 2, 1),
+            )
+        _CountingPolicy.comparisons = 0
+        blocked = _per_ingest_us(service, size, args.probes)
+        comparisons = _CountingPolicy.comparisons / args.probes
+        print(f"{size:>10,} {blocked:>18.1f} {comparisons:>19.1f} {_linear_scan_us(size, args.probes):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import BinaryIO, Optional, Sequence, Union
 
 
 class IngestionSource(str, Enum):
@@ -11,7 +12,11 @@ class IngestionSource(str, Enum):
     ACCOUNTING_SYSTEM = "Accounting system"
 
 
-@dataclass(frozen=True)
+DUPLICATE_SEEN = "duplicate_seen"
+NEAR_DUPLICATE_SEEN = "near_duplicate_seen"
+
+
+@dataclass(frozen=True, slots=True)
 class InvoiceMetadata:
     invoice_number: str
     supplier: str
@@ -19,27 +24,197 @@ class InvoiceMetadata:
     invoice_date: datetime
 
 
+# A seekable stream is read from its current position and rewound there afterwards.
+AttachmentContent = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+@dataclass(frozen=True)
+class StoredAttachment:
+    file_hash: str
+    path: str
+    size: int
+    media_type: str
+
+
 @dataclass(frozen=True)
 class SourceInvoicePayload:
     source_id: str
     metadata: InvoiceMetadata
     file_hash: Optional[str]
     received_at: datetime
+    attachment: Optional[AttachmentContent] = None
 
 
-@dataclass
-class IngestionHistoryEntry:
-    source: IngestionSource
+@dataclass(frozen=True)
+class SourceChangeBatch:
+    # `watermark` is the source's opaque position after these payloads (a modified-at or sequence id).
+    payloads: Sequence[SourceInvoicePayload]
+    watermark: Optional[str]
+    has_more: bool = False
+
+
+@dataclass(frozen=True)
+class NearDuplicateCandidate:
+    dedupe_key: str
+    metadata: InvoiceMetadata
+
+
+@dataclass(frozen=True)
+class ProcessedSourceRecord:
+    # What a source_id was last ingested as: the content it carried and the invoice it resolved to.
+    fingerprint: str
+    dedupe_key: str
+
+
+@dataclass(frozen=True)
+class IntakeCursor:
     ingested_at: datetime
+    dedupe_key: str
+
+
+@dataclass(frozen=True)
+class IngestionHistoryAppend:
+    dedupe_key: str
+    source: IngestionSource
+    processed_at: datetime
     status: str
 
 
-@dataclass
+class IngestionHistoryEntry:
+    # The status is held as an interned kind plus the source id so repeated kinds share one string.
+    # A compacted entry stands for seen_count sightings; ingested_at is the last one.
+    __slots__ = ("source", "ingested_at", "kind", "source_id", "first_seen_at", "seen_count")
+
+    def __init__(
+        self,
+        source: IngestionSource,
+        ingested_at: datetime,
+        status: str,
+        first_seen_at: Optional[datetime] = None,
+        seen_count: int = 1,
+    ) -> None:
+        kind, separator, source_id = status.partition(":")
+        self.source = source
+        self.ingested_at = ingested_at
+        self.kind = sys.intern(kind)
+        self.source_id: Optional[str] = source_id if separator else None
+        self.first_seen_at = first_seen_at if first_seen_at is not None else ingested_at
+        self.seen_count = seen_count
+
+    @property
+    def status(self) -> str:
+        return self.kind if self.source_id is None else f"{self.kind}:{self.source_id}"
+
+    def with_sighting(self, seen_at: datetime) -> IngestionHistoryEntry:
+        return IngestionHistoryEntry(
+            source=self.source,
+            ingested_at=max(self.ingested_at, seen_at),
+            status=self.status,
+            first_seen_at=min(self.first_seen_at, seen_at),
+            seen_count=self.seen_count + 1,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IngestionHistoryEntry):
+            return NotImplemented
+        return (self.source, self.ingested_at, self.kind, self.source_id, self.first_seen_at, self.seen_count) == (
+            other.source, other.ingested_at, other.kind, other.source_id, other.first_seen_at, other.seen_count)
+
+    def __repr__(self) -> str:
+        return (
+            f"IngestionHistoryEntry(source={self.source!r}, ingested_at={self.ingested_at!r}, status={self.status!r}, "
+            f"first_seen_at={self.first_seen_at!r}, seen_count={self.seen_count!r})"
+        )
+
+
+@dataclass(slots=True)
 class IngestedInvoice:
     dedupe_key: str
     metadata: InvoiceMetadata
     file_hash: Optional[str]
     history: list[IngestionHistoryEntry] = field(default_factory=list)
 
-    def record_event(self, source: IngestionSource, ingested_at: datetime, status: str) -> None:
+    @property
+    def latest_ingested_at(self) -> datetime:
+        return max(event.ingested_at for event in self.history)
+
+    def record_event(self, source: IngestionSource, ingested_at: datetime, status: str, compact: bool = False) -> None:
+        # A compacted sighting replaces its entry rather than changing it, so history handed out earlier stays
+        # a consistent snapshot.
+        if compact and status.startswith(f"{DUPLICATE_SEEN}:"):
+            for position in range(len(self.history) - 1, -1, -1):
+                entry = self.history[position]
+                if entry.source == source and entry.kind == DUPLICATE_SEEN and entry.status == status:
+                    self.history[position] = entry.with_sighting(ingested_at)
+                    return
         self.history.append(IngestionHistoryEntry(source=source, ingested_at=ingested_at, status=status))
+
+
+@dataclass(frozen=True)
+class IngestionCandidate:
+    invoice: IngestedInvoice
+    duplicate_events: Sequence[IngestionHistoryAppend]
+
+
+@dataclass
+class IngestionRunSummary:
+    source: IngestionSource
+    new_count: int = 0
+    duplicate_count: int = 0
+    chunk_seconds: list[float] = field(default_factory=list)
+    failed: bool = False
+    budget_exceeded: bool = False
+
+
+@dataclass(frozen=True)
+class SourceSyncReport:
+    source: IngestionSource
+    fetch_seconds: float = 0.0
+    ingest_seconds: float = 0.0
+    new_count: int = 0
+    duplicate_count: int = 0
+    failed: bool = False
+    timed_out: bool = False
+
+
+@dataclass(frozen=True)
+class HistoryPurgeResult:
+    cutoff: datetime
+    dropped_partitions: Sequence[str] = ()
+    purged_events: int = 0
+    purged_invoices: int = 0
+    newest_purged_at: Optional[datetime] = None
+    oldest_retained_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class HistoryRetentionReport:
+    required_since: datetime
+    purge: HistoryPurgeResult
+
+    @property
+    def compliance_signal(self) -> dict[str, Optional[str]]:
+        newest_purged_at = self.purge.newest_purged_at
+        oldest_retained_at = self.purge.oldest_retained_at
+        return {
+            "required_since": self.required_since.isoformat(),
+            "cutoff": self.purge.cutoff.isoformat(),
+            "newest_purged_at": newest_purged_at.isoformat() if newest_purged_at is not None else None,
+            "oldest_retained_at": oldest_retained_at.isoformat() if oldest_retained_at is not None else None,
+        }
+
+
+def history_partition(value: datetime) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def history_partition_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class ScheduledRunRecord:
+    source: IngestionSource
+    started_at: datetime
+    duration_seconds: float
+    summary: Optional[IngestionRunSummary]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class SourceTimeoutError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    jitter: Callable[[], float] = field(default=random.random, compare=False)
+
+    def delay(self, attempt: int) -> float:
+        # Full jitter: a uniform pick below the capped exponential backoff for this attempt.
+        return self.jitter() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+
+CircuitTransition = tuple[CircuitState, CircuitState]
+
+
+class CircuitBreaker:
+    # Opens after `failure_threshold` consecutive failures and fails fast until `reset_timeout` passes,
+    # then lets a single probe through (half-open) whose outcome closes or re-opens the circuit.
+    # Each state change is handed back to the one caller that caused it, so it can be reported once.
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def acquire(self) -> Optional[CircuitTransition]:
+        with self._lock:
+            previous = self._state
+            if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                self._state = CircuitState.HALF_OPEN
+            if self._state is CircuitState.OPEN or (self._state is CircuitState.HALF_OPEN and self._probing):
+                raise CircuitOpenError("circuit is open")
+            self._probing = self._state is CircuitState.HALF_OPEN
+            return _transition(previous, self._state)
+
+    def record_success(self) -> Optional[CircuitTransition]:
+        with self._lock:
+            previous = self._state
+            self._state, self._failures, self._probing = CircuitState.CLOSED, 0, False
+            return _transition(previous, self._state)
+
+    def record_failure(self) -> Optional[CircuitTransition]:
+        with self._lock:
+            previous = self._state
+            self._failures += 1
+            self._probing = False
+            if previous is CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state, self._opened_at = CircuitState.OPEN, self._clock()
+            return _transition(previous, self._state)
+
+
+def _transition(previous: CircuitState, current: CircuitState) -> Optional[CircuitTransition]:
+    return (previous, current) if previous is not current else None
+
+
+def call_resilient(
+    operation: Callable[[], T],
+    breaker: Optional[CircuitBreaker] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    on_transition: Optional[Callable[[CircuitState, CircuitState], None]] = None,
+    deadline: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> T:
+    # Every attempt goes through the breaker, so retries stop as soon as the circuit opens.
+    # `on_transition` runs for each circuit state change this call caused.
+    # The deadline is checked before the breaker is asked: running out of local time is not a source
+    # failure, so it is neither retried nor counted, and no backoff sleeps past it.
+    attempts = max(retry_policy.max_attempts, 1) if retry_policy is not None else 1
+
+    def report(transition: Optional[CircuitTransition]) -> None:
+        if transition is not None and on_transition is not None:
+            on_transition(*transition)
+
+    attempt = 0
+    while True:
+        remaining_time(deadline, clock)
+        if breaker is not None:
+            report(breaker.acquire())
+        try:
+            result = operation()
+        except Exception:
+            if breaker is not None:
+                report(breaker.record_failure())
+            attempt += 1
+            if attempt >= attempts or (breaker is not None and breaker.state is CircuitState.OPEN):
+                raise
+            delay = retry_policy.delay(attempt - 1)
+            if deadline is not None:
+                delay = min(delay, max(deadline - clock(), 0.0))
+            sleep(delay)
+        else:
+            if breaker is not None:
+                report(breaker.record_success())
+            return result
+
+
+def remaining_time(deadline: Optional[float], clock: Callable[[], float] = time.monotonic) -> Optional[float]:
+    # Seconds left before a monotonic deadline; a source call that would start after it is refused.
+    if deadline is None:
+        return None
+    remaining = deadline - clock()
+    if remaining <= 0:
+        raise SourceTimeoutError("source deadline passed")
+    return remaining
+
+
+class ResilientSource:
+    # The fetch path shared by the source adapters: client calls go through the breaker and retry
+    # policy, and client errors surface as SourceTimeoutError or RuntimeError labelled with the source.
+    def __init__(
+        self,
+        label: str,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        on_transition: Optional[Callable[[CircuitState, CircuitState], None]] = None,
+    ) -> None:
+        self._label = label
+        self._circuit_breaker = circuit_breaker
+        self._retry_policy = retry_policy
+        self._on_transition = on_transition
+
+    def call(self, operation: Callable[[], T]) -> T:
+        try:
+            return self._call(operation, self._retry_policy)
+        except Exception as exc:
+            raise RuntimeError(f"{self._label} source fetch failed") from exc
+
+    def fetch(self, fetch: Callable[..., T], timeout: Optional[float] = None) -> T:
+        # The client gets what is left of `timeout` on every attempt, and no attempt starts past the deadline.
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def attempt() -> T:
+            return fetch() if deadline is None else fetch(timeout=_time_left(deadline))
+
+        try:
+            return self._call(attempt, self._retry_policy, deadline)
+        except (SourceTimeoutError, TimeoutError) as exc:
+            raise SourceTimeoutError(f"{self._label} source fetch timed out") from exc
+        except Exception as exc:
+            raise RuntimeError(f"{self._label} source fetch failed") from exc
+
+    def fetch_chunks(
+        self,
+        open_feed: Callable[..., Iterable[T]],
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[list[T]]:
+        # Retries cover opening the feed and its first chunk; once items have been yielded a failure
+        # is only counted by the breaker, since replaying the feed would hand out chunks twice.
+        # The client gets what is left of `timeout` and must give up before consuming anything.
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        def first_chunk() -> tuple[Iterator[T], list[T]]:
+            items = iter(open_feed() if deadline is None else open_feed(timeout=_time_left(deadline)))
+            return items, list(islice(items, chunk_size))
+
+        def next_chunk() -> list[T]:
+            return list(islice(items, chunk_size))
+
+        try:
+            items, chunk = self._call(first_chunk, self._retry_policy, deadline)
+            while chunk:
+                yield chunk
+                chunk = self._call(next_chunk, None, deadline)
+        except (SourceTimeoutError, TimeoutError) as exc:
+            raise SourceTimeoutError(f"{self._label} source fetch timed out") from exc
+        except Exception as exc:
+            raise RuntimeError(f"{self._label} source fetch failed") from exc
+
+    def _call(
+        self,
+        operation: Callable[[], T],
+        retry_policy: Optional[RetryPolicy],
+        deadline: Optional[float] = None,
+    ) -> T:
+        return call_resilient(
+            operation, self._circuit_breaker, retry_policy, on_transition=self._on_transition, deadline=deadline)
+
+
+def _time_left(deadline: float) -> float:
+    # Only called right after call_resilient checked the deadline, so this is at most a hair below zero.
+    return max(deadline - time.monotonic(), 0.0)
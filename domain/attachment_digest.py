@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import hashlib
+
+from common.ingestion_types import AttachmentContent
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class AttachmentDigest:
+    @staticmethod
+    def compute(content: AttachmentContent, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+        digest = hashlib.sha256()
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            with memoryview(content) as raw, raw.cast("B") as view:
+                for start in range(0, view.nbytes, chunk_size):
+                    digest.update(view[start:start + chunk_size])
+            return digest.hexdigest()
+
+        position = content.tell()
+        buffer = bytearray(chunk_size)
+        with memoryview(buffer) as view:
+            try:
+                while read := content.readinto(view):
+                    digest.update(view[:read])
+            finally:
+                content.seek(position)
+        return digest.hexdigest()
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import calendar
+from datetime import datetime
+
+
+class HistoryRetentionPolicy:
+    RETENTION_MONTHS = 24
+
+    @staticmethod
+    def required_since(now: datetime, retention_months: int = RETENTION_MONTHS) -> datetime:
+        year, month = divmod(now.year * 12 + now.month - 1 - retention_months, 12)
+        day = min(now.day, calendar.monthrange(year, month + 1)[1])
+        return now.replace(year=year, month=month + 1, day=day)
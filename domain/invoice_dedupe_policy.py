@@ -1,8 +1,50 @@
 from __future__ import annotations
 
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Container, Optional, Sequence
 
-from common.ingestion_types import InvoiceMetadata
+from common.ingestion_types import (
+    DUPLICATE_SEEN,
+    NEAR_DUPLICATE_SEEN,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    InvoiceMetadata,
+    SourceInvoicePayload,
+)
+
+
+@dataclass
+class IngestionBatchPlan:
+    new_invoices: dict[str, IngestedInvoice] = field(default_factory=dict)
+    # The same sightings as duplicate events, applied instead if another writer created the key first.
+    new_invoice_duplicate_events: dict[str, list[IngestionHistoryAppend]] = field(default_factory=dict)
+    history_appends: list[IngestionHistoryAppend] = field(default_factory=list)
+    outcomes: list[tuple[str, bool]] = field(default_factory=list)
+
+    @property
+    def candidates(self) -> list[IngestionCandidate]:
+        return [
+            IngestionCandidate(invoice=invoice, duplicate_events=self.new_invoice_duplicate_events[dedupe_key])
+            for dedupe_key, invoice in self.new_invoices.items()
+        ]
+
+    def resolve(
+        self,
+        appended: Sequence[IngestedInvoice],
+        saved: Sequence[tuple[IngestedInvoice, bool]],
+    ) -> list[tuple[IngestedInvoice, bool]]:
+        resolved = {invoice.dedupe_key: invoice for invoice in appended}
+        created: dict[str, bool] = {}
+        for invoice, is_new in saved:
+            resolved[invoice.dedupe_key] = invoice
+            created[invoice.dedupe_key] = is_new
+        return [
+            (resolved[dedupe_key], is_new and created[dedupe_key])
+            for dedupe_key, is_new in self.outcomes
+        ]
 
 
 class InvoiceDedupePolicy:
@@ -24,3 +66,45 @@ class InvoiceDedupePolicy:
             return f"hash:{file_hash.strip().lower()}"
 
         return metadata_key
+
+    @staticmethod
+    def build_content_fingerprint(dedupe_key: str, file_hash: Optional[str]) -> str:
+        # The dedupe key can fall back to metadata alone, so the file hash is added to catch a changed attachment.
+        return f"{dedupe_key}#{file_hash or ''}"
+
+    @staticmethod
+    def plan_batch(
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        dedupe_keys: Sequence[str],
+        existing_keys: Container[str],
+        processed_at: datetime,
+        near_duplicate_positions: Container[int] = frozenset(),
+    ) -> IngestionBatchPlan:
+        # Positions in near_duplicate_positions already carry the dedupe key of the invoice they resemble.
+        plan = IngestionBatchPlan()
+        for position, (payload, dedupe_key) in enumerate(zip(payloads, dedupe_keys)):
+            kind = NEAR_DUPLICATE_SEEN if position in near_duplicate_positions else DUPLICATE_SEEN
+            duplicate_event = IngestionHistoryAppend(
+                dedupe_key=dedupe_key,
+                source=source,
+                processed_at=processed_at,
+                status=f"{kind}:{payload.source_id}",
+            )
+            if dedupe_key in existing_keys:
+                plan.history_appends.append(duplicate_event)
+                plan.outcomes.append((dedupe_key, False))
+            elif dedupe_key in plan.new_invoices:
+                plan.new_invoices[dedupe_key].record_event(
+                    source=source, ingested_at=processed_at, status=duplicate_event.status)
+                plan.new_invoice_duplicate_events[dedupe_key].append(duplicate_event)
+                plan.outcomes.append((dedupe_key, False))
+            else:
+                invoice = IngestedInvoice(
+                    dedupe_key=dedupe_key, metadata=payload.metadata, file_hash=payload.file_hash)
+                invoice.record_event(
+                    source=source, ingested_at=processed_at, status=f"ingested:{payload.source_id}")
+                plan.new_invoices[dedupe_key] = invoice
+                plan.new_invoice_duplicate_events[dedupe_key] = [duplicate_event]
+                plan.outcomes.append((dedupe_key, True))
+        return plan
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+
+from common.ingestion_types import InvoiceMetadata
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_LEGAL_SUFFIXES = frozenset({
+    "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated", "limited", "llc", "llp", "ltd", "plc", "sa",
+})
+_MAX_DATE_DRIFT_DAYS = 1
+
+
+class NearDuplicatePolicy:
+    @staticmethod
+    def blocking_key(metadata: InvoiceMetadata) -> str:
+        return f"{NearDuplicatePolicy.supplier_token(metadata.supplier)}|{round(metadata.amount * 100)}"
+
+    @staticmethod
+    def supplier_token(supplier: str) -> str:
+        tokens = _TOKEN.findall(supplier.lower())
+        significant = [token for token in tokens if token not in _LEGAL_SUFFIXES]
+        return "".join(significant or tokens)
+
+    @staticmethod
+    def normalize_invoice_number(invoice_number: str) -> str:
+        return "".join(_TOKEN.findall(invoice_number.lower()))
+
+    @staticmethod
+    def matches(left: InvoiceMetadata, right: InvoiceMetadata) -> bool:
+        number = NearDuplicatePolicy.normalize_invoice_number(left.invoice_number)
+        return (
+            bool(number)
+            and number == NearDuplicatePolicy.normalize_invoice_number(right.invoice_number)
+            and NearDuplicatePolicy.supplier_token(left.supplier) == NearDuplicatePolicy.supplier_token(right.supplier)
+            and round(left.amount * 100) == round(right.amount * 100)
+            and abs((left.invoice_date.date() - right.invoice_date.date()).days) <= _MAX_DATE_DRIFT_DAYS
+        )
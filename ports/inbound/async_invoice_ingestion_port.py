@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Mapping, Optional, Sequence
+
+from common.ingestion_types import (
+    IngestedInvoice,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+    SourceInvoicePayload,
+)
+
+
+class AsyncInvoiceIngestionPort(ABC):
+    @abstractmethod
+    async def ingest_ap_email_invoice(
+        self,
+        source_id: str,
+        metadata: InvoiceMetadata,
+        file_hash: Optional[str],
+        processed_at: datetime,
+    ) -> IngestedInvoice:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ingest_accounting_invoice(
+        self,
+        source_id: str,
+        metadata: InvoiceMetadata,
+        file_hash: Optional[str],
+        processed_at: datetime,
+    ) -> IngestedInvoice:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ingest_many(
+        self,
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        processed_at: datetime,
+    ) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_for_analyst(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_ap_email_inbox(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_accounting_sync(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_all_sources(self, processed_at: datetime) -> Mapping[IngestionSource, Sequence[IngestedInvoice]]:
+        raise NotImplementedError
@@ -2,9 +2,19 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import Iterator, Mapping, Optional, Sequence
 
-from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata
+from common.ingestion_types import (
+    HistoryRetentionReport,
+    IngestedInvoice,
+    IngestionRunSummary,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+    SourceInvoicePayload,
+    SourceSyncReport,
+    StoredAttachment,
+)
 
 
 class InvoiceIngestionPort(ABC):
@@ -28,14 +38,43 @@ class InvoiceIngestionPort(ABC):
     ) -> IngestedInvoice:
         raise NotImplementedError
 
+    @abstractmethod
+    def ingest_many(
+        self,
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        processed_at: datetime,
+    ) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
     @abstractmethod
     def list_for_analyst(
         self,
         source: Optional[IngestionSource],
         newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
     ) -> Sequence[IngestedInvoice]:
         raise NotImplementedError
 
+    @abstractmethod
+    def export_intake(
+        self,
+        source: Optional[IngestionSource] = None,
+        ingested_from: Optional[datetime] = None,
+        ingested_to: Optional[datetime] = None,
+        page_size: int = 500,
+    ) -> Iterator[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_intake_version(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_invoice_attachment(self, dedupe_key: str) -> Optional[StoredAttachment]:
+        raise NotImplementedError
+
     @abstractmethod
     def process_ap_email_inbox(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
         raise NotImplementedError
@@ -43,3 +82,49 @@ class InvoiceIngestionPort(ABC):
     @abstractmethod
     def process_accounting_sync(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
         raise NotImplementedError
+
+    @abstractmethod
+    def process_all_sources(
+        self,
+        processed_at: datetime,
+        timeouts: Optional[Mapping[IngestionSource, float]] = None,
+        default_timeout: float = 60.0,
+        max_workers: Optional[int] = None,
+    ) -> Sequence[SourceSyncReport]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_ap_email_inbox(
+        self,
+        processed_at: datetime,
+        chunk_size: int = 500,
+        time_budget: Optional[float] = None,
+    ) -> IngestionRunSummary:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_accounting_sync(
+        self,
+        processed_at: datetime,
+        chunk_size: int = 500,
+        time_budget: Optional[float] = None,
+    ) -> IngestionRunSummary:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sync_accounting_changes(
+        self,
+        processed_at: datetime,
+        full_resync: bool = False,
+        page_size: int = 500,
+        time_budget: Optional[float] = None,
+    ) -> IngestionRunSummary:
+        raise NotImplementedError
+
+    @abstractmethod
+    def enforce_history_retention(self, now: datetime, retention_months: int = 24) -> HistoryRetentionReport:
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_ingestion_failure(self, source: IngestionSource, error_type: str, occurred_at: datetime) -> None:
+        raise NotImplementedError
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Sequence
+from typing import Iterator, Optional, Sequence
 
-from common.ingestion_types import SourceInvoicePayload
+from common.ingestion_types import SourceChangeBatch, SourceInvoicePayload
 
 
 class AccountingSourcePort(ABC):
     @abstractmethod
-    def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> Sequence[SourceInvoicePayload]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
         raise NotImplementedError
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from common.ingestion_types import SourceInvoicePayload
+
+
+class AsyncAccountingSourcePort(ABC):
+    @abstractmethod
+    async def fetch_new_invoices(self) -> Sequence[SourceInvoicePayload]:
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from common.ingestion_types import AttachmentContent, StoredAttachment
+
+
+class AttachmentStorePort(ABC):
+    @abstractmethod
+    def put(self, file_hash: str, content: AttachmentContent) -> StoredAttachment:
+        raise NotImplementedError
+
+    @abstractmethod
+    def locate(self, file_hash: str) -> Optional[StoredAttachment]:
+        raise NotImplementedError
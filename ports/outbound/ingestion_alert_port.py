@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Mapping, Optional, Sequence
 
 from common.ingestion_types import IngestionSource
+from common.source_resilience import CircuitState
+
+FAILURE_WINDOWS: Mapping[str, timedelta] = {
+    "5m": timedelta(minutes=5),
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+}
 
 
 class IngestionFailureEvent:
@@ -14,11 +22,62 @@ class IngestionFailureEvent:
         self.occurred_at = occurred_at
 
 
+@dataclass(frozen=True)
+class IngestionFailureSummary:
+    source: IngestionSource
+    error_type: str
+    last_occurred_at: datetime
+    window_counts: Mapping[str, int]
+
+
+@dataclass(frozen=True)
+class CircuitStateEvent:
+    source: IngestionSource
+    previous: CircuitState
+    current: CircuitState
+    occurred_at: datetime
+
+
 class IngestionAlertPort(ABC):
     @abstractmethod
     def notify_failure(self, source: IngestionSource, error_type: str, occurred_at: datetime) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def list_failures(self) -> Sequence[IngestionFailureEvent]:
+    def notify_circuit_state(
+        self,
+        source: IngestionSource,
+        previous: CircuitState,
+        current: CircuitState,
+        occurred_at: datetime,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_circuit_states(self) -> Sequence[CircuitStateEvent]:
         raise NotImplementedError
+
+    @abstractmethod
+    def list_failures(
+        self,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[IngestionFailureEvent]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def summarize_failures(self, now: datetime) -> Sequence[IngestionFailureSummary]:
+        raise NotImplementedError
+
+
+def report_circuit_transition(
+    alert_port: IngestionAlertPort,
+    source: IngestionSource,
+    previous: CircuitState,
+    current: CircuitState,
+    occurred_at: datetime,
+) -> None:
+    # Every state change is reported; the trip into open is also a failure so it counts in the failure windows.
+    alert_port.notify_circuit_state(source=source, previous=previous, current=current, occurred_at=occurred_at)
+    if current is CircuitState.OPEN:
+        alert_port.notify_failure(source=source, error_type="circuit_open", occurred_at=occurred_at)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from common.ingestion_types import IngestionHistoryAppend
+
+
+class IngestionAuditLogPort(ABC):
+    @abstractmethod
+    def record_events(self, events: Sequence[IngestionHistoryAppend]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_events(self, dedupe_key: str) -> Sequence[IngestionHistoryAppend]:
+        raise NotImplementedError
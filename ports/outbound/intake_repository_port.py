@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import Iterator, Mapping, Optional, Sequence
 
-from common.ingestion_types import IngestedInvoice, IngestionSource
+from common.ingestion_types import (
+    HistoryPurgeResult,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    IntakeCursor,
+)
 
 
 class IntakeRepositoryPort(ABC):
@@ -12,14 +19,55 @@ class IntakeRepositoryPort(ABC):
     def find_by_dedupe_key(self, dedupe_key: str) -> Optional[IngestedInvoice]:
         raise NotImplementedError
 
+    @abstractmethod
+    def find_many_by_dedupe_keys(self, dedupe_keys: Sequence[str]) -> Mapping[str, IngestedInvoice]:
+        raise NotImplementedError
+
     @abstractmethod
     def save_new(self, invoice: IngestedInvoice) -> IngestedInvoice:
         raise NotImplementedError
 
+    @abstractmethod
+    def save_many(self, invoices: Sequence[IngestedInvoice]) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
     @abstractmethod
     def append_history(self, dedupe_key: str, source: IngestionSource, processed_at: datetime, status: str) -> IngestedInvoice:
         raise NotImplementedError
 
     @abstractmethod
-    def list_by_source_sorted(self, source: Optional[IngestionSource], newest_first: bool = True) -> Sequence[IngestedInvoice]:
+    def append_history_many(self, events: Sequence[IngestionHistoryAppend]) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_new_or_append_history(self, candidate: IngestionCandidate) -> tuple[IngestedInvoice, bool]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_new_or_append_history_many(
+        self,
+        candidates: Sequence[IngestionCandidate],
+    ) -> Sequence[tuple[IngestedInvoice, bool]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_by_source_sorted(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge_history_before(self, cutoff: datetime) -> HistoryPurgeResult:
+        raise NotImplementedError
+
+    @abstractmethod
+    def change_version(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_dedupe_keys(self) -> Iterator[str]:
         raise NotImplementedError
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Mapping, Sequence
+
+from common.ingestion_types import NearDuplicateCandidate
+
+
+class NearDuplicateIndexPort(ABC):
+    @abstractmethod
+    def add_many(self, entries: Sequence[tuple[str, NearDuplicateCandidate]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_candidates(self, blocking_keys: Sequence[str]) -> Mapping[str, Sequence[NearDuplicateCandidate]]:
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Mapping, Sequence
+
+from common.ingestion_types import IngestionSource, ProcessedSourceRecord
+
+
+class ProcessedSourceIdIndexPort(ABC):
+    @abstractmethod
+    def find_many(self, source: IngestionSource, source_ids: Sequence[str]) -> Mapping[str, ProcessedSourceRecord]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_many(self, source: IngestionSource, entries: Sequence[tuple[str, ProcessedSourceRecord]]) -> None:
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from common.ingestion_types import IngestionSource
+
+
+class SyncWatermarkPort(ABC):
+    @abstractmethod
+    def load(self, source: IngestionSource) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, source: IngestionSource, watermark: str) -> None:
+        raise NotImplementedError
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Mapping, Optional, Sequence
+
+from common.ingestion_types import (
+    IngestedInvoice,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+    SourceInvoicePayload,
+)
+from ports.inbound.async_invoice_ingestion_port import AsyncInvoiceIngestionPort
+from ports.inbound.invoice_ingestion_port import InvoiceIngestionPort
+from ports.outbound.async_accounting_source_port import AsyncAccountingSourcePort
+from ports.outbound.async_ap_email_source_port import AsyncApEmailSourcePort
+
+
+class AsyncInvoiceIngestionService(AsyncInvoiceIngestionPort):
+    # Fetches run on the event loop; each batch is handed to the sync service in one worker-thread hop,
+    # so dedupe, the processed-id index, audit, near-duplicates and attachments follow the same path.
+    def __init__(
+        self,
+        ingestion: InvoiceIngestionPort,
+        ap_email_source: Optional[AsyncApEmailSourcePort] = None,
+        accounting_source: Optional[AsyncAccountingSourcePort] = None,
+    ) -> None:
+        self._ingestion = ingestion
+        self._ap_email_source = ap_email_source
+        self._accounting_source = accounting_source
+
+    async def ingest_ap_email_invoice(
+        self,
+        source_id: str,
+        metadata: InvoiceMetadata,
+        file_hash: Optional[str],
+        processed_at: datetime,
+    ) -> IngestedInvoice:
+        return await asyncio.to_thread(
+            self._ingestion.ingest_ap_email_invoice,
+            source_id=source_id,
+            metadata=metadata,
+            file_hash=file_hash,
+            processed_at=processed_at,
+        )
+
+    async def ingest_accounting_invoice(
+        self,
+        source_id: str,
+        metadata: InvoiceMetadata,
+        file_hash: Optional[str],
+        processed_at: datetime,
+    ) -> IngestedInvoice:
+        return await asyncio.to_thread(
+            self._ingestion.ingest_accounting_invoice,
+            source_id=source_id,
+            metadata=metadata,
+            file_hash=file_hash,
+            processed_at=processed_at,
+        )
+
+    async def ingest_many(
+        self,
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        processed_at: datetime,
+    ) -> Sequence[IngestedInvoice]:
+        if not payloads:
+            return []
+        return await asyncio.to_thread(
+            self._ingestion.ingest_many, source=source, payloads=payloads, processed_at=processed_at)
+
+    async def list_for_analyst(
+        self,
+        source: Optional[IngestionSource],
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
+    ) -> Sequence[IngestedInvoice]:
+        return await asyncio.to_thread(
+            self._ingestion.list_for_analyst, source=source, newest_first=newest_first, limit=limit, after=after)
+
+    async def process_ap_email_inbox(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
+        payloads = await self._fetch_ap_email(processed_at)
+        return await self.ingest_many(
+            source=IngestionSource.AP_EMAIL, payloads=payloads, processed_at=processed_at)
+
+    async def process_accounting_sync(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
+        payloads = await self._fetch_accounting(processed_at)
+        return await self.ingest_many(
+            source=IngestionSource.ACCOUNTING_SYSTEM, payloads=payloads, processed_at=processed_at)
+
+    async def process_all_sources(self, processed_at: datetime) -> Mapping[IngestionSource, Sequence[IngestedInvoice]]:
+        # Fetches overlap; ingestion stays sequential so cross-source duplicates resolve to one record.
+        ap_email_payloads, accounting_payloads = await asyncio.gather(
+            self._fetch_ap_email(processed_at),
+            self._fetch_accounting(processed_at),
+        )
+        return {
+            IngestionSource.AP_EMAIL: await self.ingest_many(
+                source=IngestionSource.AP_EMAIL, payloads=ap_email_payloads, processed_at=processed_at),
+            IngestionSource.ACCOUNTING_SYSTEM: await self.ingest_many(
+                source=IngestionSource.ACCOUNTING_SYSTEM, payloads=accounting_payloads, processed_at=processed_at),
+        }
+
+    async def _fetch_ap_email(self, processed_at: datetime) -> Sequence[SourceInvoicePayload]:
+        if self._ap_email_source is None:
+            raise RuntimeError("AP email source port is not configured")
+        try:
+            return await self._ap_email_source.fetch_new_invoices()
+        except RuntimeError:
+            self._ingestion.record_ingestion_failure(
+                source=IngestionSource.AP_EMAIL,
+                error_type="fetch_failed",
+                occurred_at=processed_at,
+            )
+            return []
+
+    async def _fetch_accounting(self, processed_at: datetime) -> Sequence[SourceInvoicePayload]:
+        if self._accounting_source is None:
+            raise RuntimeError("Accounting source port is not configured")
+        try:
+            return await self._accounting_source.fetch_new_invoices()
+        except RuntimeError:
+            self._ingestion.record_ingestion_failure(
+                source=IngestionSource.ACCOUNTING_SYSTEM,
+                error_type="fetch_failed",
+                occurred_at=processed_at,
+            )
+            return []
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Mapping, Optional, Sequence
+
+from common.ingestion_types import IngestionRunSummary, IngestionSource, ScheduledRunRecord
+from ports.inbound.invoice_ingestion_port import InvoiceIngestionPort
+
+
+class IngestionSchedulerService:
+    def __init__(
+        self,
+        ingestion: InvoiceIngestionPort,
+        intervals: Mapping[IngestionSource, timedelta],
+        run_budget: timedelta = timedelta(minutes=10),
+        chunk_size: int = 500,
+        max_workers: Optional[int] = None,
+        clock: Callable[[], datetime] = datetime.now,
+        run_history_size: int = 1000,
+    ) -> None:
+        self._ingestion = ingestion
+        self._intervals = dict(intervals)
+        self._run_budget = run_budget
+        self._chunk_size = chunk_size
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(len(self._intervals), 1),
+            thread_name_prefix="ingestion-scheduler",
+        )
+        self._lock = threading.Lock()
+        self._next_due: dict[IngestionSource, Optional[datetime]] = {
+            source: None for source in self._intervals}
+        self._in_flight: dict[IngestionSource, Future[None]] = {}
+        self._run_records: deque[ScheduledRunRecord] = deque(maxlen=run_history_size)
+        self._skipped_ticks: Counter[IngestionSource] = Counter()
+        self._stop_event = threading.Event()
+        self._loop_thread: Optional[threading.Thread] = None
+
+    def tick(self) -> Sequence[IngestionSource]:
+        now = self._clock()
+        launched: list[IngestionSource] = []
+        with self._lock:
+            for source, interval in self._intervals.items():
+                next_due = self._next_due[source]
+                if next_due is not None and now < next_due:
+                    continue
+                self._next_due[source] = now + interval
+                running = self._in_flight.get(source)
+                if running is not None and not running.done():
+                    self._skipped_ticks[source] += 1
+                    continue
+                self._in_flight[source] = self._executor.submit(self._run, source, now)
+                launched.append(source)
+        return launched
+
+    def start(self, poll_interval: float = 1.0) -> None:
+        if self._loop_thread is not None:
+            raise RuntimeError("Ingestion scheduler is already running")
+        self._stop_event.clear()
+        self._loop_thread = threading.Thread(
+            target=self._loop, args=(poll_interval,), name="ingestion-scheduler-loop", daemon=True)
+        self._loop_thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop_event.set()
+        if self._loop_thread is not None:
+            self._loop_thread.join()
+            self._loop_thread = None
+        self._executor.shutdown(wait=wait)
+
+    def wait_for_idle(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            running = list(self._in_flight.values())
+        for future in running:
+            future.exception(timeout=timeout)
+
+    def list_run_records(self) -> Sequence[ScheduledRunRecord]:
+        with self._lock:
+            return list(self._run_records)
+
+    def skipped_ticks(self, source: IngestionSource) -> int:
+        with self._lock:
+            return self._skipped_ticks[source]
+
+    def _loop(self, poll_interval: float) -> None:
+        while not self._stop_event.is_set():
+            self.tick()
+            self._stop_event.wait(poll_interval)
+
+    def _run(self, source: IngestionSource, processed_at: datetime) -> None:
+        started = time.perf_counter()
+        summary: Optional[IngestionRunSummary] = None
+        try:
+            summary = self._runner(source)(
+                processed_at=processed_at,
+                chunk_size=self._chunk_size,
+                time_budget=self._run_budget.total_seconds(),
+            )
+        except Exception:
+            # Nothing waits on the run's future, so the failure has to be raised as an alert here.
+            self._ingestion.record_ingestion_failure(
+                source=source, error_type="scheduled_run_failed", occurred_at=processed_at)
+            raise
+        finally:
+            record = ScheduledRunRecord(
+                source=source,
+                started_at=processed_at,
+                duration_seconds=time.perf_counter() - started,
+                summary=summary,
+            )
+            with self._lock:
+                self._run_records.append(record)
+
+    def _runner(self, source: IngestionSource) -> Callable[..., IngestionRunSummary]:
+        if source == IngestionSource.AP_EMAIL:
+            return self._ingestion.stream_ap_email_inbox
+        return self._ingestion.stream_accounting_sync
@@ -1,15 +1,56 @@
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Optional, Sequence
+from functools import partial
+from itertools import islice
+from typing import Container, Iterator, Mapping, Optional, Sequence
 
-from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata
+from common.ingestion_types import (
+    DUPLICATE_SEEN,
+    NEAR_DUPLICATE_SEEN,
+    HistoryRetentionReport,
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionRunSummary,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+    NearDuplicateCandidate,
+    ProcessedSourceRecord,
+    SourceInvoicePayload,
+    SourceSyncReport,
+    StoredAttachment,
+)
+from common.source_resilience import SourceTimeoutError
+from domain.attachment_digest import DEFAULT_CHUNK_SIZE, AttachmentDigest
+from domain.history_retention_policy import HistoryRetentionPolicy
 from domain.invoice_dedupe_policy import InvoiceDedupePolicy
+from domain.near_duplicate_policy import NearDuplicatePolicy
 from ports.inbound.invoice_ingestion_port import InvoiceIngestionPort
 from ports.outbound.accounting_source_port import AccountingSourcePort
 from ports.outbound.ap_email_source_port import ApEmailSourcePort
-from ports.outbound.ingestion_alert_port import IngestionAlertPort, IngestionFailureEvent
+from ports.outbound.attachment_store_port import AttachmentStorePort
+from ports.outbound.ingestion_alert_port import IngestionAlertPort, IngestionFailureEvent, IngestionFailureSummary
+from ports.outbound.ingestion_audit_log_port import IngestionAuditLogPort
 from ports.outbound.intake_repository_port import IntakeRepositoryPort
+from ports.outbound.near_duplicate_index_port import NearDuplicateIndexPort
+from ports.outbound.processed_source_id_index_port import ProcessedSourceIdIndexPort
+from ports.outbound.sync_watermark_port import SyncWatermarkPort
+
+
+@dataclass(frozen=True)
+class _SourceFetch:
+    # What one fetch thread hands back for ingestion; `watermark` is set for change-feed fetches and is
+    # only saved once the payloads are ingested.
+    payloads: Sequence[SourceInvoicePayload]
+    fetch_seconds: float = 0.0
+    watermark: Optional[str] = None
+    watermark_stalled: bool = False
 
 
 class InvoiceIngestionService(InvoiceIngestionPort):
@@ -20,12 +61,34 @@ class InvoiceIngestionService(InvoiceIngestionPort):
         ap_email_source: Optional[ApEmailSourcePort] = None,
         accounting_source: Optional[AccountingSourcePort] = None,
         dedupe_policy: type[InvoiceDedupePolicy] = InvoiceDedupePolicy,
+        audit_log: Optional[IngestionAuditLogPort] = None,
+        near_duplicate_index: Optional[NearDuplicateIndexPort] = None,
+        near_duplicate_policy: type[NearDuplicatePolicy] = NearDuplicatePolicy,
+        attachment_hash_workers: Optional[int] = None,
+        attachment_chunk_size: int = DEFAULT_CHUNK_SIZE,
+        attachment_store: Optional[AttachmentStorePort] = None,
+        sync_watermarks: Optional[SyncWatermarkPort] = None,
+        processed_source_ids: Optional[ProcessedSourceIdIndexPort] = None,
     ) -> None:
         self._intake_repository = intake_repository
+        self._audit_log = audit_log
+        self._near_duplicate_index = near_duplicate_index
+        self._near_duplicate_policy = near_duplicate_policy
+        self._attachment_hash_workers = attachment_hash_workers
+        self._attachment_chunk_size = attachment_chunk_size
+        self._attachment_store = attachment_store
         self._alert_port = alert_port
         self._ap_email_source = ap_email_source
         self._accounting_source = accounting_source
         self._dedupe_policy = dedupe_policy
+        self._sync_watermarks = sync_watermarks
+        self._processed_source_ids = processed_source_ids
+        self._source_fetch_lock = threading.Lock()
+        self._source_fetches: dict[IngestionSource, Future[_SourceFetch]] = {}
+        # Kept fetches whose deadline has already been alerted, so a kept fetch is reported once.
+        self._timed_out_fetches: set[Future[_SourceFetch]] = set()
+        if near_duplicate_index is not None:
+            self._seed_near_duplicate_index()
 
     def ingest_ap_email_invoice(
         self,
@@ -57,12 +120,57 @@ class InvoiceIngestionService(InvoiceIngestionPort):
             processed_at=processed_at,
         )
 
+    def ingest_many(
+        self,
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        processed_at: datetime,
+    ) -> Sequence[IngestedInvoice]:
+        return [
+            invoice
+            for invoice, _ in self._ingest_batch(
+                source=source, payloads=payloads, processed_at=processed_at)
+        ]
+
     def list_for_analyst(
         self,
         source: Optional[IngestionSource],
         newest_first: bool = True,
+        limit: Optional[int] = None,
+        after: Optional[IntakeCursor] = None,
     ) -> Sequence[IngestedInvoice]:
-        return self._intake_repository.list_by_source_sorted(source=source, newest_first=newest_first)
+        return self._intake_repository.list_by_source_sorted(
+            source=source, newest_first=newest_first, limit=limit, after=after)
+
+    def export_intake(
+        self,
+        source: Optional[IngestionSource] = None,
+        ingested_from: Optional[datetime] = None,
+        ingested_to: Optional[datetime] = None,
+        page_size: int = 500,
+    ) -> Iterator[IngestedInvoice]:
+        # Walks keyset pages oldest first by latest ingestion, so only one page is held at a time.
+        # The range applies to latest_ingested_at and is half-open: [ingested_from, ingested_to).
+        after = IntakeCursor(ingested_at=ingested_from, dedupe_key="") if ingested_from is not None else None
+        while True:
+            page = self._intake_repository.list_by_source_sorted(
+                source=source, newest_first=False, limit=page_size, after=after)
+            for invoice in page:
+                if ingested_to is not None and invoice.latest_ingested_at >= ingested_to:
+                    return
+                yield invoice
+            if len(page) < page_size:
+                return
+            after = IntakeCursor(ingested_at=page[-1].latest_ingested_at, dedupe_key=page[-1].dedupe_key)
+
+    def get_intake_version(self) -> int:
+        return self._intake_repository.change_version()
+
+    def get_invoice_attachment(self, dedupe_key: str) -> Optional[StoredAttachment]:
+        invoice = self._intake_repository.find_by_dedupe_key(dedupe_key)
+        if self._attachment_store is None or invoice is None or invoice.file_hash is None:
+            return None
+        return self._attachment_store.locate(invoice.file_hash)
 
     def process_ap_email_inbox(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
         source = self._require_ap_email_source()
@@ -76,17 +184,8 @@ class InvoiceIngestionService(InvoiceIngestionPort):
             )
             return []
 
-        ingested: list[IngestedInvoice] = []
-        for payload in payloads:
-            ingested.append(
-                self.ingest_ap_email_invoice(
-                    source_id=payload.source_id,
-                    metadata=payload.metadata,
-                    file_hash=payload.file_hash,
-                    processed_at=processed_at,
-                )
-            )
-        return ingested
+        return self.ingest_many(
+            source=IngestionSource.AP_EMAIL, payloads=payloads, processed_at=processed_at)
 
     def process_accounting_sync(self, processed_at: datetime) -> Sequence[IngestedInvoice]:
         source = self._require_accounting_source()
@@ -100,24 +199,188 @@ class InvoiceIngestionService(InvoiceIngestionPort):
             )
             return []
 
-        ingested: list[IngestedInvoice] = []
-        for payload in payloads:
-            ingested.append(
-                self.ingest_accounting_invoice(
-                    source_id=payload.source_id,
-                    metadata=payload.metadata,
-                    file_hash=payload.file_hash,
-                    processed_at=processed_at,
-                )
-            )
-        return ingested
+        return self.ingest_many(
+            source=IngestionSource.ACCOUNTING_SYSTEM, payloads=payloads, processed_at=processed_at)
+
+    def process_all_sources(
+        self,
+        processed_at: datetime,
+        timeouts: Optional[Mapping[IngestionSource, float]] = None,
+        default_timeout: float = 60.0,
+        max_workers: Optional[int] = None,
+    ) -> Sequence[SourceSyncReport]:
+        # Fetches run concurrently, each passed its own deadline; ingestion stays on this thread in
+        # completion order, so writes never interleave and cross-source dedupe sees every earlier batch.
+        # A fetch still running at its deadline is reported as timed out but kept: the next run waits on
+        # it instead of starting another, and ingests its result, so a source never has two fetches
+        # in flight and a late result is never dropped.
+        source_ports: dict[IngestionSource, ApEmailSourcePort | AccountingSourcePort] = {}
+        if self._ap_email_source is not None:
+            source_ports[IngestionSource.AP_EMAIL] = self._ap_email_source
+        if self._accounting_source is not None:
+            source_ports[IngestionSource.ACCOUNTING_SYSTEM] = self._accounting_source
+        if not source_ports:
+            return []
+
+        def timed_fetch(source: IngestionSource, timeout: float) -> _SourceFetch:
+            fetch_started = time.perf_counter()
+            if source == IngestionSource.ACCOUNTING_SYSTEM and self._sync_watermarks is not None:
+                fetched = self._fetch_accounting_changes(deadline=fetch_started + timeout)
+            else:
+                fetched = _SourceFetch(payloads=source_ports[source].fetch_new_invoices(timeout=timeout))
+            return replace(fetched, fetch_seconds=time.perf_counter() - fetch_started)
+
+        timeouts = timeouts or {}
+        reports: dict[IngestionSource, SourceSyncReport] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(source_ports), thread_name_prefix="source-fetch")
+        try:
+            started = time.perf_counter()
+            pending: dict[Future[_SourceFetch], IngestionSource] = {}
+            with self._source_fetch_lock:
+                for source in source_ports:
+                    fetch = self._source_fetches.get(source)
+                    if fetch is None:
+                        fetch = self._source_fetches[source] = executor.submit(
+                            timed_fetch, source, timeouts.get(source, default_timeout))
+                    pending[fetch] = source
+            deadlines = {source: started + timeouts.get(source, default_timeout) for source in source_ports}
+            while pending:
+                now = time.perf_counter()
+                for future, source in list(pending.items()):
+                    if not future.done() and deadlines[source] <= now:
+                        del pending[future]
+                        with self._source_fetch_lock:
+                            first_timeout = future not in self._timed_out_fetches
+                            self._timed_out_fetches.add(future)
+                        if first_timeout:
+                            self.record_ingestion_failure(
+                                source=source, error_type="fetch_timeout", occurred_at=processed_at)
+                        reports[source] = SourceSyncReport(source=source, fetch_seconds=now - started, timed_out=True)
+                if not pending:
+                    break
+                done, _ = wait(
+                    pending, timeout=max(min(deadlines[source] for source in pending.values()) - now, 0.0),
+                    return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = pending.pop(future)
+                    with self._source_fetch_lock:
+                        # A concurrent run may have claimed the same fetch first; only one ingests it.
+                        claimed = self._source_fetches.get(source) is future
+                        if claimed:
+                            del self._source_fetches[source]
+                        timeout_reported = future in self._timed_out_fetches
+                        self._timed_out_fetches.discard(future)
+                    reports[source] = (
+                        self._ingest_fetched(source, future, processed_at, timeout_reported) if claimed
+                        else SourceSyncReport(source=source))
+        finally:
+            # Queued and running fetches stay registered, so they are not cancelled.
+            executor.shutdown(wait=False)
+        return [reports[source] for source in source_ports]
+
+    def stream_ap_email_inbox(
+        self,
+        processed_at: datetime,
+        chunk_size: int = 500,
+        time_budget: Optional[float] = None,
+    ) -> IngestionRunSummary:
+        return self._stream_source(
+            source=IngestionSource.AP_EMAIL,
+            source_port=self._require_ap_email_source(),
+            processed_at=processed_at,
+            chunk_size=chunk_size,
+            time_budget=time_budget,
+        )
+
+    def stream_accounting_sync(
+        self,
+        processed_at: datetime,
+        chunk_size: int = 500,
+        time_budget: Optional[float] = None,
+    ) -> IngestionRunSummary:
+        # With a watermark store the scheduled accounting run pulls only the changes since the last one.
+        if self._sync_watermarks is not None:
+            return self.sync_accounting_changes(
+                processed_at=processed_at, page_size=chunk_size, time_budget=time_budget)
+        return self._stream_source(
+            source=IngestionSource.ACCOUNTING_SYSTEM,
+            source_port=self._require_accounting_source(),
+            processed_at=processed_at,
+            chunk_size=chunk_size,
+            time_budget=time_budget,
+        )
+
+    def sync_accounting_changes(
+        self,
+        processed_at: datetime,
+        full_resync: bool = False,
+        page_size: int = 500,
+        time_budget: Optional[float] = None,
+    ) -> IngestionRunSummary:
+        # Asks the source only for changes past the stored watermark, and moves the watermark after
+        # each page is persisted: a crash re-delivers at most one page, which dedupe absorbs.
+        source = IngestionSource.ACCOUNTING_SYSTEM
+        source_port = self._require_accounting_source()
+        watermarks = self._require_sync_watermarks()
+        summary = IngestionRunSummary(source=source)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        watermark = None if full_resync else watermarks.load(source)
+        while True:
+            started = time.perf_counter()
+            try:
+                batch = source_port.fetch_changes_since(watermark, page_size)
+            except RuntimeError:
+                self.record_ingestion_failure(source=source, error_type="fetch_failed", occurred_at=processed_at)
+                summary.failed = True
+                return summary
+            # A full resync re-reads everything the source has, so nothing is answered from the index.
+            results = self._ingest_batch(
+                source=source, payloads=batch.payloads, processed_at=processed_at, replay_processed=not full_resync)
+            for _, is_new in results:
+                if is_new:
+                    summary.new_count += 1
+                else:
+                    summary.duplicate_count += 1
+            summary.chunk_seconds.append(time.perf_counter() - started)
+            if not batch.has_more or not batch.payloads:
+                if batch.watermark is not None and batch.watermark != watermark:
+                    watermarks.save(source, batch.watermark)
+                return summary
+            if batch.watermark is None or batch.watermark == watermark:
+                # Asking again with the same watermark would return the same page forever.
+                self.record_ingestion_failure(source=source, error_type="watermark_stalled", occurred_at=processed_at)
+                summary.failed = True
+                return summary
+            watermark = batch.watermark
+            watermarks.save(source, watermark)
+            if deadline is not None and time.perf_counter() > deadline:
+                # The watermark is already saved, so the next run picks up from this page.
+                self.record_ingestion_failure(
+                    source=source, error_type="run_budget_exceeded", occurred_at=processed_at)
+                summary.budget_exceeded = True
+                return summary
+
+    def enforce_history_retention(self, now: datetime, retention_months: int = 24) -> HistoryRetentionReport:
+        required_since = HistoryRetentionPolicy.required_since(now=now, retention_months=retention_months)
+        return HistoryRetentionReport(
+            required_since=required_since,
+            purge=self._intake_repository.purge_history_before(required_since),
+        )
 
     def record_ingestion_failure(self, source: IngestionSource, error_type: str, occurred_at: datetime) -> None:
         self._alert_port.notify_failure(
             source=source, error_type=error_type, occurred_at=occurred_at)
 
-    def list_ingestion_failures(self) -> Sequence[IngestionFailureEvent]:
-        return self._alert_port.list_failures()
+    def list_ingestion_failures(
+        self,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Sequence[IngestionFailureEvent]:
+        return self._alert_port.list_failures(since=since, limit=limit)
+
+    def summarize_ingestion_failures(self, now: datetime) -> Sequence[IngestionFailureSummary]:
+        return self._alert_port.summarize_failures(now)
 
     def _require_ap_email_source(self) -> ApEmailSourcePort:
         if self._ap_email_source is None:
@@ -129,6 +392,104 @@ class InvoiceIngestionService(InvoiceIngestionPort):
             raise RuntimeError("Accounting source port is not configured")
         return self._accounting_source
 
+    def _require_sync_watermarks(self) -> SyncWatermarkPort:
+        if self._sync_watermarks is None:
+            raise RuntimeError("Sync watermark port is not configured")
+        return self._sync_watermarks
+
+    def _fetch_accounting_changes(self, deadline: float, page_size: int = 500) -> _SourceFetch:
+        # Runs on a fetch thread: pages through the change feed from the stored watermark until it is
+        # drained, stalls or the deadline passes; the rest is picked up by the next run.
+        source_port = self._require_accounting_source()
+        watermark = self._require_sync_watermarks().load(IngestionSource.ACCOUNTING_SYSTEM)
+        payloads: list[SourceInvoicePayload] = []
+        while True:
+            batch = source_port.fetch_changes_since(watermark, page_size)
+            payloads.extend(batch.payloads)
+            if not batch.has_more or not batch.payloads:
+                return _SourceFetch(
+                    payloads=payloads, watermark=batch.watermark if batch.watermark is not None else watermark)
+            if batch.watermark is None or batch.watermark == watermark:
+                return _SourceFetch(payloads=payloads, watermark=watermark, watermark_stalled=True)
+            watermark = batch.watermark
+            if time.perf_counter() >= deadline:
+                return _SourceFetch(payloads=payloads, watermark=watermark)
+
+    def _ingest_fetched(
+        self,
+        source: IngestionSource,
+        fetched: Future[_SourceFetch],
+        processed_at: datetime,
+        timeout_reported: bool = False,
+    ) -> SourceSyncReport:
+        try:
+            result = fetched.result()
+        except SourceTimeoutError:
+            if not timeout_reported:
+                self.record_ingestion_failure(source=source, error_type="fetch_timeout", occurred_at=processed_at)
+            return SourceSyncReport(source=source, timed_out=True)
+        except RuntimeError:
+            self.record_ingestion_failure(source=source, error_type="fetch_failed", occurred_at=processed_at)
+            return SourceSyncReport(source=source, failed=True)
+        started = time.perf_counter()
+        outcomes = [is_new for _, is_new in self._ingest_batch(
+            source=source, payloads=result.payloads, processed_at=processed_at)]
+        if result.watermark is not None:
+            self._require_sync_watermarks().save(source, result.watermark)
+        if result.watermark_stalled:
+            self.record_ingestion_failure(source=source, error_type="watermark_stalled", occurred_at=processed_at)
+        return SourceSyncReport(
+            source=source,
+            fetch_seconds=result.fetch_seconds,
+            ingest_seconds=time.perf_counter() - started,
+            new_count=sum(outcomes),
+            duplicate_count=len(outcomes) - sum(outcomes),
+            failed=result.watermark_stalled,
+        )
+
+    def _stream_source(
+        self,
+        source: IngestionSource,
+        source_port: ApEmailSourcePort | AccountingSourcePort,
+        processed_at: datetime,
+        chunk_size: int,
+        time_budget: Optional[float],
+    ) -> IngestionRunSummary:
+        summary = IngestionRunSummary(source=source)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        chunks: Optional[Iterator[Sequence[SourceInvoicePayload]]] = None
+        while True:
+            started = time.perf_counter()
+            try:
+                if chunks is None:
+                    chunks = iter(source_port.fetch_invoice_chunks(chunk_size, timeout=time_budget))
+                chunk = next(chunks, None)
+            except SourceTimeoutError:
+                # The source gave up within the budget, so a hung fetch can't hold the run open.
+                self.record_ingestion_failure(
+                    source=source, error_type="run_budget_exceeded", occurred_at=processed_at)
+                summary.budget_exceeded = True
+                return summary
+            except RuntimeError:
+                self.record_ingestion_failure(
+                    source=source, error_type="fetch_failed", occurred_at=processed_at)
+                summary.failed = True
+                return summary
+            if chunk is None:
+                return summary
+
+            for _, is_new in self._ingest_batch(source=source, payloads=chunk, processed_at=processed_at):
+                if is_new:
+                    summary.new_count += 1
+                else:
+                    summary.duplicate_count += 1
+            summary.chunk_seconds.append(time.perf_counter() - started)
+            if deadline is not None and time.perf_counter() > deadline:
+                self.record_ingestion_failure(
+                    source=source, error_type="run_budget_exceeded", occurred_at=processed_at)
+                summary.budget_exceeded = True
+                return summary
+
     def _ingest_one(
         self,
         source: IngestionSource,
@@ -137,19 +498,236 @@ class InvoiceIngestionService(InvoiceIngestionPort):
         file_hash: Optional[str],
         processed_at: datetime,
     ) -> IngestedInvoice:
+        if self._near_duplicate_index is not None or self._processed_source_ids is not None:
+            payload = SourceInvoicePayload(
+                source_id=source_id, metadata=metadata, file_hash=file_hash, received_at=processed_at)
+            return self._ingest_batch(source=source, payloads=[payload], processed_at=processed_at)[0][0]
         dedupe_key = self._dedupe_policy.build_dedupe_key(
             metadata=metadata, file_hash=file_hash)
-        existing = self._intake_repository.find_by_dedupe_key(dedupe_key)
-        if existing:
-            return self._intake_repository.append_history(
-                dedupe_key=dedupe_key,
-                source=source,
-                processed_at=processed_at,
-                status=f"duplicate_seen:{source_id}",
-            )
-
         invoice = IngestedInvoice(
             dedupe_key=dedupe_key, metadata=metadata, file_hash=file_hash)
         invoice.record_event(
             source=source, ingested_at=processed_at, status=f"ingested:{source_id}")
-        return self._intake_repository.save_new(invoice)
+        duplicate_event = IngestionHistoryAppend(
+            dedupe_key=dedupe_key,
+            source=source,
+            processed_at=processed_at,
+            status=f"duplicate_seen:{source_id}",
+        )
+        ingested, is_new = self._intake_repository.save_new_or_append_history(
+            IngestionCandidate(invoice=invoice, duplicate_events=[duplicate_event]))
+        self._audit(source=source, source_ids=[source_id], results=[(ingested, is_new)], processed_at=processed_at)
+        return ingested
+
+    def _ingest_batch(
+        self,
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        processed_at: datetime,
+        replay_processed: bool = True,
+    ) -> list[tuple[IngestedInvoice, bool]]:
+        # A re-delivery of a processed source_id with the same content fingerprint is answered from the index
+        # alone: no repository read, no history or audit write, and the invoice comes back without its history.
+        # A correction under the same id, or a duplicate under a new one, takes the regular path. Attachments
+        # are hashed up front because the fingerprint covers the file hash.
+        payloads = self._hash_attachments(payloads)
+        if self._processed_source_ids is None:
+            return self._ingest_unseen(source=source, payloads=payloads, processed_at=processed_at)
+        fingerprints = [
+            self._dedupe_policy.build_content_fingerprint(
+                self._dedupe_policy.build_dedupe_key(metadata=payload.metadata, file_hash=payload.file_hash),
+                payload.file_hash,
+            )
+            for payload in payloads
+        ]
+        seen = (
+            self._processed_source_ids.find_many(source, list(dict.fromkeys(payload.source_id for payload in payloads)))
+            if replay_processed else {}
+        )
+        matched = {
+            position: seen[payload.source_id].dedupe_key
+            for position, payload in enumerate(payloads)
+            if payload.source_id in seen and seen[payload.source_id].fingerprint == fingerprints[position]
+        }
+        unseen = [position for position in range(len(payloads)) if position not in matched]
+        unseen_results = (
+            self._ingest_unseen(
+                source=source, payloads=[payloads[position] for position in unseen], processed_at=processed_at)
+            if unseen else []
+        )
+        self._processed_source_ids.add_many(source, [
+            (payloads[position].source_id, ProcessedSourceRecord(
+                fingerprint=fingerprints[position], dedupe_key=invoice.dedupe_key))
+            for position, (invoice, _) in zip(unseen, unseen_results)
+        ])
+        pending = iter(unseen_results)
+        return [
+            (
+                IngestedInvoice(
+                    dedupe_key=matched[position],
+                    metadata=payloads[position].metadata,
+                    file_hash=payloads[position].file_hash,
+                ),
+                False,
+            )
+            if position in matched else next(pending)
+            for position in range(len(payloads))
+        ]
+
+    def _ingest_unseen(
+        self,
+        source: IngestionSource,
+        payloads: Sequence[SourceInvoicePayload],
+        processed_at: datetime,
+    ) -> list[tuple[IngestedInvoice, bool]]:
+        self._store_attachments(payloads)
+        dedupe_keys = [
+            self._dedupe_policy.build_dedupe_key(
+                metadata=payload.metadata, file_hash=payload.file_hash)
+            for payload in payloads
+        ]
+        existing = dict(self._intake_repository.find_many_by_dedupe_keys(
+            list(dict.fromkeys(dedupe_keys))))
+        near_duplicate_positions = (
+            self._match_near_duplicates(payloads=payloads, dedupe_keys=dedupe_keys, existing=existing)
+            if self._near_duplicate_index is not None else set()
+        )
+        plan = self._dedupe_policy.plan_batch(
+            source=source,
+            payloads=payloads,
+            dedupe_keys=dedupe_keys,
+            existing_keys=existing,
+            processed_at=processed_at,
+            near_duplicate_positions=near_duplicate_positions,
+        )
+        results = plan.resolve(
+            appended=self._intake_repository.append_history_many(plan.history_appends),
+            saved=self._intake_repository.save_new_or_append_history_many(plan.candidates),
+        )
+        if self._near_duplicate_index is not None:
+            self._near_duplicate_index.add_many([
+                self._near_duplicate_entry(invoice) for invoice, is_new in results if is_new])
+        self._audit(
+            source=source,
+            source_ids=[payload.source_id for payload in payloads],
+            results=results,
+            processed_at=processed_at,
+            near_duplicate_positions=near_duplicate_positions,
+        )
+        return results
+
+    def _hash_attachments(self, payloads: Sequence[SourceInvoicePayload]) -> Sequence[SourceInvoicePayload]:
+        # Attachment content is authoritative for the hash; hashlib releases the GIL, so a batch hashes in parallel.
+        pending = [position for position, payload in enumerate(payloads) if payload.attachment is not None]
+        if not pending:
+            return payloads
+        compute = partial(AttachmentDigest.compute, chunk_size=self._attachment_chunk_size)
+        contents = [payloads[position].attachment for position in pending]
+        if len(contents) == 1:
+            digests = [compute(contents[0])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=self._attachment_hash_workers, thread_name_prefix="attachment-hash") as executor:
+                digests = list(executor.map(compute, contents))
+        hashed = list(payloads)
+        for position, digest in zip(pending, digests):
+            hashed[position] = replace(payloads[position], file_hash=digest)
+        return hashed
+
+    def _store_attachments(self, payloads: Sequence[SourceInvoicePayload]) -> None:
+        # Stored before the records that reference them; the store writes each content hash once.
+        if self._attachment_store is None:
+            return
+        attachments = {
+            payload.file_hash: payload.attachment
+            for payload in payloads
+            if payload.attachment is not None and payload.file_hash is not None
+        }
+        for file_hash, content in attachments.items():
+            self._attachment_store.put(file_hash, content)
+
+    def _audit(
+        self,
+        source: IngestionSource,
+        source_ids: Sequence[str],
+        results: Sequence[tuple[IngestedInvoice, bool]],
+        processed_at: datetime,
+        near_duplicate_positions: Container[int] = frozenset(),
+    ) -> None:
+        # The repository may compact duplicate sightings, so the raw trail is kept here.
+        if self._audit_log is None:
+            return
+        kinds = [
+            NEAR_DUPLICATE_SEEN if position in near_duplicate_positions else DUPLICATE_SEEN
+            for position in range(len(source_ids))
+        ]
+        self._audit_log.record_events([
+            IngestionHistoryAppend(
+                dedupe_key=invoice.dedupe_key,
+                source=source,
+                processed_at=processed_at,
+                status=f"{'ingested' if is_new else kind}:{source_id}",
+            )
+            for source_id, (invoice, is_new), kind in zip(source_ids, results, kinds)
+        ])
+
+    def _seed_near_duplicate_index(self, page_size: int = 500) -> None:
+        # The index only learns from invoices this service creates, so it starts from what the repository
+        # already holds; it is expected to be empty here.
+        dedupe_keys = self._intake_repository.iter_dedupe_keys()
+        while page := list(islice(dedupe_keys, page_size)):
+            invoices = self._intake_repository.find_many_by_dedupe_keys(page)
+            self._near_duplicate_index.add_many([self._near_duplicate_entry(invoice) for invoice in invoices.values()])
+
+    def _near_duplicate_entry(self, invoice: IngestedInvoice) -> tuple[str, NearDuplicateCandidate]:
+        return (
+            self._near_duplicate_policy.blocking_key(invoice.metadata),
+            NearDuplicateCandidate(dedupe_key=invoice.dedupe_key, metadata=invoice.metadata),
+        )
+
+    def _match_near_duplicates(
+        self,
+        payloads: Sequence[SourceInvoicePayload],
+        dedupe_keys: list[str],
+        existing: dict[str, IngestedInvoice],
+    ) -> set[int]:
+        # Only the blocks of unseen keys are read, so the comparison cost stays flat as the store grows.
+        # Matched positions are rewritten in place to the dedupe key of the invoice they resemble.
+        policy = self._near_duplicate_policy
+        pending = [position for position, dedupe_key in enumerate(dedupe_keys) if dedupe_key not in existing]
+        if not pending:
+            return set()
+        blocking_keys = {position: policy.blocking_key(payloads[position].metadata) for position in pending}
+        indexed = self._near_duplicate_index.find_candidates(list(dict.fromkeys(blocking_keys.values())))
+        unknown = {candidate.dedupe_key for block in indexed.values() for candidate in block} - existing.keys()
+        existing.update(self._intake_repository.find_many_by_dedupe_keys(sorted(unknown)))
+
+        batch_keys: set[str] = set()
+        batch_blocks: dict[str, list[NearDuplicateCandidate]] = {}
+        matched: set[int] = set()
+        for position in pending:
+            dedupe_key = dedupe_keys[position]
+            if dedupe_key in batch_keys:
+                continue
+            metadata = payloads[position].metadata
+            blocking_key = blocking_keys[position]
+            candidates = [
+                *(candidate for candidate in indexed.get(blocking_key, ()) if candidate.dedupe_key in existing),
+                *batch_blocks.get(blocking_key, ()),
+            ]
+            match = next(
+                (
+                    candidate.dedupe_key
+                    for candidate in candidates
+                    if candidate.dedupe_key != dedupe_key and policy.matches(candidate.metadata, metadata)
+                ),
+                None,
+            )
+            if match is None:
+                batch_keys.add(dedupe_key)
+                batch_blocks.setdefault(blocking_key, []).append(
+                    NearDuplicateCandidate(dedupe_key=dedupe_key, metadata=metadata))
+            else:
+                dedupe_keys[position] = match
+                matched.add(position)
+        return matched
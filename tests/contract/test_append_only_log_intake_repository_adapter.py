@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import struct
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from adapters.append_only_log_intake_repository_adapter import AppendOnlyLogIntakeRepositoryAdapter
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from common.ingestion_types import (
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    InvoiceMetadata,
+)
+
+
+def _invoice(invoice_number: str, source: IngestionSource, ingested_at: datetime) -> IngestedInvoice:
+    metadata = InvoiceMetadata(
+        invoice_number=invoice_number,
+        supplier="Northwind",
+        amount=55.0,
+        invoice_date=datetime(2026, 2, 9),
+    )
+    invoice = IngestedInvoice(dedupe_key=invoice_number.lower(), metadata=metadata, file_hash="hash-1")
+    invoice.record_event(source=source, ingested_at=ingested_at, status=f"ingested:{invoice_number}")
+    return invoice
+
+
+def _open(directory: Path, **options) -> AppendOnlyLogIntakeRepositoryAdapter:
+    return AppendOnlyLogIntakeRepositoryAdapter(str(directory), state=InMemoryIntakeRepositoryAdapter(), **options)
+
+
+def _history(invoice: IngestedInvoice) -> list[tuple[IngestionSource, datetime, str]]:
+    return [(event.source, event.ingested_at, event.status) for event in invoice.history]
+
+
+def test_append_only_log_repository_replays_log_on_reopen(tmp_path: Path) -> None:
+    first = _open(tmp_path)
+    first.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)))
+    first.save_new_or_append_history(IngestionCandidate(
+        invoice=_invoice("INV-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0)),
+        duplicate_events=[IngestionHistoryAppend(
+            "inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0), "duplicate_seen:acct-1")],
+    ))
+    expected = _history(first.find_by_dedupe_key("inv-1"))
+    first.close()
+
+    reopened = _open(tmp_path)
+    replayed = reopened.find_by_dedupe_key("inv-1")
+    listed = reopened.list_by_source_sorted(IngestionSource.ACCOUNTING_SYSTEM)
+    reopened.close()
+
+    assert replayed is not None
+    assert _history(replayed) == expected
+    assert [invoice.dedupe_key for invoice in listed] == ["inv-1"]
+
+
+def test_append_only_log_repository_snapshot_truncates_log_and_replays_only_tail(tmp_path: Path) -> None:
+    first = _open(tmp_path, snapshot_every=3)
+    first.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)),
+        _invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 10, 0, 0)),
+        _invoice("INV-3", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 11, 0, 0)),
+    ])
+    first.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 12, 0, 0), "duplicate_seen:acct-9")
+    first.close()
+
+    logs = sorted(path.name for path in tmp_path.glob("wal-*.log"))
+    reopened = _open(tmp_path)
+    listed = [invoice.dedupe_key for invoice in reopened.list_by_source_sorted(None)]
+    reopened.close()
+
+    assert (tmp_path / "snapshot.bin").exists()
+    assert logs == ["wal-000000000001.log"]
+    assert listed == ["inv-1", "inv-3", "inv-2"]
+
+
+def test_append_only_log_repository_snapshot_frames_each_invoice_and_rejects_a_truncated_one(tmp_path: Path) -> None:
+    first = _open(tmp_path)
+    without_history = _invoice("INV-3", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 11, 0, 0))
+    first.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)),
+        _invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 10, 0, 0)),
+        IngestedInvoice(dedupe_key="inv-3", metadata=without_history.metadata, file_hash=None),
+    ])
+    first.snapshot()
+    first.close()
+    snapshot = (tmp_path / "snapshot.bin").read_bytes()
+
+    offsets, offset = [], len(b"INTKSNP3")
+    while offset < len(snapshot):
+        offsets.append(offset)
+        offset += struct.calcsize("<II") + struct.unpack_from("<II", snapshot, offset)[0]
+    reopened = _open(tmp_path)
+
+    assert len(offsets) == 4
+    assert set(reopened.find_many_by_dedupe_keys(["inv-1", "inv-2", "inv-3"])) == {"inv-1", "inv-2", "inv-3"}
+    reopened.close()
+    (tmp_path / "snapshot.bin").write_bytes(snapshot[:offsets[-1]])
+    with pytest.raises(RuntimeError, match="Truncated intake snapshot after 2 invoices"):
+        _open(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "torn_tail",
+    [
+        b"\xff\x00\x00\x00partial",
+        bytes(64),
+        struct.pack("<II", 7, 0xDEADBEEF) + b'[0,"x"]',
+    ],
+    ids=["short", "zero-filled", "checksum-mismatch"],
+)
+def test_append_only_log_repository_drops_torn_tail_record(tmp_path: Path, torn_tail: bytes) -> None:
+    first = _open(tmp_path)
+    first.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)))
+    first.close()
+    with (tmp_path / "wal-000000000000.log").open("ab") as log:
+        log.write(torn_tail)
+
+    reopened = _open(tmp_path)
+    reopened.save_new(_invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 10, 0, 0)))
+    reopened.close()
+    replayed = _open(tmp_path)
+
+    assert set(replayed.find_many_by_dedupe_keys(["inv-1", "inv-2"])) == {"inv-1", "inv-2"}
+    replayed.close()
+
+
+def test_append_only_log_repository_rejects_history_for_unknown_key(tmp_path: Path) -> None:
+    repository = _open(tmp_path)
+
+    with pytest.raises(KeyError):
+        repository.append_history("missing", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0), "duplicate_seen:x")
+    repository.close()
+
+    assert (tmp_path / "wal-000000000000.log").read_bytes() == b"INTKWAL2"
+
+
+def test_append_only_log_repository_logs_find_or_create_before_changing_state(tmp_path: Path) -> None:
+    repository = _open(tmp_path)
+    repository.close()
+    candidate = IngestionCandidate(
+        invoice=_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)), duplicate_events=[])
+
+    with pytest.raises(ValueError):
+        repository.save_new_or_append_history(candidate)
+
+    assert repository.find_by_dedupe_key("inv-1") is None
+
+
+def test_append_only_log_repository_replays_history_purge(tmp_path: Path) -> None:
+    first = _open(tmp_path)
+    first.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2024, 1, 10)),
+        _invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2024, 3, 10)),
+    ])
+    first.purge_history_before(datetime(2024, 2, 1))
+    first.close()
+
+    reopened = _open(tmp_path)
+    listed = [invoice.dedupe_key for invoice in reopened.list_by_source_sorted(None)]
+    reopened.close()
+
+    assert listed == ["inv-2"]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from adapters.bloom_filter_intake_repository_adapter import BloomFilterIntakeRepositoryAdapter, BloomFilterStats
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.sqlite_intake_repository_adapter import SqliteIntakeRepositoryAdapter
+from common.ingestion_types import IngestedInvoice, IngestionCandidate, IngestionSource, InvoiceMetadata
+from ports.outbound.intake_repository_port import IntakeRepositoryPort
+
+
+def _invoice(invoice_number: str) -> IngestedInvoice:
+    metadata = InvoiceMetadata(
+        invoice_number=invoice_number,
+        supplier="Northwind",
+        amount=55.0,
+        invoice_date=datetime(2026, 2, 9),
+    )
+    invoice = IngestedInvoice(dedupe_key=invoice_number.lower(), metadata=metadata, file_hash=None)
+    invoice.record_event(source=IngestionSource.AP_EMAIL, ingested_at=datetime(2026, 2, 9, 9, 0, 0), status="ingested")
+    return invoice
+
+
+class _CountingRepository(InMemoryIntakeRepositoryAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups: list[str] = []
+
+    def find_many_by_dedupe_keys(self, dedupe_keys):
+        self.lookups.extend(dedupe_keys)
+        return super().find_many_by_dedupe_keys(dedupe_keys)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[IntakeRepositoryPort]:
+    if request.param == "memory":
+        yield InMemoryIntakeRepositoryAdapter()
+        return
+    repository = SqliteIntakeRepositoryAdapter(str(tmp_path / "intake.db"))
+    yield repository
+    repository.close()
+
+
+def test_bloom_filter_repository_skips_lookup_for_definite_miss() -> None:
+    inner = _CountingRepository()
+    repository = BloomFilterIntakeRepositoryAdapter(inner, expected_invoices=1_000)
+    repository.save_new(_invoice("INV-1"))
+
+    assert repository.find_by_dedupe_key("inv-1") is not None
+    assert repository.find_many_by_dedupe_keys([f"missing-{index}" for index in range(200)]) == {}
+    assert inner.lookups.count("inv-1") == 1
+    assert len(inner.lookups) - 1 == repository.stats().false_positives
+    assert repository.stats().hits == 1
+    assert repository.stats().misses + repository.stats().false_positives == 200
+
+
+def test_bloom_filter_repository_rebuilds_from_backend(backend: IntakeRepositoryPort) -> None:
+    backend.save_many([_invoice("INV-1"), _invoice("INV-2")])
+    backend.save_new_or_append_history(IngestionCandidate(invoice=_invoice("INV-3"), duplicate_events=[]))
+
+    repository = BloomFilterIntakeRepositoryAdapter(backend, expected_invoices=100)
+
+    assert set(repository.find_many_by_dedupe_keys(["inv-1", "inv-2", "inv-3", "inv-4"])) == {"inv-1", "inv-2", "inv-3"}
+    assert repository.stats().hits == 3
+
+
+def test_bloom_filter_repository_persists_filter_across_clean_restart(tmp_path: Path) -> None:
+    filter_path = tmp_path / "dedupe.bloom"
+    first = BloomFilterIntakeRepositoryAdapter(
+        InMemoryIntakeRepositoryAdapter(), expected_invoices=100, filter_path=str(filter_path))
+    first.save_new(_invoice("INV-1"))
+    first.close()
+
+    # An empty backend proves the filter came from disk rather than a rebuild.
+    inner = _CountingRepository()
+    reopened = BloomFilterIntakeRepositoryAdapter(inner, expected_invoices=100, filter_path=str(filter_path))
+    reopened.find_by_dedupe_key("inv-1")
+
+    assert inner.lookups == ["inv-1"]
+    assert reopened.stats() == BloomFilterStats(hits=0, misses=0, false_positives=1)
+    assert not filter_path.exists()
+
+
+def test_bloom_filter_repository_rebuilds_when_persisted_sizing_differs(tmp_path: Path) -> None:
+    filter_path = tmp_path / "dedupe.bloom"
+    backend = InMemoryIntakeRepositoryAdapter()
+    first = BloomFilterIntakeRepositoryAdapter(backend, expected_invoices=100, filter_path=str(filter_path))
+    first.save_new(_invoice("INV-1"))
+    first.close()
+
+    reopened = BloomFilterIntakeRepositoryAdapter(backend, expected_invoices=10_000, filter_path=str(filter_path))
+
+    assert reopened.find_by_dedupe_key("inv-1") is not None
+    assert reopened.stats().hits == 1
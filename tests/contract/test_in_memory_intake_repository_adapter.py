@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import threading
 from datetime import datetime
 
 from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
-from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata
+from common.ingestion_types import IngestedInvoice, IngestionCandidate, IngestionHistoryAppend, IngestionSource, IntakeCursor, InvoiceMetadata
 
 
 def test_in_memory_repository_round_trip_contract() -> None:
@@ -23,3 +24,182 @@ def test_in_memory_repository_round_trip_contract() -> None:
     repository.append_history(invoice.dedupe_key, IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0), "ingested")
     listed = repository.list_by_source_sorted(IngestionSource.AP_EMAIL)
     assert len(listed) == 1
+
+
+def _invoice(invoice_number: str, source: IngestionSource, ingested_at: datetime) -> IngestedInvoice:
+    metadata = InvoiceMetadata(
+        invoice_number=invoice_number,
+        supplier="Northwind",
+        amount=55.0,
+        invoice_date=datetime(2026, 2, 9),
+    )
+    invoice = IngestedInvoice(dedupe_key=invoice_number.lower(), metadata=metadata, file_hash=None)
+    invoice.record_event(source=source, ingested_at=ingested_at, status=f"ingested:{invoice_number}")
+    return invoice
+
+
+def test_in_memory_repository_lists_by_latest_ingestion_contract() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    repository.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)))
+    repository.save_new(_invoice("INV-2", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0)))
+    repository.save_new(_invoice("INV-3", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 11, 0, 0)))
+
+    repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 12, 0, 0), "duplicate_seen:acct-9")
+
+    newest_first = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None)]
+    oldest_first = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None, newest_first=False)]
+    accounting = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.ACCOUNTING_SYSTEM)]
+    ap_email = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.AP_EMAIL)]
+    assert newest_first == ["inv-1", "inv-3", "inv-2"]
+    assert oldest_first == ["inv-2", "inv-3", "inv-1"]
+    assert accounting == ["inv-1", "inv-2"]
+    assert ap_email == ["inv-1", "inv-3"]
+
+
+def test_in_memory_repository_keeps_order_for_out_of_order_history_contract() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    repository.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 12, 0, 0)))
+    repository.save_new(_invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 10, 0, 0)))
+
+    repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 8, 0, 0), "duplicate_seen:acct-1")
+
+    listed = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None)]
+    accounting = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.ACCOUNTING_SYSTEM)]
+    assert listed == ["inv-1", "inv-2"]
+    assert accounting == ["inv-1"]
+
+
+def test_in_memory_repository_pages_with_keyset_cursor_contract() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    for hour in range(5):
+        repository.save_new(_invoice(f"INV-{hour}", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, hour, 0, 0)))
+
+    first_desc = repository.list_by_source_sorted(None, newest_first=True, limit=2)
+    second_desc = repository.list_by_source_sorted(
+        None,
+        newest_first=True,
+        limit=2,
+        after=IntakeCursor(ingested_at=first_desc[-1].latest_ingested_at, dedupe_key=first_desc[-1].dedupe_key),
+    )
+    first_asc = repository.list_by_source_sorted(None, newest_first=False, limit=2)
+    last_asc = repository.list_by_source_sorted(
+        None,
+        newest_first=False,
+        limit=2,
+        after=IntakeCursor(ingested_at=datetime(2026, 2, 9, 3, 0, 0), dedupe_key="inv-3"),
+    )
+
+    assert [invoice.dedupe_key for invoice in first_desc] == ["inv-4", "inv-3"]
+    assert [invoice.dedupe_key for invoice in second_desc] == ["inv-2", "inv-1"]
+    assert [invoice.dedupe_key for invoice in first_asc] == ["inv-0", "inv-1"]
+    assert [invoice.dedupe_key for invoice in last_asc] == ["inv-4"]
+
+
+def test_in_memory_repository_batch_operations_contract() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    saved = repository.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)),
+        _invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 10, 0, 0)),
+    ])
+
+    found = repository.find_many_by_dedupe_keys(["inv-1", "inv-2", "inv-missing"])
+    updated = repository.append_history_many([
+        IngestionHistoryAppend("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 11, 0, 0), "duplicate_seen:acct-1"),
+        IngestionHistoryAppend("inv-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 12, 0, 0), "duplicate_seen:mail-2"),
+    ])
+
+    assert len(saved) == 2
+    assert set(found) == {"inv-1", "inv-2"}
+    assert [invoice.dedupe_key for invoice in updated] == ["inv-1", "inv-1"]
+    assert len(repository.find_by_dedupe_key("inv-1").history) == 3
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.ACCOUNTING_SYSTEM)] == ["inv-1"]
+
+
+def _candidate(source: IngestionSource, source_id: str, ingested_at: datetime) -> IngestionCandidate:
+    invoice = _invoice("INV-1", source, ingested_at)
+    return IngestionCandidate(
+        invoice=invoice,
+        duplicate_events=[IngestionHistoryAppend("inv-1", source, ingested_at, f"duplicate_seen:{source_id}")],
+    )
+
+
+def test_in_memory_repository_save_new_or_append_history_contract() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+
+    created, is_new = repository.save_new_or_append_history(
+        _candidate(IngestionSource.AP_EMAIL, "mail-1", datetime(2026, 2, 9, 9, 0, 0)))
+    updated, is_new_again = repository.save_new_or_append_history(
+        _candidate(IngestionSource.ACCOUNTING_SYSTEM, "acct-1", datetime(2026, 2, 9, 10, 0, 0)))
+
+    assert is_new is True
+    assert is_new_again is False
+    assert updated.dedupe_key == created.dedupe_key
+    assert [event.status for event in updated.history] == ["ingested:INV-1", "duplicate_seen:acct-1"]
+
+
+def test_in_memory_repository_concurrent_sightings_create_one_record_contract() -> None:
+    repository = InMemoryIntakeRepositoryAdapter(lock_stripes=4)
+    barrier = threading.Barrier(8)
+    outcomes: list[bool] = []
+
+    def _ingest(worker: int) -> None:
+        source = IngestionSource.AP_EMAIL if worker % 2 else IngestionSource.ACCOUNTING_SYSTEM
+        barrier.wait()
+        for attempt in range(50):
+            _, is_new = repository.save_new_or_append_history(
+                _candidate(source, f"{worker}-{attempt}", datetime(2026, 2, 9, 9, 0, attempt)))
+            outcomes.append(is_new)
+
+    threads = [threading.Thread(target=_ingest, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count(True) == 1
+    assert len(repository.list_by_source_sorted(None)) == 1
+    assert len(repository.find_by_dedupe_key("inv-1").history) == 400
+    assert len(repository.list_by_source_sorted(IngestionSource.AP_EMAIL)) == 1
+
+
+def test_in_memory_repository_compacts_repeated_duplicate_sightings() -> None:
+    repository = InMemoryIntakeRepositoryAdapter(compact_duplicates=True)
+    repository.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)))
+
+    for hour in (10, 11, 12):
+        repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, hour, 0, 0), "duplicate_seen:acct-1")
+    repository.append_history("inv-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 13, 0, 0), "duplicate_seen:acct-1")
+    history = repository.find_by_dedupe_key("inv-1").history
+
+    assert [(event.source, event.status, event.seen_count) for event in history] == [
+        (IngestionSource.AP_EMAIL, "ingested:INV-1", 1),
+        (IngestionSource.ACCOUNTING_SYSTEM, "duplicate_seen:acct-1", 3),
+        (IngestionSource.AP_EMAIL, "duplicate_seen:acct-1", 1),
+    ]
+    assert (history[1].first_seen_at, history[1].ingested_at) == (datetime(2026, 2, 9, 10, 0, 0), datetime(2026, 2, 9, 12, 0, 0))
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.ACCOUNTING_SYSTEM)] == ["inv-1"]
+
+
+def test_in_memory_repository_purges_expired_month_partitions() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    repository.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2024, 1, 10)),
+        _invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2024, 2, 10)),
+        _invoice("INV-3", IngestionSource.AP_EMAIL, datetime(2024, 3, 10)),
+    ])
+    repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2024, 3, 1), "duplicate_seen:acct-1")
+
+    result = repository.purge_history_before(datetime(2024, 2, 20))
+
+    assert result.dropped_partitions == ("2024-01",)
+    assert (result.purged_events, result.purged_invoices, result.newest_purged_at) == (1, 0, datetime(2024, 1, 10))
+    assert result.oldest_retained_at == datetime(2024, 2, 10)
+    assert [event.status for event in repository.find_by_dedupe_key("inv-1").history] == ["duplicate_seen:acct-1"]
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.AP_EMAIL)] == ["inv-3", "inv-2"]
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None)] == ["inv-3", "inv-1", "inv-2"]
+
+    second = repository.purge_history_before(datetime(2024, 3, 1))
+
+    assert (second.dropped_partitions, second.purged_invoices) == (("2024-02",), 1)
+    assert repository.find_by_dedupe_key("inv-2") is None
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None)] == ["inv-3", "inv-1"]
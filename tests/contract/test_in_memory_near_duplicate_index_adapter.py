@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from adapters.in_memory_near_duplicate_index_adapter import InMemoryNearDuplicateIndexAdapter
+from common.ingestion_types import InvoiceMetadata, NearDuplicateCandidate
+
+
+def test_in_memory_near_duplicate_index_returns_only_requested_blocks() -> None:
+    index = InMemoryNearDuplicateIndexAdapter()
+    metadata = InvoiceMetadata(invoice_number="INV-1", supplier="Acme", amount=10.0, invoice_date=datetime(2026, 2, 1))
+    first = NearDuplicateCandidate(dedupe_key="inv-1", metadata=metadata)
+    second = NearDuplicateCandidate(dedupe_key="inv-2", metadata=metadata)
+
+    index.add_many([("acme|1000", first), ("acme|1000", second), ("globex|1000", first)])
+
+    assert index.find_candidates(["acme|1000", "initech|1000"]) == {"acme|1000": [first, second]}
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from adapters.in_memory_processed_source_id_index_adapter import InMemoryProcessedSourceIdIndexAdapter
+from common.ingestion_types import IngestionSource, ProcessedSourceRecord
+
+
+def _record(dedupe_key: str) -> ProcessedSourceRecord:
+    return ProcessedSourceRecord(fingerprint=f"{dedupe_key}#", dedupe_key=dedupe_key)
+
+
+class ManualClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_index_is_kept_per_source_and_bounded() -> None:
+    index = InMemoryProcessedSourceIdIndexAdapter(max_entries=2)
+
+    index.add_many(IngestionSource.AP_EMAIL, [("mail-1", _record("inv-1")), ("mail-2", _record("inv-2"))])
+    index.add_many(IngestionSource.AP_EMAIL, [("mail-3", _record("inv-3"))])
+    index.add_many(IngestionSource.ACCOUNTING_SYSTEM, [("mail-1", _record("inv-9"))])
+
+    assert index.find_many(IngestionSource.AP_EMAIL, ["mail-1", "mail-2", "mail-3"]) == {
+        "mail-2": _record("inv-2"), "mail-3": _record("inv-3")}
+    assert index.find_many(IngestionSource.ACCOUNTING_SYSTEM, ["mail-1", "mail-2"]) == {"mail-1": _record("inv-9")}
+
+
+def test_index_entries_expire_after_ttl() -> None:
+    clock = ManualClock()
+    index = InMemoryProcessedSourceIdIndexAdapter(ttl_seconds=60.0, clock=clock)
+
+    index.add_many(IngestionSource.AP_EMAIL, [("mail-1", _record("inv-1"))])
+    clock.now = 30.0
+    index.add_many(IngestionSource.AP_EMAIL, [("mail-2", _record("inv-2"))])
+    clock.now = 60.0
+
+    assert index.find_many(IngestionSource.AP_EMAIL, ["mail-1", "mail-2"]) == {"mail-2": _record("inv-2")}
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from datetime import datetime
+import base64
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
 
 from fastapi.testclient import TestClient
 
 from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.local_attachment_store_adapter import LocalAttachmentStoreAdapter
 from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
 from api.invoice_ingestion import get_invoice_ingestion_service
-from common.ingestion_types import IngestionSource, InvoiceMetadata
+from api.schemas.api_response import PagedApiResponse
+from api.schemas.invoice_ingestion import IngestionHistoryEntryResponse, InvoiceIntakeItemResponse
+from api.schemas.invoice_ingestion_json import dump_intake_page
+from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata, SourceInvoicePayload
 from main import app
 from services.invoice_ingestion_service import InvoiceIngestionService
 
@@ -90,6 +98,126 @@ def test_list_intake_filters_by_source_and_sorts_desc() -> None:
     assert body["data"][0]["history"][-1]["source"] == "AP email"
 
 
+def test_list_intake_pages_with_cursor() -> None:
+    client = _client(_build_service_with_seed_data())
+    headers = _headers("finance_analyst")
+
+    first = client.get("/v1/invoices/intake",
+                       params={"sort": "asc", "limit": 1}, headers=headers)
+    second = client.get(
+        "/v1/invoices/intake",
+        params={"sort": "asc", "limit": 1,
+                "cursor": first.json()["next_cursor"]},
+        headers=headers,
+    )
+
+    assert first.status_code == 200
+    assert [item["invoice_number"]
+            for item in first.json()["data"]] == ["INV-API-1"]
+    assert second.status_code == 200
+    assert [item["invoice_number"]
+            for item in second.json()["data"]] == ["INV-API-2"]
+    assert second.json()["next_cursor"] is None
+
+
+def test_list_intake_rejects_malformed_cursor() -> None:
+    client = _client(_build_service_with_seed_data())
+
+    response = client.get(
+        "/v1/invoices/intake",
+        params={"limit": 1, "cursor": "not-a-cursor"},
+        headers=_headers("finance_analyst"),
+    )
+
+    assert response.status_code == 400
+
+
+def test_list_intake_rejects_cursor_with_aware_timestamp() -> None:
+    client = _client(_build_service_with_seed_data())
+    forged = base64.urlsafe_b64encode(json.dumps(["2026-02-19T10:00:00+00:00", "inv-1"]).encode()).decode()
+
+    response = client.get(
+        "/v1/invoices/intake",
+        params={"limit": 1, "cursor": forged},
+        headers=_headers("finance_analyst"),
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "INVALID_CURSOR"
+
+
+def test_list_intake_answers_matching_etag_with_not_modified_until_next_ingest() -> None:
+    service = _build_service_with_seed_data()
+    client = _client(service)
+    headers = _headers("finance_analyst")
+
+    first = client.get("/v1/invoices/intake", headers=headers)
+    unchanged = client.get("/v1/invoices/intake", headers={**headers, "If-None-Match": first.headers["etag"]})
+    service.ingest_ap_email_invoice(
+        source_id="mail-2",
+        metadata=InvoiceMetadata(
+            invoice_number="INV-API-3", supplier="Contoso", amount=300.0, invoice_date=datetime(2026, 2, 12)),
+        file_hash=None,
+        processed_at=datetime(2026, 2, 19, 12, 0, 0),
+    )
+    changed = client.get("/v1/invoices/intake", headers={**headers, "If-None-Match": first.headers["etag"]})
+
+    assert (unchanged.status_code, unchanged.content) == (304, b"")
+    assert unchanged.headers["etag"] == first.headers["etag"]
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert [item["invoice_number"] for item in changed.json()["data"]] == ["INV-API-3", "INV-API-2", "INV-API-1"]
+
+
+def test_intake_page_json_matches_pydantic_serialization() -> None:
+    invoices = []
+    for index, (amount, moment) in enumerate([
+        (100, datetime(2026, 2, 19, 9, 0, 0)),
+        (1e-7, datetime(2026, 2, 19, 9, 0, 0, 1500)),
+        (2.5e21, datetime(2026, 2, 19, 9, 0, tzinfo=timezone.utc)),
+        (float("inf"), datetime(2026, 2, 19, 9, 0, tzinfo=timezone(timedelta(hours=-5)))),
+    ]):
+        invoice = IngestedInvoice(
+            dedupe_key=f"inv-{index}",
+            metadata=InvoiceMetadata(
+                invoice_number=f'INV "{index}"\\\n', supplier="Société Générale \u2028", amount=amount,
+                invoice_date=moment),
+            file_hash=None if index % 2 else f"hash-{index}",
+        )
+        invoice.record_event(source=IngestionSource.AP_EMAIL, ingested_at=moment, status="ingested")
+        invoice.record_event(source=IngestionSource.ACCOUNTING_SYSTEM, ingested_at=moment, status="duplicate_seen:\x01")
+        invoices.append(invoice)
+
+    expected = PagedApiResponse[list[InvoiceIntakeItemResponse]](
+        success=True,
+        data=[
+            InvoiceIntakeItemResponse(
+                dedupe_key=invoice.dedupe_key,
+                invoice_number=invoice.metadata.invoice_number,
+                supplier=invoice.metadata.supplier,
+                amount=invoice.metadata.amount,
+                invoice_date=invoice.metadata.invoice_date,
+                file_hash=invoice.file_hash,
+                history=[
+                    IngestionHistoryEntryResponse(
+                        source=entry.source.value,
+                        ingested_at=entry.ingested_at,
+                        status=entry.status,
+                        first_seen_at=entry.first_seen_at,
+                        seen_count=entry.seen_count,
+                    )
+                    for entry in invoice.history
+                ],
+            )
+            for invoice in invoices
+        ],
+        next_cursor="abc=",
+    )
+
+    assert dump_intake_page(invoices, "abc=") == expected.model_dump_json().encode("utf-8")
+    assert dump_intake_page([], None) == b'{"success":true,"data":[],"error":null,"next_cursor":null}'
+
+
 def test_status_endpoint_requires_finance_ops_scope() -> None:
     client = _client(_build_service_with_seed_data())
 
@@ -110,3 +238,135 @@ def test_status_endpoint_returns_failure_events() -> None:
     assert body["success"] is True
     assert len(body["data"]) == 1
     assert body["data"][0]["error_type"] == "integration_unavailable"
+
+
+def test_file_endpoint_serves_stored_attachment_with_ranges(tmp_path) -> None:
+    pdf = b"%PDF-1.7\n" + bytes(range(256)) * 8
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        attachment_store=LocalAttachmentStoreAdapter(str(tmp_path)),
+    )
+    processed_at = datetime(2026, 2, 19, 9, 0, 0)
+    metadata = InvoiceMetadata(invoice_number="INV-API-9", supplier="Contoso", amount=9.0, invoice_date=datetime(2026, 2, 10))
+    invoice = service.ingest_many(
+        source=IngestionSource.AP_EMAIL,
+        payloads=[
+            SourceInvoicePayload(source_id=f"mail-{index}", metadata=metadata, file_hash=None,
+                                 received_at=processed_at, attachment=pdf)
+            for index in range(3)
+        ],
+        processed_at=processed_at,
+    )[0]
+    client = _client(service)
+
+    full = client.get(f"/v1/invoices/intake/{invoice.dedupe_key}/file", headers=_headers("finance_analyst"))
+    partial = client.get(
+        f"/v1/invoices/intake/{invoice.dedupe_key}/file",
+        headers={**_headers("finance_analyst"), "Range": "bytes=0-7"},
+    )
+    missing = client.get("/v1/invoices/intake/unknown/file", headers=_headers("finance_analyst"))
+
+    assert (full.status_code, full.headers["content-type"], full.content) == (200, "application/pdf", pdf)
+    assert (partial.status_code, partial.content) == (206, pdf[:8])
+    assert missing.status_code == 404
+    assert len(list(tmp_path.rglob("*"))) == 2
+
+
+def test_file_endpoint_accepts_dedupe_keys_containing_slashes(tmp_path) -> None:
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        attachment_store=LocalAttachmentStoreAdapter(str(tmp_path)),
+    )
+    processed_at = datetime(2026, 2, 19, 9, 0, 0)
+    metadata = InvoiceMetadata(invoice_number="INV/2026/001", supplier="Contoso", amount=9.0,
+                               invoice_date=datetime(2026, 2, 10))
+    invoice = service.ingest_many(
+        source=IngestionSource.AP_EMAIL,
+        payloads=[SourceInvoicePayload(source_id="mail-1", metadata=metadata, file_hash=None,
+                                       received_at=processed_at, attachment=b"%PDF-1.7\n")],
+        processed_at=processed_at,
+    )[0]
+    client = _client(service)
+
+    raw = client.get(f"/v1/invoices/intake/{invoice.dedupe_key}/file", headers=_headers("finance_analyst"))
+    encoded = client.get(f"/v1/invoices/intake/{quote(invoice.dedupe_key, safe='')}/file",
+                         headers=_headers("finance_analyst"))
+
+    assert "/" in invoice.dedupe_key
+    assert (raw.status_code, raw.content) == (200, b"%PDF-1.7\n")
+    assert (encoded.status_code, encoded.content) == (200, b"%PDF-1.7\n")
+
+
+def test_export_endpoint_streams_ndjson_with_filters_and_gzip() -> None:
+    client = _client(_build_service_with_seed_data())
+    headers = _headers("finance_ops")
+
+    plain = client.get("/v1/invoices/intake/export", headers={**headers, "Accept-Encoding": "identity"})
+    ranged = client.get(
+        "/v1/invoices/intake/export",
+        params={"ingested_from": "2026-02-19T09:30:00", "ingested_to": "2026-02-19T11:00:00"},
+        headers={**headers, "Accept-Encoding": "identity"},
+    )
+    with client.stream(
+        "GET", "/v1/invoices/intake/export", params={"source": "AP email"}, headers={**headers, "Accept-Encoding": "gzip"},
+    ) as compressed:
+        raw = b"".join(compressed.iter_raw())
+    inverted = client.get(
+        "/v1/invoices/intake/export",
+        params={"ingested_from": "2026-02-20T00:00:00", "ingested_to": "2026-02-19T00:00:00"},
+        headers=headers,
+    )
+
+    assert plain.status_code == 200
+    assert plain.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["invoice_number"] for line in plain.text.splitlines()] == ["INV-API-1", "INV-API-2"]
+    assert [json.loads(line)["invoice_number"] for line in ranged.text.splitlines()] == ["INV-API-2"]
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert [json.loads(line)["invoice_number"] for line in gzip.decompress(raw).splitlines()] == ["INV-API-1"]
+    assert inverted.status_code == 400
+
+
+def _utc_z(local: datetime) -> str:
+    return local.astimezone(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+def test_export_endpoint_accepts_utc_offsets_in_time_range() -> None:
+    client = _client(_build_service_with_seed_data())
+
+    ranged = client.get(
+        "/v1/invoices/intake/export",
+        params={"ingested_from": _utc_z(datetime(2026, 2, 19, 9, 30, 0)), "ingested_to": "2026-02-19T11:00:00"},
+        headers={**_headers("finance_ops"), "Accept-Encoding": "identity"},
+    )
+
+    assert ranged.status_code == 200
+    assert [json.loads(line)["invoice_number"] for line in ranged.text.splitlines()] == ["INV-API-2"]
+
+
+def test_status_endpoints_page_failures_and_report_window_counts() -> None:
+    service = _build_service_with_seed_data()
+    service.record_ingestion_failure(
+        source=IngestionSource.AP_EMAIL, error_type="integration_unavailable", occurred_at=datetime(2026, 2, 19, 11, 30, 0))
+    client = _client(service)
+    headers = _headers("finance_ops")
+
+    recent = client.get("/v1/ingestion/status", params={"since": "2026-02-19T11:15:00"}, headers=headers)
+    newest = client.get("/v1/ingestion/status", params={"limit": 1}, headers=headers)
+    windows = client.get("/v1/ingestion/status/windows", params={"as_of": "2026-02-19T11:31:00"}, headers=headers)
+    recent_utc = client.get(
+        "/v1/ingestion/status", params={"since": _utc_z(datetime(2026, 2, 19, 11, 15, 0))}, headers=headers)
+    windows_utc = client.get(
+        "/v1/ingestion/status/windows", params={"as_of": _utc_z(datetime(2026, 2, 19, 11, 31, 0))}, headers=headers)
+
+    assert [item["occurred_at"] for item in recent.json()["data"]] == ["2026-02-19T11:30:00"]
+    assert [item["occurred_at"] for item in newest.json()["data"]] == ["2026-02-19T11:30:00"]
+    assert windows.json()["data"] == [{
+        "source": "AP email",
+        "error_type": "integration_unavailable",
+        "last_occurred_at": "2026-02-19T11:30:00",
+        "window_counts": {"5m": 1, "1h": 2, "24h": 2},
+    }]
+    assert recent_utc.json()["data"] == recent.json()["data"]
+    assert windows_utc.json()["data"] == windows.json()["data"]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+from adapters.jsonl_ingestion_audit_log_adapter import JsonLinesIngestionAuditLogAdapter
+from common.ingestion_types import IngestionHistoryAppend, IngestionSource
+
+
+def test_jsonl_audit_log_keeps_raw_events_per_invoice(tmp_path: Path) -> None:
+    audit_log = JsonLinesIngestionAuditLogAdapter(str(tmp_path / "audit" / "events.jsonl"))
+    events = [
+        IngestionHistoryAppend("inv-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0), "ingested:mail-1"),
+        IngestionHistoryAppend("inv-2", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0), "ingested:mail-2"),
+        IngestionHistoryAppend("inv-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 10, 0, 0), "duplicate_seen:mail-1"),
+    ]
+
+    assert audit_log.list_events("inv-1") == []
+    audit_log.record_events(events[:2])
+    audit_log.record_events(events[2:])
+
+    assert audit_log.list_events("inv-1") == [events[0], events[2]]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from pathlib import Path
+
+from adapters.local_attachment_store_adapter import LocalAttachmentStoreAdapter
+
+
+def test_local_attachment_store_writes_each_content_hash_once(tmp_path: Path) -> None:
+    store = LocalAttachmentStoreAdapter(str(tmp_path))
+    content = b"%PDF-1.4 invoice body"
+    file_hash = hashlib.sha256(content).hexdigest()
+    stream = io.BytesIO(content)
+
+    first = store.put(file_hash, stream)
+    second = store.put(file_hash, content)
+
+    assert first == second == store.locate(file_hash)
+    assert (first.size, first.media_type) == (len(content), "application/pdf")
+    assert Path(first.path).read_bytes() == content
+    assert stream.tell() == 0
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [file_hash]
+
+
+def test_local_attachment_store_ignores_unknown_and_non_hash_keys(tmp_path: Path) -> None:
+    store = LocalAttachmentStoreAdapter(str(tmp_path))
+
+    assert store.locate("0" * 64) is None
+    assert store.locate("../etc/passwd") is None
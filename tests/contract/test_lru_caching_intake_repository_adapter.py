@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import copy
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.lru_caching_intake_repository_adapter import LruCachingIntakeRepositoryAdapter
+from adapters.sqlite_intake_repository_adapter import SqliteIntakeRepositoryAdapter
+from common.ingestion_types import IngestedInvoice, IngestionSource, InvoiceMetadata
+
+
+def _invoice(invoice_number: str) -> IngestedInvoice:
+    metadata = InvoiceMetadata(
+        invoice_number=invoice_number,
+        supplier="Northwind",
+        amount=55.0,
+        invoice_date=datetime(2026, 2, 9),
+    )
+    invoice = IngestedInvoice(dedupe_key=invoice_number.lower(), metadata=metadata, file_hash=None)
+    invoice.record_event(source=IngestionSource.AP_EMAIL, ingested_at=datetime(2026, 2, 9, 9, 0, 0), status="ingested")
+    return invoice
+
+
+class _CountingRepository(InMemoryIntakeRepositoryAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups: list[str] = []
+
+    def find_many_by_dedupe_keys(self, dedupe_keys):
+        self.lookups.extend(dedupe_keys)
+        return super().find_many_by_dedupe_keys(dedupe_keys)
+
+
+class _InterleavingRepository(InMemoryIntakeRepositoryAdapter):
+    # Runs `during_load` after the backend snapshot is taken but before the cache sees it.
+    def __init__(self) -> None:
+        super().__init__()
+        self.during_load = None
+
+    def find_many_by_dedupe_keys(self, dedupe_keys):
+        loaded = copy.deepcopy(super().find_many_by_dedupe_keys(dedupe_keys))
+        during_load, self.during_load = self.during_load, None
+        if during_load is not None:
+            during_load()
+        return loaded
+
+
+class _BlockingPurgeRepository(InMemoryIntakeRepositoryAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.purge_started = threading.Event()
+        self.release_purge = threading.Event()
+
+    def purge_history_before(self, cutoff):
+        self.purge_started.set()
+        self.release_purge.wait(timeout=5)
+        return super().purge_history_before(cutoff)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_caching_repository_serves_repeat_lookups_from_cache() -> None:
+    inner = _CountingRepository()
+    inner.save_new(_invoice("INV-1"))
+    repository = LruCachingIntakeRepositoryAdapter(inner)
+
+    for _ in range(3):
+        assert repository.find_by_dedupe_key("inv-1") is not None
+    assert repository.find_by_dedupe_key("missing") is None
+
+    stats = repository.stats()
+    assert inner.lookups == ["inv-1", "missing"]
+    assert (stats.hits, stats.misses) == (2, 2)
+    assert stats.hit_ratio == 0.5
+
+
+def test_lru_caching_repository_writes_through_appended_history(tmp_path: Path) -> None:
+    backend = SqliteIntakeRepositoryAdapter(str(tmp_path / "intake.db"))
+    repository = LruCachingIntakeRepositoryAdapter(backend)
+    repository.save_new(_invoice("INV-1"))
+    repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0), "duplicate_seen")
+
+    cached = repository.find_by_dedupe_key("inv-1")
+    backend.close()
+
+    assert cached is not None
+    assert [event.status for event in cached.history] == ["ingested", "duplicate_seen"]
+    assert repository.stats().misses == 0
+
+
+def test_lru_caching_repository_evicts_least_recent_and_expired_entries() -> None:
+    inner = _CountingRepository()
+    clock = _Clock()
+    repository = LruCachingIntakeRepositoryAdapter(inner, max_entries=2, ttl_seconds=60.0, clock=clock)
+    repository.save_many([_invoice("INV-1"), _invoice("INV-2")])
+    repository.find_by_dedupe_key("inv-1")
+    repository.save_new(_invoice("INV-3"))
+
+    repository.find_many_by_dedupe_keys(["inv-1", "inv-3"])
+    assert inner.lookups == []
+    repository.find_by_dedupe_key("inv-2")
+    assert inner.lookups == ["inv-2"]
+
+    clock.now = 61.0
+    repository.find_by_dedupe_key("inv-2")
+    assert inner.lookups == ["inv-2", "inv-2"]
+    assert repository.stats().evictions == 2
+
+
+def test_lru_caching_repository_drops_cache_on_history_purge() -> None:
+    repository = LruCachingIntakeRepositoryAdapter(InMemoryIntakeRepositoryAdapter())
+    repository.save_new(_invoice("INV-1"))
+
+    repository.purge_history_before(datetime(2026, 3, 1))
+
+    assert repository.find_by_dedupe_key("inv-1") is None
+
+
+def test_lru_caching_repository_does_not_cache_snapshot_older_than_concurrent_write() -> None:
+    inner = _InterleavingRepository()
+    inner.save_new(_invoice("INV-1"))
+    repository = LruCachingIntakeRepositoryAdapter(inner)
+    inner.during_load = lambda: repository.append_history(
+        "inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0), "duplicate_seen")
+
+    stale = repository.find_by_dedupe_key("inv-1")
+    current = repository.find_by_dedupe_key("inv-1")
+
+    assert stale is not None and current is not None
+    assert [event.status for event in stale.history] == ["ingested"]
+    assert [event.status for event in current.history] == ["ingested", "duplicate_seen"]
+
+
+def test_lru_caching_repository_serves_cached_reads_while_purge_runs() -> None:
+    inner = _BlockingPurgeRepository()
+    repository = LruCachingIntakeRepositoryAdapter(inner)
+    repository.save_new(_invoice("INV-1"))
+    purge = threading.Thread(target=repository.purge_history_before, args=(datetime(2026, 3, 1),))
+    purge.start()
+    assert inner.purge_started.wait(timeout=5)
+
+    during = repository.find_by_dedupe_key("inv-1")
+    repository.find_by_dedupe_key("inv-1")
+    size_during = repository.stats().size
+    inner.release_purge.set()
+    purge.join(timeout=5)
+
+    assert during is not None
+    assert size_during == 0
+    assert repository.find_by_dedupe_key("inv-1") is None
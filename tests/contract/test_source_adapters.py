@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime
+from typing import Optional
 
 import pytest
 
-from adapters.accounting_source_adapter import AccountingSourceAdapter
-from adapters.ap_email_adapter import ApEmailAdapter
-from common.ingestion_types import InvoiceMetadata, SourceInvoicePayload
+from adapters.accounting_source_adapter import AccountingSourceAdapter, AsyncAccountingSourceAdapter
+from adapters.ap_email_adapter import ApEmailAdapter, AsyncApEmailAdapter
+from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from common.ingestion_types import IngestionSource, InvoiceMetadata, SourceChangeBatch, SourceInvoicePayload
+from common.source_resilience import CircuitBreaker, CircuitOpenError, CircuitState, RetryPolicy, SourceTimeoutError
 
 
 class FakeClient:
@@ -66,3 +71,249 @@ def test_accounting_source_adapter_wraps_client_failures() -> None:
 
     with pytest.raises(RuntimeError, match="Accounting source fetch failed"):
         adapter.fetch_new_invoices()
+
+
+class FlakyClient:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ValueError("upstream timeout")
+        return [_payload()]
+
+
+def test_accounting_source_adapter_retries_transient_failures() -> None:
+    client = FlakyClient(failures=2)
+    adapter = AccountingSourceAdapter(client=client, retry_policy=RetryPolicy(max_attempts=3, jitter=lambda: 0.0))
+
+    results = adapter.fetch_new_invoices()
+
+    assert (len(results), client.calls) == (1, 3)
+
+
+def test_ap_email_adapter_fails_fast_while_circuit_is_open_and_reports_trips() -> None:
+    now = [0.0]
+    client = FlakyClient(failures=4)
+    alerts = NoopIngestionAlertAdapter()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=lambda: now[0])
+    adapter = ApEmailAdapter(
+        client=client,
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_attempts=5, jitter=lambda: 0.0),
+        alert_port=alerts,
+        clock=lambda: datetime(2026, 2, 19, 11, 0, 0),
+    )
+
+    with pytest.raises(RuntimeError, match="AP email source fetch failed"):
+        adapter.fetch_new_invoices()
+    with pytest.raises(RuntimeError) as rejected:
+        adapter.fetch_new_invoices()
+    calls_while_open = client.calls
+    now[0] = 31.0
+    with pytest.raises(RuntimeError):
+        adapter.fetch_new_invoices()
+    now[0] = 62.0
+    client.failures = 0
+    results = adapter.fetch_new_invoices()
+
+    assert calls_while_open == 2
+    assert isinstance(rejected.value.__cause__, CircuitOpenError)
+    assert len(results) == 1
+    assert breaker.state is CircuitState.CLOSED
+    assert [(event.source, event.error_type) for event in alerts.events] == [
+        (IngestionSource.AP_EMAIL, "circuit_open"),
+        (IngestionSource.AP_EMAIL, "circuit_open"),
+    ]
+    assert [(event.previous, event.current) for event in alerts.circuit_events] == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+    assert [(state.source, state.current) for state in alerts.list_circuit_states()] == [
+        (IngestionSource.AP_EMAIL, CircuitState.CLOSED)]
+
+
+def test_shared_circuit_breaker_reports_each_trip_once_under_the_tripping_source() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    ap_email = ApEmailAdapter(client=FailingClient(), circuit_breaker=breaker, alert_port=alerts)
+    accounting = AccountingSourceAdapter(client=FakeClient([_payload()]), circuit_breaker=breaker, alert_port=alerts)
+
+    with pytest.raises(RuntimeError):
+        ap_email.fetch_new_invoices()
+    with pytest.raises(RuntimeError):
+        accounting.fetch_new_invoices()
+
+    assert [(event.source, event.error_type) for event in alerts.events] == [(IngestionSource.AP_EMAIL, "circuit_open")]
+
+
+class StreamingClient(FakeClient):
+    def iter_new_invoices(self):
+        yield from self._payloads
+
+
+class BrokenStreamClient:
+    def iter_new_invoices(self):
+        yield _payload()
+        raise ValueError("connection reset")
+
+
+def test_ap_email_adapter_streams_client_payloads_in_chunks() -> None:
+    adapter = ApEmailAdapter(client=StreamingClient([_payload()] * 5))
+
+    chunks = list(adapter.fetch_invoice_chunks(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_accounting_source_adapter_chunks_only_through_the_streaming_client_call() -> None:
+    class StreamingOnlyClient(StreamingClient):
+        def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+            raise AssertionError("chunking must not materialize the feed")
+
+    adapter = AccountingSourceAdapter(client=StreamingOnlyClient([_payload()] * 3))
+
+    chunks = list(adapter.fetch_invoice_chunks(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    with pytest.raises(AttributeError):
+        AccountingSourceAdapter(client=FakeClient([_payload()])).fetch_invoice_chunks(chunk_size=2)
+
+
+def test_ap_email_adapter_wraps_mid_stream_client_failures() -> None:
+    adapter = ApEmailAdapter(client=BrokenStreamClient())
+    chunks = adapter.fetch_invoice_chunks(chunk_size=1)
+
+    assert len(next(chunks)) == 1
+    with pytest.raises(RuntimeError, match="AP email source fetch failed"):
+        next(chunks)
+
+
+class ChangeFeedClient(FlakyClient):
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ValueError("upstream timeout")
+        return SourceChangeBatch(payloads=[_payload()][:limit], watermark=f"{watermark or 0}+1")
+
+
+def test_accounting_source_adapter_retries_change_feed_pages() -> None:
+    client = ChangeFeedClient(failures=1)
+    adapter = AccountingSourceAdapter(client=client, retry_policy=RetryPolicy(max_attempts=2, jitter=lambda: 0.0))
+
+    batch = adapter.fetch_changes_since("41", limit=10)
+
+    assert (len(batch.payloads), batch.watermark, batch.has_more, client.calls) == (1, "41+1", False, 2)
+    with pytest.raises(RuntimeError, match="Accounting source fetch failed"):
+        AccountingSourceAdapter(client=ChangeFeedClient(failures=1)).fetch_changes_since(None, limit=10)
+
+
+class DeadlineAwareClient:
+    def __init__(self) -> None:
+        self.timeouts: list[Optional[float]] = []
+
+    def iter_new_invoices(self, timeout: Optional[float] = None):
+        self.timeouts.append(timeout)
+        raise TimeoutError("mailbox did not answer in time")
+
+    def fetch_new_invoices(self, timeout: Optional[float] = None):
+        return self.iter_new_invoices(timeout=timeout)
+
+
+def test_source_adapter_hands_the_remaining_budget_to_the_client_and_reports_timeouts() -> None:
+    client = DeadlineAwareClient()
+    adapter = ApEmailAdapter(client=client)
+
+    with pytest.raises(SourceTimeoutError, match="AP email source fetch timed out"):
+        next(adapter.fetch_invoice_chunks(chunk_size=10, timeout=30.0))
+
+    with pytest.raises(SourceTimeoutError, match="Accounting source fetch timed out"):
+        AccountingSourceAdapter(client=client).fetch_new_invoices(timeout=20.0)
+
+    assert len(client.timeouts) == 2 and 0 < client.timeouts[0] <= 30.0 and 0 < client.timeouts[1] <= 20.0
+    with pytest.raises(SourceTimeoutError):
+        next(AccountingSourceAdapter(client=StreamingClient([_payload()])).fetch_invoice_chunks(1, timeout=0.0))
+    with pytest.raises(SourceTimeoutError):
+        ApEmailAdapter(client=FakeClient([_payload()])).fetch_new_invoices(timeout=0.0)
+
+
+class SlowTimingOutClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def iter_new_invoices(self, timeout: Optional[float] = None):
+        self.calls += 1
+        time.sleep(timeout)
+        raise TimeoutError("mailbox did not answer in time")
+
+    def fetch_new_invoices(self, timeout: Optional[float] = None):
+        return self.iter_new_invoices(timeout=timeout)
+
+
+def test_fetch_does_not_retry_or_count_an_exhausted_deadline() -> None:
+    client = SlowTimingOutClient()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    adapter = AccountingSourceAdapter(
+        client=client,
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=1.0, jitter=lambda: 1.0),
+    )
+
+    with pytest.raises(SourceTimeoutError, match="Accounting source fetch timed out"):
+        adapter.fetch_new_invoices(timeout=0.04)
+
+    assert client.calls == 1
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_chunked_fetch_does_not_retry_or_count_an_exhausted_deadline() -> None:
+    client = SlowTimingOutClient()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    adapter = ApEmailAdapter(
+        client=client,
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=1.0, jitter=lambda: 1.0),
+    )
+
+    with pytest.raises(SourceTimeoutError):
+        next(adapter.fetch_invoice_chunks(chunk_size=10, timeout=0.04))
+
+    # Only the client's own timeout counted: one more failure still leaves the circuit closed.
+    assert client.calls == 1
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+class AsyncFakeClient:
+    def __init__(self, payloads: list[SourceInvoicePayload]) -> None:
+        self._payloads = payloads
+
+    async def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+        return list(self._payloads)
+
+
+class AsyncFailingClient:
+    async def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+        raise ValueError("upstream failed")
+
+
+def test_async_ap_email_adapter_returns_client_payloads() -> None:
+    adapter = AsyncApEmailAdapter(client=AsyncFakeClient([_payload()]))
+
+    results = asyncio.run(adapter.fetch_new_invoices())
+
+    assert results[0].source_id == "source-1"
+
+
+def test_async_accounting_source_adapter_wraps_client_failures() -> None:
+    adapter = AsyncAccountingSourceAdapter(client=AsyncFailingClient())
+
+    with pytest.raises(RuntimeError, match="Accounting source fetch failed"):
+        asyncio.run(adapter.fetch_new_invoices())
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from adapters.sqlite_intake_repository_adapter import SqliteIntakeRepositoryAdapter
+from common.ingestion_types import (
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    IntakeCursor,
+    InvoiceMetadata,
+)
+
+
+def _invoice(invoice_number: str, source: IngestionSource, ingested_at: datetime) -> IngestedInvoice:
+    metadata = InvoiceMetadata(
+        invoice_number=invoice_number,
+        supplier="Northwind",
+        amount=55.0,
+        invoice_date=datetime(2026, 2, 9),
+    )
+    invoice = IngestedInvoice(dedupe_key=invoice_number.lower(), metadata=metadata, file_hash="hash-1")
+    invoice.record_event(source=source, ingested_at=ingested_at, status=f"ingested:{invoice_number}")
+    return invoice
+
+
+@pytest.fixture
+def repository(tmp_path: Path):
+    adapter = SqliteIntakeRepositoryAdapter(str(tmp_path / "intake.db"))
+    yield adapter
+    adapter.close()
+
+
+def test_sqlite_repository_round_trip_contract(repository: SqliteIntakeRepositoryAdapter) -> None:
+    invoice = _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0))
+
+    repository.save_new(invoice)
+    repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0), "duplicate_seen:acct-1")
+    saved = repository.find_by_dedupe_key("inv-1")
+
+    assert saved is not None
+    assert saved.metadata == invoice.metadata
+    assert saved.file_hash == "hash-1"
+    assert [(event.source, event.status) for event in saved.history] == [
+        (IngestionSource.AP_EMAIL, "ingested:INV-1"),
+        (IngestionSource.ACCOUNTING_SYSTEM, "duplicate_seen:acct-1"),
+    ]
+    assert repository.find_by_dedupe_key("missing") is None
+
+
+def test_sqlite_repository_lists_and_pages_by_latest_ingestion_contract(repository: SqliteIntakeRepositoryAdapter) -> None:
+    repository.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)),
+        _invoice("INV-2", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 10, 0, 0)),
+        _invoice("INV-3", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 11, 0, 0)),
+    ])
+    repository.append_history_many([
+        IngestionHistoryAppend("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, 12, 0, 0), "duplicate_seen:acct-9"),
+    ])
+
+    newest_first = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None)]
+    accounting = [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.ACCOUNTING_SYSTEM)]
+    first_page = repository.list_by_source_sorted(None, newest_first=False, limit=2)
+    second_page = repository.list_by_source_sorted(
+        None,
+        newest_first=False,
+        limit=2,
+        after=IntakeCursor(ingested_at=first_page[-1].latest_ingested_at, dedupe_key=first_page[-1].dedupe_key),
+    )
+    assert newest_first == ["inv-1", "inv-3", "inv-2"]
+    assert accounting == ["inv-1", "inv-2"]
+    assert [invoice.dedupe_key for invoice in first_page] == ["inv-2", "inv-3"]
+    assert [invoice.dedupe_key for invoice in second_page] == ["inv-1"]
+
+
+def test_sqlite_repository_save_new_or_append_history_contract(repository: SqliteIntakeRepositoryAdapter) -> None:
+    def _candidate(source: IngestionSource, source_id: str, ingested_at: datetime) -> IngestionCandidate:
+        return IngestionCandidate(
+            invoice=_invoice("INV-1", source, ingested_at),
+            duplicate_events=[IngestionHistoryAppend("inv-1", source, ingested_at, f"duplicate_seen:{source_id}")],
+        )
+
+    results = repository.save_new_or_append_history_many([
+        _candidate(IngestionSource.AP_EMAIL, "mail-1", datetime(2026, 2, 9, 9, 0, 0)),
+        _candidate(IngestionSource.ACCOUNTING_SYSTEM, "acct-1", datetime(2026, 2, 9, 10, 0, 0)),
+    ])
+
+    assert [is_new for _, is_new in results] == [True, False]
+    assert [event.status for event in results[1][0].history] == ["ingested:INV-1", "duplicate_seen:acct-1"]
+    assert len(repository.find_many_by_dedupe_keys(["inv-1", "inv-2"])) == 1
+
+
+def test_sqlite_repository_survives_reopen(tmp_path: Path) -> None:
+    database_path = str(tmp_path / "durable.db")
+    first = SqliteIntakeRepositoryAdapter(database_path)
+    first.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)))
+    first.close()
+
+    reopened = SqliteIntakeRepositoryAdapter(database_path)
+    listed = reopened.list_by_source_sorted(IngestionSource.AP_EMAIL)
+    reopened.close()
+
+    assert [invoice.dedupe_key for invoice in listed] == ["inv-1"]
+
+
+def test_sqlite_repository_compacts_repeated_duplicate_sightings(tmp_path: Path) -> None:
+    repository = SqliteIntakeRepositoryAdapter(str(tmp_path / "compact.db"), compact_duplicates=True)
+    repository.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2026, 2, 9, 9, 0, 0)))
+
+    repository.append_history_many([
+        IngestionHistoryAppend("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9, hour, 0, 0), "duplicate_seen:acct-1")
+        for hour in (11, 10, 12)
+    ])
+    history = repository.find_by_dedupe_key("inv-1").history
+    repository.close()
+
+    assert [(event.status, event.seen_count) for event in history] == [("ingested:INV-1", 1), ("duplicate_seen:acct-1", 3)]
+    assert (history[1].first_seen_at, history[1].ingested_at) == (datetime(2026, 2, 9, 10, 0, 0), datetime(2026, 2, 9, 12, 0, 0))
+
+
+def test_sqlite_repository_purges_expired_month_partitions(
+    tmp_path: Path,
+    repository: SqliteIntakeRepositoryAdapter,
+) -> None:
+    repository.save_many([
+        _invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2024, 1, 10)),
+        _invoice("INV-2", IngestionSource.AP_EMAIL, datetime(2024, 2, 10)),
+        _invoice("INV-3", IngestionSource.AP_EMAIL, datetime(2024, 3, 10)),
+    ])
+    repository.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2024, 3, 1), "duplicate_seen:acct-1")
+
+    result = repository.purge_history_before(datetime(2024, 3, 5))
+
+    assert result.dropped_partitions == ("2024-01", "2024-02")
+    assert (result.purged_events, result.purged_invoices, result.newest_purged_at) == (2, 1, datetime(2024, 2, 10))
+    assert result.oldest_retained_at == datetime(2024, 3, 1)
+    with sqlite3.connect(str(tmp_path / "intake.db")) as connection:
+        tables = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'history_2%' ORDER BY name")]
+    assert tables == ["history_2024_03"]
+    assert repository.find_by_dedupe_key("inv-2") is None
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(IngestionSource.AP_EMAIL)] == ["inv-3"]
+    assert [invoice.dedupe_key for invoice in repository.list_by_source_sorted(None)] == ["inv-3", "inv-1"]
+
+
+def test_sqlite_repository_change_version_moves_on_every_write(tmp_path: Path) -> None:
+    first = SqliteIntakeRepositoryAdapter(str(tmp_path / "intake.db"))
+    versions = [first.change_version()]
+    first.save_new(_invoice("INV-1", IngestionSource.AP_EMAIL, datetime(2024, 1, 9)))
+    versions.append(first.change_version())
+    first.append_history("inv-1", IngestionSource.ACCOUNTING_SYSTEM, datetime(2026, 2, 9), "duplicate_seen:acct-1")
+    versions.append(first.change_version())
+    first.purge_history_before(datetime(2026, 3, 1))
+    first.purge_history_before(datetime(2026, 3, 1))
+    versions.append(first.change_version())
+    first.close()
+
+    reopened = SqliteIntakeRepositoryAdapter(str(tmp_path / "intake.db"))
+
+    assert versions == [0, 1, 2, 3]
+    assert reopened.change_version() == 3
+    reopened.close()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from adapters.in_memory_sync_watermark_adapter import InMemorySyncWatermarkAdapter
+from adapters.json_file_sync_watermark_adapter import JsonFileSyncWatermarkAdapter
+from common.ingestion_types import IngestionSource
+
+
+def test_in_memory_watermarks_are_kept_per_source() -> None:
+    watermarks = InMemorySyncWatermarkAdapter()
+
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) is None
+    watermarks.save(IngestionSource.ACCOUNTING_SYSTEM, "2026-02-19T14:00:00|seq-41")
+
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) == "2026-02-19T14:00:00|seq-41"
+    assert watermarks.load(IngestionSource.AP_EMAIL) is None
+
+
+def test_json_file_watermarks_survive_a_restart(tmp_path: Path) -> None:
+    path = tmp_path / "sync" / "watermarks.json"
+    watermarks = JsonFileSyncWatermarkAdapter(str(path))
+
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) is None
+    watermarks.save(IngestionSource.ACCOUNTING_SYSTEM, "41")
+    watermarks.save(IngestionSource.AP_EMAIL, "7")
+    watermarks.save(IngestionSource.ACCOUNTING_SYSTEM, "42")
+    reopened = JsonFileSyncWatermarkAdapter(str(path))
+
+    assert reopened.load(IngestionSource.ACCOUNTING_SYSTEM) == "42"
+    assert reopened.load(IngestionSource.AP_EMAIL) == "7"
+    assert [entry.name for entry in path.parent.iterdir()] == ["watermarks.json"]
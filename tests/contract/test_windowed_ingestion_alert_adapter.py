@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from adapters.windowed_ingestion_alert_adapter import WindowedIngestionAlertAdapter
+from common.ingestion_types import IngestionSource
+from common.source_resilience import CircuitState
+
+
+def test_windowed_alert_adapter_keeps_only_the_newest_failures() -> None:
+    adapter = WindowedIngestionAlertAdapter(capacity=3)
+    start = datetime(2026, 2, 11, 14, 0, 0)
+    for minute in range(5):
+        adapter.notify_failure(IngestionSource.AP_EMAIL, "fetch_failed", start + timedelta(minutes=minute))
+
+    def minutes(events) -> list[int]:
+        return [int((event.occurred_at - start).total_seconds() // 60) for event in events]
+
+    assert minutes(adapter.list_failures()) == [2, 3, 4]
+    assert minutes(adapter.list_failures(since=start + timedelta(minutes=3))) == [3, 4]
+    assert minutes(adapter.list_failures(limit=1)) == [4]
+
+
+def test_windowed_alert_adapter_counts_failures_per_source_and_error_over_sliding_windows() -> None:
+    adapter = WindowedIngestionAlertAdapter()
+    start = datetime(2026, 2, 11, 14, 0, 0)
+    for minute in range(0, 120, 2):
+        adapter.notify_failure(IngestionSource.AP_EMAIL, "fetch_failed", start + timedelta(minutes=minute))
+    adapter.notify_failure(IngestionSource.ACCOUNTING_SYSTEM, "upstream_error", start)
+
+    now = start + timedelta(minutes=119)
+    summaries = {(summary.source, summary.error_type): summary for summary in adapter.summarize_failures(now)}
+    later = {
+        (summary.source, summary.error_type): summary.window_counts
+        for summary in adapter.summarize_failures(start + timedelta(hours=26))
+    }
+
+    ap_email = summaries[(IngestionSource.AP_EMAIL, "fetch_failed")]
+    assert ap_email.window_counts == {"5m": 2, "1h": 30, "24h": 60}
+    assert ap_email.last_occurred_at == start + timedelta(minutes=118)
+    assert summaries[(IngestionSource.ACCOUNTING_SYSTEM, "upstream_error")].window_counts == {"5m": 0, "1h": 0, "24h": 1}
+    assert later[(IngestionSource.AP_EMAIL, "fetch_failed")] == {"5m": 0, "1h": 0, "24h": 0}
+
+
+def test_windowed_alert_adapter_reads_do_not_expire_counts_or_assume_ordered_events() -> None:
+    adapter = WindowedIngestionAlertAdapter()
+    start = datetime(2026, 2, 11, 14, 0, 0)
+    adapter.notify_failure(IngestionSource.AP_EMAIL, "fetch_failed", start + timedelta(minutes=10))
+    adapter.notify_failure(IngestionSource.AP_EMAIL, "fetch_failed", start)
+
+    adapter.summarize_failures(start + timedelta(days=2))
+    adapter.notify_failure(IngestionSource.AP_EMAIL, "fetch_failed", start + timedelta(minutes=11))
+    (summary,) = adapter.summarize_failures(start + timedelta(minutes=12))
+
+    assert summary.window_counts == {"5m": 2, "1h": 3, "24h": 3}
+    assert [event.occurred_at for event in adapter.list_failures(since=start + timedelta(minutes=5))] == [
+        start + timedelta(minutes=10), start + timedelta(minutes=11)]
+    assert [event.occurred_at for event in adapter.list_failures(limit=2)] == [
+        start + timedelta(minutes=10), start + timedelta(minutes=11)]
+    assert len(adapter.list_failures(since=start - timedelta(minutes=1))) == 3
+
+
+def test_windowed_alert_adapter_keeps_the_latest_circuit_state_per_source_apart_from_failures() -> None:
+    adapter = WindowedIngestionAlertAdapter()
+    start = datetime(2026, 2, 11, 14, 0, 0)
+    adapter.notify_circuit_state(IngestionSource.AP_EMAIL, CircuitState.OPEN, CircuitState.HALF_OPEN, start)
+    adapter.notify_circuit_state(
+        IngestionSource.AP_EMAIL, CircuitState.HALF_OPEN, CircuitState.CLOSED, start + timedelta(seconds=1))
+    adapter.notify_circuit_state(IngestionSource.AP_EMAIL, CircuitState.CLOSED, CircuitState.OPEN, start)
+
+    assert [(state.source, state.current) for state in adapter.list_circuit_states()] == [
+        (IngestionSource.AP_EMAIL, CircuitState.CLOSED)]
+    assert adapter.list_failures() == []
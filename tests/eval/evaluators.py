@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 
 
@@ -39,6 +40,18 @@ def throughput_compliance_rate(signal: Any) -> float:
 
 
 def retention_policy_compliance(signal: Any) -> float:
+    # Compliant when the purge left no event older than its cutoff and the cutoff keeps the required window.
+    if isinstance(signal, dict):
+        required_since = signal.get("required_since")
+        cutoff = signal.get("cutoff")
+        if not required_since or not cutoff:
+            return 0.0
+        if datetime.fromisoformat(cutoff) > datetime.fromisoformat(required_since):
+            return 0.0
+        oldest_retained_at = signal.get("oldest_retained_at")
+        if oldest_retained_at is None:
+            return 1.0
+        return 1.0 if datetime.fromisoformat(oldest_retained_at) >= datetime.fromisoformat(cutoff) else 0.0
     return float(signal)
 
 
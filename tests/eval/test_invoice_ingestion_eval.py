@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from datetime import datetime
 from importlib import import_module
 from pathlib import Path
 from typing import Any
 
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from common.ingestion_types import IngestionSource, InvoiceMetadata
+from services.invoice_ingestion_service import InvoiceIngestionService
 from tests.eval.evaluators import get_evaluator_registry
 
 
@@ -13,6 +18,30 @@ def _load_eval_criteria() -> dict[str, Any]:
     return yaml.safe_load(file_path.read_text(encoding="utf-8"))
 
 
+def _history_retention_signal() -> dict[str, Any]:
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+    )
+    for months_ago in range(36):
+        year, month = divmod(2026 * 12 + 1 - months_ago, 12)
+        service.ingest_ap_email_invoice(
+            source_id=f"mail-{months_ago}",
+            metadata=InvoiceMetadata(
+                invoice_number=f"INV-{months_ago}",
+                supplier="Contoso",
+                amount=100.0,
+                invoice_date=datetime(year, month + 1, 15),
+            ),
+            file_hash=None,
+            processed_at=datetime(year, month + 1, 15),
+        )
+    report = service.enforce_history_retention(now=datetime(2026, 2, 19))
+    assert report.purge.purged_events > 0
+    assert len(service.list_for_analyst(source=IngestionSource.AP_EMAIL)) == 36 - report.purge.purged_invoices
+    return report.compliance_signal
+
+
 def _signals() -> dict[str, Any]:
     return {
         "scenario_ap_email_ingest": {"passed": 1, "total": 1},
@@ -31,7 +60,7 @@ def _signals() -> dict[str, Any]:
                 "error_type": "upstream_error"},
         ],
         "nfr_throughput_100_per_day": 1.0,
-        "nfr_history_retention_24m": 1.0,
+        "nfr_history_retention_24m": _history_retention_signal(),
     }
 
 
@@ -76,3 +105,12 @@ def test_eval_criteria_all_pass_against_deterministic_signals() -> None:
 
     assert not failures, "Deterministic evaluation failures:\n" + \
         "\n".join(failures)
+
+
+def test_retention_evaluator_fails_when_an_event_older_than_the_cutoff_is_left() -> None:
+    evaluate = get_evaluator_registry()["retention_policy_compliance"]
+    signal = _history_retention_signal()
+
+    assert evaluate(signal) == 1.0
+    assert evaluate({**signal, "oldest_retained_at": "2024-01-31T23:59:59"}) == 0.0
+    assert evaluate({**signal, "cutoff": "2024-03-01T00:00:00"}) == 0.0
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.in_memory_processed_source_id_index_adapter import InMemoryProcessedSourceIdIndexAdapter
+from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from common.ingestion_types import IngestionSource, InvoiceMetadata, SourceInvoicePayload
+from ports.outbound.async_accounting_source_port import AsyncAccountingSourcePort
+from ports.outbound.async_ap_email_source_port import AsyncApEmailSourcePort
+from services.async_invoice_ingestion_service import AsyncInvoiceIngestionService
+from services.invoice_ingestion_service import InvoiceIngestionService
+
+
+class SlowApEmailSource(AsyncApEmailSourcePort):
+    def __init__(self, payloads: list[SourceInvoicePayload], events: list[str]) -> None:
+        self._payloads = payloads
+        self._events = events
+
+    async def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+        self._events.append("ap_email:start")
+        await asyncio.sleep(0.01)
+        self._events.append("ap_email:end")
+        return list(self._payloads)
+
+
+class SlowAccountingSource(AsyncAccountingSourcePort):
+    def __init__(self, payloads: list[SourceInvoicePayload], events: list[str]) -> None:
+        self._payloads = payloads
+        self._events = events
+
+    async def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+        self._events.append("accounting:start")
+        await asyncio.sleep(0.01)
+        self._events.append("accounting:end")
+        return list(self._payloads)
+
+
+class FailingAccountingSource(AsyncAccountingSourcePort):
+    async def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+        raise RuntimeError("upstream unavailable")
+
+
+def _payload(source_id: str) -> SourceInvoicePayload:
+    return SourceInvoicePayload(
+        source_id=source_id,
+        metadata=InvoiceMetadata(
+            invoice_number="INV-800",
+            supplier="Fabrikam",
+            amount=100.0,
+            invoice_date=datetime(2026, 2, 10),
+        ),
+        file_hash=None,
+        received_at=datetime(2026, 2, 19, 9, 0, 0),
+    )
+
+
+def test_async_service_overlaps_fetches_and_dedupes_cross_source() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    events: list[str] = []
+    service = AsyncInvoiceIngestionService(
+        ingestion=InvoiceIngestionService(intake_repository=repository, alert_port=NoopIngestionAlertAdapter()),
+        ap_email_source=SlowApEmailSource([_payload("mail-1")], events),
+        accounting_source=SlowAccountingSource([_payload("acct-1")], events),
+    )
+
+    results = asyncio.run(service.process_all_sources(processed_at=datetime(2026, 2, 19, 10, 0, 0)))
+
+    assert events[:2] == ["ap_email:start", "accounting:start"]
+    assert len(repository.list_by_source_sorted(source=None)) == 1
+    invoice = results[IngestionSource.ACCOUNTING_SYSTEM][0]
+    assert {event.source for event in invoice.history} == {
+        IngestionSource.AP_EMAIL, IngestionSource.ACCOUNTING_SYSTEM}
+
+
+def test_async_service_records_alert_when_source_fails() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    service = AsyncInvoiceIngestionService(
+        ingestion=InvoiceIngestionService(intake_repository=InMemoryIntakeRepositoryAdapter(), alert_port=alerts),
+        accounting_source=FailingAccountingSource(),
+    )
+
+    results = asyncio.run(service.process_accounting_sync(processed_at=datetime(2026, 2, 19, 10, 0, 0)))
+
+    assert results == []
+    assert alerts.events[0].source == IngestionSource.ACCOUNTING_SYSTEM
+    assert alerts.events[0].error_type == "fetch_failed"
+
+
+def test_async_single_ingestion_matches_sync_history_semantics() -> None:
+    service = AsyncInvoiceIngestionService(
+        ingestion=InvoiceIngestionService(
+            intake_repository=InMemoryIntakeRepositoryAdapter(), alert_port=NoopIngestionAlertAdapter()),
+    )
+    payload = _payload("mail-1")
+
+    async def _run():
+        await service.ingest_ap_email_invoice(
+            source_id="mail-1", metadata=payload.metadata, file_hash=None,
+            processed_at=datetime(2026, 2, 19, 10, 0, 0))
+        return await service.ingest_ap_email_invoice(
+            source_id="mail-2", metadata=payload.metadata, file_hash=None,
+            processed_at=datetime(2026, 2, 19, 11, 0, 0))
+
+    invoice = asyncio.run(_run())
+
+    assert [event.status for event in invoice.history] == [
+        "ingested:mail-1", "duplicate_seen:mail-2"]
+
+
+def test_async_service_skips_redelivered_source_ids_like_the_sync_service() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    events: list[str] = []
+    service = AsyncInvoiceIngestionService(
+        ingestion=InvoiceIngestionService(
+            intake_repository=repository,
+            alert_port=NoopIngestionAlertAdapter(),
+            processed_source_ids=InMemoryProcessedSourceIdIndexAdapter(),
+        ),
+        ap_email_source=SlowApEmailSource([_payload("mail-1")], events),
+    )
+
+    async def _run():
+        await service.process_ap_email_inbox(processed_at=datetime(2026, 2, 19, 10, 0, 0))
+        return await service.process_ap_email_inbox(processed_at=datetime(2026, 2, 19, 11, 0, 0))
+
+    redelivered = asyncio.run(_run())
+
+    assert len(redelivered) == 1
+    stored = repository.find_by_dedupe_key(redelivered[0].dedupe_key)
+    assert [event.status for event in stored.history] == ["ingested:mail-1"]
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import hashlib
+import io
+
+from domain.attachment_digest import AttachmentDigest
+
+
+def test_attachment_digest_matches_sha256_for_buffers_and_streams() -> None:
+    content = bytes(range(256)) * 41
+    expected = hashlib.sha256(content).hexdigest()
+    stream = io.BytesIO(b"header" + content)
+    stream.seek(6)
+
+    assert AttachmentDigest.compute(content, chunk_size=1000) == expected
+    assert AttachmentDigest.compute(memoryview(bytearray(content)), chunk_size=1000) == expected
+    assert AttachmentDigest.compute(stream, chunk_size=1000) == expected
+    assert stream.tell() == 6
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from domain.history_retention_policy import HistoryRetentionPolicy
+
+
+def test_required_since_steps_back_whole_calendar_months() -> None:
+    assert HistoryRetentionPolicy.required_since(datetime(2026, 2, 19, 8, 30)) == datetime(2024, 2, 19, 8, 30)
+    assert HistoryRetentionPolicy.required_since(datetime(2026, 1, 31), retention_months=1) == datetime(2025, 12, 31)
+    assert HistoryRetentionPolicy.required_since(datetime(2026, 3, 31), retention_months=1) == datetime(2026, 2, 28)
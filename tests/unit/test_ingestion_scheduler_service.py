@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence
+
+from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
+from common.ingestion_types import IngestionSource, InvoiceMetadata, SourceChangeBatch, SourceInvoicePayload
+from common.source_resilience import SourceTimeoutError
+from ports.outbound.accounting_source_port import AccountingSourcePort
+from ports.outbound.ap_email_source_port import ApEmailSourcePort
+from services.ingestion_scheduler_service import IngestionSchedulerService
+from services.invoice_ingestion_service import InvoiceIngestionService
+
+
+def _payload(source_id: str, invoice_number: str) -> SourceInvoicePayload:
+    return SourceInvoicePayload(
+        source_id=source_id,
+        metadata=InvoiceMetadata(
+            invoice_number=invoice_number,
+            supplier="Fabrikam",
+            amount=100.0,
+            invoice_date=datetime(2026, 2, 10),
+        ),
+        file_hash=None,
+        received_at=datetime(2026, 2, 19, 9, 0, 0),
+    )
+
+
+class BlockingApEmailSource(ApEmailSourcePort):
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
+        return []
+
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        self.started.set()
+        self.release.wait(timeout=5)
+        yield [_payload("mail-1", "INV-900")]
+
+
+class HungApEmailSource(BlockingApEmailSource):
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        self.started.set()
+        if not self.release.wait(timeout=timeout):
+            raise SourceTimeoutError("AP email source fetch timed out")
+        yield [_payload("mail-1", "INV-900")]
+
+
+class BrokenApEmailSource(BlockingApEmailSource):
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        raise KeyError("unexpected payload shape")
+
+
+class StaticAccountingSource(AccountingSourcePort):
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
+        return []
+
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        yield [_payload("acct-1", "INV-901")]
+
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+        return SourceChangeBatch(payloads=[], watermark=watermark)
+
+
+class ManualClock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _scheduler(
+    ap_source: ApEmailSourcePort,
+    clock: ManualClock,
+    run_budget: timedelta = timedelta(minutes=10),
+    alerts: Optional[NoopIngestionAlertAdapter] = None,
+) -> IngestionSchedulerService:
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts or NoopIngestionAlertAdapter(),
+        ap_email_source=ap_source,
+        accounting_source=StaticAccountingSource(),
+    )
+    return IngestionSchedulerService(
+        ingestion=service,
+        intervals={
+            IngestionSource.AP_EMAIL: timedelta(minutes=5),
+            IngestionSource.ACCOUNTING_SYSTEM: timedelta(minutes=10),
+        },
+        run_budget=run_budget,
+        clock=clock,
+    )
+
+
+def test_scheduler_runs_each_source_on_its_own_interval() -> None:
+    ap_source = BlockingApEmailSource()
+    ap_source.release.set()
+    clock = ManualClock(datetime(2026, 2, 19, 9, 0, 0))
+    scheduler = _scheduler(ap_source, clock)
+
+    first = scheduler.tick()
+    scheduler.wait_for_idle(timeout=5)
+    clock.now += timedelta(minutes=5)
+    second = scheduler.tick()
+    scheduler.wait_for_idle(timeout=5)
+    scheduler.stop()
+
+    assert set(first) == {IngestionSource.AP_EMAIL, IngestionSource.ACCOUNTING_SYSTEM}
+    assert second == [IngestionSource.AP_EMAIL]
+    records = scheduler.list_run_records()
+    assert len(records) == 3
+    assert all(record.duration_seconds >= 0 for record in records)
+    assert all(record.summary is not None and record.summary.new_count == 1
+               for record in records if record.source == IngestionSource.ACCOUNTING_SYSTEM)
+
+
+def test_scheduler_skips_tick_while_previous_run_is_in_flight() -> None:
+    ap_source = BlockingApEmailSource()
+    clock = ManualClock(datetime(2026, 2, 19, 9, 0, 0))
+    scheduler = _scheduler(ap_source, clock)
+
+    scheduler.tick()
+    assert ap_source.started.wait(timeout=5)
+    clock.now += timedelta(minutes=5)
+    launched = scheduler.tick()
+    ap_source.release.set()
+    scheduler.wait_for_idle(timeout=5)
+    scheduler.stop()
+
+    assert launched == []
+    assert scheduler.skipped_ticks(IngestionSource.AP_EMAIL) == 1
+
+
+def test_scheduler_run_ends_when_a_hung_fetch_exceeds_the_budget() -> None:
+    ap_source = HungApEmailSource()
+    clock = ManualClock(datetime(2026, 2, 19, 9, 0, 0))
+    scheduler = _scheduler(ap_source, clock, run_budget=timedelta(milliseconds=50))
+
+    scheduler.tick()
+    scheduler.wait_for_idle(timeout=5)
+    clock.now += timedelta(minutes=5)
+    launched = scheduler.tick()
+    scheduler.wait_for_idle(timeout=5)
+    scheduler.stop()
+
+    assert launched == [IngestionSource.AP_EMAIL]
+    assert scheduler.skipped_ticks(IngestionSource.AP_EMAIL) == 0
+    ap_runs = [record for record in scheduler.list_run_records() if record.source == IngestionSource.AP_EMAIL]
+    assert [record.summary.budget_exceeded for record in ap_runs] == [True, True]
+
+
+def test_scheduler_alerts_when_a_run_raises() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    clock = ManualClock(datetime(2026, 2, 19, 9, 0, 0))
+    scheduler = _scheduler(BrokenApEmailSource(), clock, alerts=alerts)
+
+    scheduler.tick()
+    scheduler.wait_for_idle(timeout=5)
+    scheduler.stop()
+
+    ap_runs = [record for record in scheduler.list_run_records() if record.source == IngestionSource.AP_EMAIL]
+    assert [record.summary for record in ap_runs] == [None]
+    assert [(event.source, event.error_type, event.occurred_at) for event in alerts.events] == [
+        (IngestionSource.AP_EMAIL, "scheduled_run_failed", datetime(2026, 2, 19, 9, 0, 0))]
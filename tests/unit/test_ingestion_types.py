@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from common.ingestion_types import IngestedInvoice, IngestionHistoryEntry, IngestionSource, InvoiceMetadata
+
+
+def test_history_entry_splits_status_into_interned_kind_and_source_id() -> None:
+    first = IngestionHistoryEntry(IngestionSource.AP_EMAIL, datetime(2026, 2, 1), "duplicate_seen:mail-1")
+    second = IngestionHistoryEntry(IngestionSource.AP_EMAIL, datetime(2026, 2, 1), "".join(["duplicate", "_seen:mail-2"]))
+
+    assert (first.kind, first.source_id, first.status) == ("duplicate_seen", "mail-1", "duplicate_seen:mail-1")
+    assert first.kind is second.kind
+    assert IngestionHistoryEntry(IngestionSource.AP_EMAIL, datetime(2026, 2, 1), "ingested").status == "ingested"
+    assert first == IngestionHistoryEntry(IngestionSource.AP_EMAIL, datetime(2026, 2, 1), "duplicate_seen:mail-1")
+
+
+def test_intake_domain_objects_are_slotted() -> None:
+    metadata = InvoiceMetadata(invoice_number="INV-1", supplier="Contoso", amount=1.0, invoice_date=datetime(2026, 2, 1))
+    invoice = IngestedInvoice(dedupe_key="inv-1", metadata=metadata, file_hash=None)
+    invoice.record_event(source=IngestionSource.AP_EMAIL, ingested_at=datetime(2026, 2, 1), status="ingested:INV-1")
+
+    assert not any(hasattr(value, "__dict__") for value in (metadata, invoice, invoice.history[0]))
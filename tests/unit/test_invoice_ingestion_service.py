@@ -69,3 +69,26 @@ def test_service_records_failures_via_alert_port() -> None:
 
     assert len(alerts.events) == 1
     assert alerts.events[0].error_type == "integration_unavailable"
+
+
+def test_service_exports_intake_in_pages_within_time_range() -> None:
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(), alert_port=NoopIngestionAlertAdapter())
+    for hour in range(8):
+        ingest = service.ingest_ap_email_invoice if hour % 2 else service.ingest_accounting_invoice
+        ingest(
+            source_id=f"src-{hour}",
+            metadata=InvoiceMetadata(
+                invoice_number=f"INV-{hour}", supplier="Fabrikam", amount=100.0, invoice_date=datetime(2026, 2, 10)),
+            file_hash=None,
+            processed_at=datetime(2026, 2, 11, hour, 0, 0),
+        )
+
+    everything = service.export_intake(page_size=3)
+    ranged = service.export_intake(
+        ingested_from=datetime(2026, 2, 11, 2, 0, 0), ingested_to=datetime(2026, 2, 11, 6, 0, 0), page_size=2)
+    ap_email = service.export_intake(source=IngestionSource.AP_EMAIL, page_size=3)
+
+    assert [invoice.metadata.invoice_number for invoice in everything] == [f"INV-{hour}" for hour in range(8)]
+    assert [invoice.metadata.invoice_number for invoice in ranged] == ["INV-2", "INV-3", "INV-4", "INV-5"]
+    assert [invoice.metadata.invoice_number for invoice in ap_email] == ["INV-1", "INV-3", "INV-5", "INV-7"]
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import threading
+from dataclasses import replace
 from datetime import datetime
+from typing import Iterator, Optional, Sequence
 
+import pytest
 from adapters.in_memory_intake_repository_adapter import InMemoryIntakeRepositoryAdapter
+from adapters.in_memory_near_duplicate_index_adapter import InMemoryNearDuplicateIndexAdapter
 from adapters.noop_ingestion_alert_adapter import NoopIngestionAlertAdapter
-from common.ingestion_types import IngestionSource, InvoiceMetadata, SourceInvoicePayload
+from adapters.in_memory_processed_source_id_index_adapter import InMemoryProcessedSourceIdIndexAdapter
+from adapters.in_memory_sync_watermark_adapter import InMemorySyncWatermarkAdapter
+from common.ingestion_types import (
+    IngestedInvoice,
+    IngestionCandidate,
+    IngestionHistoryAppend,
+    IngestionSource,
+    InvoiceMetadata,
+    SourceChangeBatch,
+    SourceInvoicePayload,
+)
 from ports.outbound.accounting_source_port import AccountingSourcePort
 from ports.outbound.ap_email_source_port import ApEmailSourcePort
+from ports.outbound.ingestion_audit_log_port import IngestionAuditLogPort
 from services.invoice_ingestion_service import InvoiceIngestionService
 
 
@@ -14,27 +32,80 @@ class FakeApEmailSource(ApEmailSourcePort):
     def __init__(self, payloads: list[SourceInvoicePayload]) -> None:
         self._payloads = payloads
 
-    def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
         return list(self._payloads)
 
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        for start in range(0, len(self._payloads), chunk_size):
+            yield self._payloads[start:start + chunk_size]
+
 
 class FakeAccountingSource(AccountingSourcePort):
     def __init__(self, payloads: list[SourceInvoicePayload]) -> None:
         self._payloads = payloads
+        self.requested_watermarks: list[Optional[str]] = []
 
-    def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
         return list(self._payloads)
 
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        for start in range(0, len(self._payloads), chunk_size):
+            yield self._payloads[start:start + chunk_size]
+
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+        # The watermark is the position in the change log, as a sequence id would be.
+        self.requested_watermarks.append(watermark)
+        start = int(watermark) if watermark is not None else 0
+        page = self._payloads[start:start + limit]
+        return SourceChangeBatch(
+            payloads=page, watermark=str(start + len(page)), has_more=start + len(page) < len(self._payloads))
+
 
 class FailingApEmailSource(ApEmailSourcePort):
-    def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
+        raise RuntimeError("upstream unavailable")
+
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
         raise RuntimeError("upstream unavailable")
 
 
 class FailingAccountingSource(AccountingSourcePort):
-    def fetch_new_invoices(self) -> list[SourceInvoicePayload]:
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
         raise RuntimeError("upstream unavailable")
 
+    def fetch_invoice_chunks(
+        self,
+        chunk_size: int,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Sequence[SourceInvoicePayload]]:
+        raise RuntimeError("upstream unavailable")
+
+    def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+        raise RuntimeError("upstream unavailable")
+
+
+class FakeAuditLog(IngestionAuditLogPort):
+    def __init__(self) -> None:
+        self.events: list[IngestionHistoryAppend] = []
+
+    def record_events(self, events: Sequence[IngestionHistoryAppend]) -> None:
+        self.events.extend(events)
+
+    def list_events(self, dedupe_key: str) -> Sequence[IngestionHistoryAppend]:
+        return [event for event in self.events if event.dedupe_key == dedupe_key]
+
 
 def _metadata(invoice_number: str) -> InvoiceMetadata:
     return InvoiceMetadata(
@@ -130,3 +201,571 @@ def test_batch_processing_records_alert_when_accounting_source_fails() -> None:
     assert len(alerts.events) == 1
     assert alerts.events[0].source == IngestionSource.ACCOUNTING_SYSTEM
     assert alerts.events[0].error_type == "fetch_failed"
+
+
+def test_ingest_many_dedupes_within_batch_and_matches_one_by_one_results() -> None:
+    processed_at = datetime(2026, 2, 19, 12, 0, 0)
+    payloads = [
+        SourceInvoicePayload(source_id=f"mail-{index}", metadata=_metadata(number),
+                             file_hash=None, received_at=processed_at)
+        for index, number in enumerate(["INV-600", "INV-601", "INV-600", "INV-602", "INV-601"])
+    ]
+    seed = SourceInvoicePayload(source_id="acct-0", metadata=_metadata("INV-602"),
+                                file_hash=None, received_at=processed_at)
+
+    batch_repository = InMemoryIntakeRepositoryAdapter()
+    batch_service = InvoiceIngestionService(
+        intake_repository=batch_repository, alert_port=NoopIngestionAlertAdapter())
+    batch_service.ingest_many(
+        source=IngestionSource.ACCOUNTING_SYSTEM, payloads=[seed], processed_at=processed_at)
+    batch_results = batch_service.ingest_many(
+        source=IngestionSource.AP_EMAIL, payloads=payloads, processed_at=processed_at)
+
+    single_repository = InMemoryIntakeRepositoryAdapter()
+    single_service = InvoiceIngestionService(
+        intake_repository=single_repository, alert_port=NoopIngestionAlertAdapter())
+    single_service.ingest_accounting_invoice(
+        source_id=seed.source_id, metadata=seed.metadata, file_hash=None, processed_at=processed_at)
+    single_results = [
+        single_service.ingest_ap_email_invoice(
+            source_id=payload.source_id, metadata=payload.metadata,
+            file_hash=payload.file_hash, processed_at=processed_at)
+        for payload in payloads
+    ]
+
+    assert [invoice.dedupe_key for invoice in batch_results] == [
+        invoice.dedupe_key for invoice in single_results]
+    batch_history = [batch_repository.find_by_dedupe_key(invoice.dedupe_key).history for invoice in batch_results]
+    assert batch_history == [
+        single_repository.find_by_dedupe_key(invoice.dedupe_key).history for invoice in single_results]
+    assert len(batch_repository.list_by_source_sorted(source=None)) == 3
+    assert [event.status for event in batch_history[0]] == ["ingested:mail-0", "duplicate_seen:mail-2"]
+    assert [event.status for event in batch_history[3]] == ["ingested:acct-0", "duplicate_seen:mail-3"]
+
+
+def test_compacted_repository_keeps_raw_trail_in_audit_log() -> None:
+    audit_log = FakeAuditLog()
+    payload = SourceInvoicePayload(source_id="acct-1", metadata=_metadata("INV-700"),
+                                   file_hash=None, received_at=datetime(2026, 2, 19, 8, 0, 0))
+    repository = InMemoryIntakeRepositoryAdapter(compact_duplicates=True)
+    service = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        accounting_source=FakeAccountingSource([payload]),
+        audit_log=audit_log,
+    )
+
+    for hour in (8, 9, 10):
+        invoices = service.process_accounting_sync(datetime(2026, 2, 19, hour, 0, 0))
+    service.ingest_ap_email_invoice(
+        source_id="mail-1", metadata=payload.metadata, file_hash=None, processed_at=datetime(2026, 2, 19, 11, 0, 0))
+
+    stored = repository.find_by_dedupe_key(invoices[0].dedupe_key)
+    assert [(event.status, event.seen_count) for event in stored.history] == [
+        ("ingested:acct-1", 1), ("duplicate_seen:acct-1", 2), ("duplicate_seen:mail-1", 1)]
+    assert [event.status for event in audit_log.list_events(invoices[0].dedupe_key)] == [
+        "ingested:acct-1", "duplicate_seen:acct-1", "duplicate_seen:acct-1", "duplicate_seen:mail-1"]
+
+
+def test_near_duplicates_are_flagged_on_the_matched_invoice() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        near_duplicate_index=InMemoryNearDuplicateIndexAdapter(),
+    )
+    processed_at = datetime(2026, 2, 19, 9, 0, 0)
+    original = service.ingest_accounting_invoice(
+        source_id="acct-1",
+        metadata=InvoiceMetadata(invoice_number="INV-001", supplier="Acme Ltd", amount=120.0, invoice_date=datetime(2026, 2, 10)),
+        file_hash=None,
+        processed_at=processed_at,
+    )
+
+    results = service.ingest_many(
+        source=IngestionSource.AP_EMAIL,
+        payloads=[
+            SourceInvoicePayload(
+                source_id=source_id,
+                metadata=InvoiceMetadata(invoice_number=number, supplier=supplier, amount=120.0, invoice_date=invoice_date),
+                file_hash=None,
+                received_at=processed_at,
+            )
+            for source_id, number, supplier, invoice_date in [
+                ("mail-1", "INV001", "ACME Limited", datetime(2026, 2, 11)),
+                ("mail-2", "INV-002", "Acme Ltd", datetime(2026, 2, 10)),
+                ("mail-3", "inv 002", "Acme", datetime(2026, 2, 9)),
+            ]
+        ],
+        processed_at=processed_at,
+    )
+
+    assert [invoice.dedupe_key for invoice in results] == [original.dedupe_key, results[1].dedupe_key, results[1].dedupe_key]
+    assert [event.status for event in results[0].history] == ["ingested:acct-1", "near_duplicate_seen:mail-1"]
+    assert [event.status for event in results[1].history] == ["ingested:mail-2", "near_duplicate_seen:mail-3"]
+    assert len(repository.list_by_source_sorted(source=None)) == 2
+
+
+def test_near_duplicate_index_is_seeded_from_invoices_already_in_the_repository() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    processed_at = datetime(2026, 2, 19, 9, 0, 0)
+    first_run = InvoiceIngestionService(intake_repository=repository, alert_port=NoopIngestionAlertAdapter())
+    original = first_run.ingest_accounting_invoice(
+        source_id="acct-1",
+        metadata=InvoiceMetadata(invoice_number="INV-001", supplier="Acme Ltd", amount=120.0, invoice_date=datetime(2026, 2, 10)),
+        file_hash=None,
+        processed_at=processed_at,
+    )
+    restarted = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        near_duplicate_index=InMemoryNearDuplicateIndexAdapter(),
+    )
+
+    flagged = restarted.ingest_ap_email_invoice(
+        source_id="mail-1",
+        metadata=InvoiceMetadata(invoice_number="INV001", supplier="ACME Limited", amount=120.0, invoice_date=datetime(2026, 2, 11)),
+        file_hash=None,
+        processed_at=processed_at,
+    )
+
+    assert flagged.dedupe_key == original.dedupe_key
+    assert [event.status for event in flagged.history] == ["ingested:acct-1", "near_duplicate_seen:mail-1"]
+
+
+def test_attachment_content_hashes_become_the_file_hash() -> None:
+    pdf = b"%PDF-1.7 " + bytes(range(256)) * 64
+    processed_at = datetime(2026, 2, 19, 9, 0, 0)
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        attachment_chunk_size=4096,
+    )
+
+    results = service.ingest_many(
+        source=IngestionSource.AP_EMAIL,
+        payloads=[
+            SourceInvoicePayload(source_id="mail-1", metadata=_metadata(""), file_hash="stale",
+                                 received_at=processed_at, attachment=pdf),
+            SourceInvoicePayload(source_id="mail-2", metadata=_metadata(""), file_hash=None,
+                                 received_at=processed_at, attachment=io.BytesIO(pdf)),
+            SourceInvoicePayload(source_id="mail-3", metadata=_metadata("INV-800"), file_hash=None,
+                                 received_at=processed_at),
+        ],
+        processed_at=processed_at,
+    )
+
+    digest = hashlib.sha256(pdf).hexdigest()
+    assert [invoice.file_hash for invoice in results] == [digest, digest, None]
+    assert results[0].dedupe_key == f"hash:{digest}"
+    assert [event.status for event in results[0].history] == ["ingested:mail-1", "duplicate_seen:mail-2"]
+
+
+def test_stream_ap_email_inbox_returns_summary_per_chunk() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    processed_at = datetime(2026, 2, 19, 13, 0, 0)
+    payloads = [
+        SourceInvoicePayload(source_id=f"mail-{index}", metadata=_metadata(f"INV-70{index % 4}"),
+                             file_hash=None, received_at=processed_at)
+        for index in range(7)
+    ]
+    service = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        ap_email_source=FakeApEmailSource(payloads),
+    )
+
+    summary = service.stream_ap_email_inbox(processed_at=processed_at, chunk_size=3)
+
+    assert summary.source == IngestionSource.AP_EMAIL
+    assert summary.new_count == 4
+    assert summary.duplicate_count == 3
+    assert len(summary.chunk_seconds) == 3
+    assert summary.failed is False
+    assert len(repository.list_by_source_sorted(source=None)) == 4
+
+
+def test_stream_accounting_sync_records_alert_when_fetch_fails() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts,
+        accounting_source=FailingAccountingSource(),
+    )
+
+    summary = service.stream_accounting_sync(
+        processed_at=datetime(2026, 2, 19, 13, 0, 0), chunk_size=10)
+
+    assert summary.failed is True
+    assert summary.new_count == 0
+    assert alerts.events[0].error_type == "fetch_failed"
+
+
+def test_stream_stops_after_chunk_when_time_budget_is_exceeded() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    processed_at = datetime(2026, 2, 19, 13, 0, 0)
+    payloads = [
+        SourceInvoicePayload(source_id=f"mail-{index}", metadata=_metadata(f"INV-75{index}"),
+                             file_hash=None, received_at=processed_at)
+        for index in range(4)
+    ]
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts,
+        ap_email_source=FakeApEmailSource(payloads),
+    )
+
+    summary = service.stream_ap_email_inbox(processed_at=processed_at, chunk_size=1, time_budget=0.0)
+
+    assert summary.budget_exceeded is True
+    assert summary.new_count == 1
+    assert alerts.events[0].error_type == "run_budget_exceeded"
+
+
+def test_accounting_sync_resumes_from_watermark_and_full_resync_rescans() -> None:
+    processed_at = datetime(2026, 2, 19, 14, 0, 0)
+    payloads = [
+        SourceInvoicePayload(source_id=f"acct-{index}", metadata=_metadata(f"INV-80{index}"),
+                             file_hash=None, received_at=processed_at)
+        for index in range(5)
+    ]
+    accounting_source = FakeAccountingSource(payloads)
+    watermarks = InMemorySyncWatermarkAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        accounting_source=accounting_source,
+        sync_watermarks=watermarks,
+    )
+
+    first = service.sync_accounting_changes(processed_at=processed_at, page_size=2)
+    idle = service.sync_accounting_changes(processed_at=processed_at, page_size=2)
+    payloads.append(SourceInvoicePayload(source_id="acct-5", metadata=_metadata("INV-805"),
+                                         file_hash=None, received_at=processed_at))
+    incremental = service.sync_accounting_changes(processed_at=processed_at, page_size=2)
+    accounting_source.requested_watermarks.clear()
+    resync = service.sync_accounting_changes(processed_at=processed_at, full_resync=True, page_size=2)
+
+    assert (first.new_count, len(first.chunk_seconds)) == (5, 3)
+    assert (idle.new_count, idle.duplicate_count) == (0, 0)
+    assert (incremental.new_count, incremental.duplicate_count) == (1, 0)
+    assert (resync.new_count, resync.duplicate_count) == (0, 6)
+    assert accounting_source.requested_watermarks == [None, "2", "4"]
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) == "6"
+
+
+def test_accounting_sync_keeps_watermark_when_batch_is_not_persisted() -> None:
+    class FailingSecondSave(InMemoryIntakeRepositoryAdapter):
+        saves = 0
+
+        def save_new_or_append_history_many(
+            self, candidates: Sequence[IngestionCandidate]) -> Sequence[tuple[IngestedInvoice, bool]]:
+            self.saves += 1
+            if self.saves == 2:
+                raise OSError("disk full")
+            return super().save_new_or_append_history_many(candidates)
+
+    processed_at = datetime(2026, 2, 19, 14, 0, 0)
+    payloads = [
+        SourceInvoicePayload(source_id=f"acct-{index}", metadata=_metadata(f"INV-81{index}"),
+                             file_hash=None, received_at=processed_at)
+        for index in range(4)
+    ]
+    accounting_source = FakeAccountingSource(payloads)
+    watermarks = InMemorySyncWatermarkAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=FailingSecondSave(),
+        alert_port=NoopIngestionAlertAdapter(),
+        accounting_source=accounting_source,
+        sync_watermarks=watermarks,
+    )
+
+    with pytest.raises(OSError):
+        service.sync_accounting_changes(processed_at=processed_at, page_size=2)
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) == "2"
+
+    summary = service.sync_accounting_changes(processed_at=processed_at, page_size=2)
+
+    assert accounting_source.requested_watermarks[-1] == "2"
+    assert summary.new_count == 2
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) == "4"
+
+
+def test_accounting_sync_stops_and_alerts_when_watermark_does_not_advance() -> None:
+    class StalledAccountingSource(FakeAccountingSource):
+        def fetch_changes_since(self, watermark: Optional[str], limit: int) -> SourceChangeBatch:
+            self.requested_watermarks.append(watermark)
+            return SourceChangeBatch(payloads=self._payloads[:limit], watermark="stuck", has_more=True)
+
+    processed_at = datetime(2026, 2, 19, 14, 0, 0)
+    accounting_source = StalledAccountingSource([
+        SourceInvoicePayload(source_id=f"acct-{index}", metadata=_metadata(f"INV-82{index}"),
+                             file_hash=None, received_at=processed_at)
+        for index in range(2)
+    ])
+    alerts = NoopIngestionAlertAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts,
+        accounting_source=accounting_source,
+        sync_watermarks=InMemorySyncWatermarkAdapter(),
+    )
+
+    summary = service.sync_accounting_changes(processed_at=processed_at, page_size=2)
+
+    assert accounting_source.requested_watermarks == [None, "stuck"]
+    assert summary.failed is True
+    assert summary.new_count == 2
+    assert [event.error_type for event in alerts.events] == ["watermark_stalled"]
+
+
+def test_scheduled_accounting_run_syncs_incrementally_when_watermarks_are_configured() -> None:
+    processed_at = datetime(2026, 2, 19, 14, 0, 0)
+    accounting_source = FakeAccountingSource([
+        SourceInvoicePayload(source_id=f"acct-{index}", metadata=_metadata(f"INV-83{index}"),
+                             file_hash=None, received_at=processed_at)
+        for index in range(3)
+    ])
+    watermarks = InMemorySyncWatermarkAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        accounting_source=accounting_source,
+        sync_watermarks=watermarks,
+    )
+
+    first = service.stream_accounting_sync(processed_at=processed_at, chunk_size=2)
+    second = service.stream_accounting_sync(processed_at=processed_at, chunk_size=2)
+
+    assert (first.new_count, second.new_count, second.duplicate_count) == (3, 0, 0)
+    assert accounting_source.requested_watermarks == [None, "2", "3"]
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) == "3"
+
+
+def test_redelivered_source_ids_skip_history_and_audit_writes() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    audit_log = FakeAuditLog()
+    processed_at = datetime(2026, 2, 19, 15, 0, 0)
+    service = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        audit_log=audit_log,
+        processed_source_ids=InMemoryProcessedSourceIdIndexAdapter(),
+    )
+    first = SourceInvoicePayload(source_id="mail-1", metadata=_metadata("INV-820"), file_hash=None,
+                                 received_at=processed_at)
+    other = SourceInvoicePayload(source_id="mail-2", metadata=_metadata("INV-821"), file_hash=None,
+                                 received_at=processed_at)
+
+    service.ingest_many(source=IngestionSource.AP_EMAIL, payloads=[first], processed_at=processed_at)
+    redelivered = service.ingest_many(
+        source=IngestionSource.AP_EMAIL,
+        payloads=[first, other, replace(first, source_id="mail-3")],
+        processed_at=processed_at,
+    )
+    single = service.ingest_ap_email_invoice(
+        source_id="mail-1", metadata=first.metadata, file_hash=None, processed_at=processed_at)
+    from_accounting = service.ingest_accounting_invoice(
+        source_id="mail-1", metadata=first.metadata, file_hash=None, processed_at=processed_at)
+
+    assert [invoice.metadata.invoice_number for invoice in redelivered] == ["INV-820", "INV-821", "INV-820"]
+    assert single.dedupe_key == redelivered[0].dedupe_key
+    assert [event.status for event in from_accounting.history] == [
+        "ingested:mail-1", "duplicate_seen:mail-3", "duplicate_seen:mail-1"]
+    assert [event.status for event in audit_log.events] == [
+        "ingested:mail-1", "ingested:mail-2", "duplicate_seen:mail-3", "duplicate_seen:mail-1"]
+
+
+def test_redelivered_source_ids_are_answered_without_reading_the_repository() -> None:
+    class CountingReads(InMemoryIntakeRepositoryAdapter):
+        def __init__(self) -> None:
+            super().__init__()
+            self.reads = 0
+
+        def find_many_by_dedupe_keys(self, dedupe_keys):
+            self.reads += 1
+            return super().find_many_by_dedupe_keys(dedupe_keys)
+
+    repository = CountingReads()
+    processed_at = datetime(2026, 2, 19, 15, 0, 0)
+    service = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        processed_source_ids=InMemoryProcessedSourceIdIndexAdapter(),
+    )
+    payloads = [
+        SourceInvoicePayload(source_id=f"mail-{number}", metadata=_metadata(f"INV-84{number}"), file_hash=None,
+                             received_at=processed_at)
+        for number in range(3)
+    ]
+
+    first = service.ingest_many(source=IngestionSource.AP_EMAIL, payloads=payloads, processed_at=processed_at)
+    reads = repository.reads
+    replayed = service.ingest_many(source=IngestionSource.AP_EMAIL, payloads=payloads, processed_at=processed_at)
+
+    assert repository.reads == reads
+    assert [invoice.dedupe_key for invoice in replayed] == [invoice.dedupe_key for invoice in first]
+
+
+def test_corrected_content_under_a_processed_source_id_is_ingested_again() -> None:
+    repository = InMemoryIntakeRepositoryAdapter()
+    audit_log = FakeAuditLog()
+    processed_at = datetime(2026, 2, 19, 15, 0, 0)
+    original = SourceInvoicePayload(source_id="acct-1", metadata=_metadata("INV-830"), file_hash=None,
+                                    received_at=processed_at)
+    payloads = [original]
+    service = InvoiceIngestionService(
+        intake_repository=repository,
+        alert_port=NoopIngestionAlertAdapter(),
+        accounting_source=FakeAccountingSource(payloads),
+        audit_log=audit_log,
+        sync_watermarks=InMemorySyncWatermarkAdapter(),
+        processed_source_ids=InMemoryProcessedSourceIdIndexAdapter(),
+    )
+
+    service.sync_accounting_changes(processed_at=processed_at)
+    payloads[0] = replace(original, metadata=replace(original.metadata, amount=120.0))
+    corrected = service.sync_accounting_changes(processed_at=processed_at, full_resync=True)
+    resynced = service.sync_accounting_changes(processed_at=processed_at, full_resync=True)
+    replayed = service.ingest_many(
+        source=IngestionSource.ACCOUNTING_SYSTEM, payloads=payloads, processed_at=processed_at)
+
+    assert (corrected.new_count, resynced.duplicate_count) == (1, 1)
+    assert replayed[0].metadata.amount == 120.0
+    assert [invoice.metadata.amount for invoice in repository.list_by_source_sorted(None, newest_first=False)] == [
+        100.0, 120.0]
+    assert [event.status for event in audit_log.events] == [
+        "ingested:acct-1", "ingested:acct-1", "duplicate_seen:acct-1"]
+
+
+class SlowSource(FakeAccountingSource):
+    def __init__(
+        self,
+        payloads: list[SourceInvoicePayload],
+        release: Optional[threading.Event] = None,
+        overlap: Optional[threading.Barrier] = None,
+    ) -> None:
+        super().__init__(payloads)
+        self._release = release
+        self._overlap = overlap
+        self.calls = 0
+
+    def fetch_new_invoices(self, timeout: Optional[float] = None) -> list[SourceInvoicePayload]:
+        # Ignores `timeout`, like a client that cannot be interrupted.
+        self.calls += 1
+        if self._release is not None:
+            self._release.wait(timeout=5)
+        if self._overlap is not None:
+            try:
+                self._overlap.wait(timeout=5)
+            except threading.BrokenBarrierError as exc:
+                raise RuntimeError("fetches did not overlap") from exc
+        return super().fetch_new_invoices()
+
+
+def test_process_all_sources_fetches_concurrently_and_dedupes_across_sources() -> None:
+    processed_at = datetime(2026, 2, 19, 16, 0, 0)
+    shared = SourceInvoicePayload(source_id="src-1", metadata=_metadata("INV-830"), file_hash=None,
+                                  received_at=processed_at)
+    # Each fetch waits at the barrier until the other one arrives, so both only finish if they overlap.
+    overlap = threading.Barrier(2)
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        ap_email_source=SlowSource([shared], overlap=overlap),
+        accounting_source=SlowSource([shared, replace(shared, metadata=_metadata("INV-831"))], overlap=overlap),
+    )
+
+    reports = service.process_all_sources(processed_at=processed_at)
+
+    assert [report.source for report in reports] == [IngestionSource.AP_EMAIL, IngestionSource.ACCOUNTING_SYSTEM]
+    assert all(report.fetch_seconds >= 0.0 and report.ingest_seconds >= 0.0 for report in reports)
+    assert sum(report.new_count for report in reports) == 2
+    assert sum(report.duplicate_count for report in reports) == 1
+    assert not any(report.failed or report.timed_out for report in reports)
+
+
+def test_process_all_sources_reports_slow_and_failing_sources_without_blocking_others() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    processed_at = datetime(2026, 2, 19, 16, 0, 0)
+    release = threading.Event()
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts,
+        ap_email_source=FakeApEmailSource([
+            SourceInvoicePayload(source_id="mail-1", metadata=_metadata("INV-840"), file_hash=None,
+                                 received_at=processed_at),
+        ]),
+        accounting_source=SlowSource([], release=release),
+    )
+
+    try:
+        ap_report, accounting_report = service.process_all_sources(
+            processed_at=processed_at, timeouts={IngestionSource.ACCOUNTING_SYSTEM: 0.05})
+    finally:
+        release.set()
+    failing = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts,
+        accounting_source=FailingAccountingSource(),
+    )
+
+    assert (ap_report.new_count, ap_report.timed_out) == (1, False)
+    assert (accounting_report.timed_out, accounting_report.new_count) == (True, 0)
+    assert failing.process_all_sources(processed_at=processed_at)[0].failed is True
+    assert [event.error_type for event in alerts.events] == ["fetch_timeout", "fetch_failed"]
+
+
+def test_process_all_sources_keeps_a_late_fetch_for_the_next_run_instead_of_fetching_again() -> None:
+    alerts = NoopIngestionAlertAdapter()
+    processed_at = datetime(2026, 2, 19, 16, 0, 0)
+    release = threading.Event()
+    accounting_source = SlowSource([
+        SourceInvoicePayload(source_id="acct-1", metadata=_metadata("INV-850"), file_hash=None,
+                             received_at=processed_at),
+    ], release=release)
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=alerts,
+        accounting_source=accounting_source,
+    )
+
+    try:
+        (timed_out,) = service.process_all_sources(processed_at=processed_at, default_timeout=0.05)
+        (still_running,) = service.process_all_sources(processed_at=processed_at, default_timeout=0.05)
+    finally:
+        release.set()
+    (late,) = service.process_all_sources(processed_at=processed_at)
+    calls_before_next_fetch = accounting_source.calls
+    (fresh,) = service.process_all_sources(processed_at=processed_at)
+
+    assert (timed_out.timed_out, still_running.timed_out) == (True, True)
+    assert calls_before_next_fetch == 1
+    assert (late.timed_out, late.new_count) == (False, 1)
+    assert (fresh.new_count, fresh.duplicate_count, accounting_source.calls) == (0, 1, 2)
+    assert [event.error_type for event in alerts.events] == ["fetch_timeout"]
+
+
+def test_process_all_sources_pulls_accounting_changes_from_the_watermark_when_configured() -> None:
+    processed_at = datetime(2026, 2, 19, 16, 0, 0)
+    payloads = [
+        SourceInvoicePayload(source_id=f"acct-{index}", metadata=_metadata(f"INV-86{index}"), file_hash=None,
+                             received_at=processed_at)
+        for index in range(3)
+    ]
+    accounting_source = SlowSource(payloads)
+    watermarks = InMemorySyncWatermarkAdapter()
+    service = InvoiceIngestionService(
+        intake_repository=InMemoryIntakeRepositoryAdapter(),
+        alert_port=NoopIngestionAlertAdapter(),
+        accounting_source=accounting_source,
+        sync_watermarks=watermarks,
+    )
+
+    (first,) = service.process_all_sources(processed_at=processed_at)
+    (second,) = service.process_all_sources(processed_at=processed_at)
+
+    assert (first.new_count, second.new_count, second.duplicate_count) == (3, 0, 0)
+    assert accounting_source.calls == 0
+    assert accounting_source.requested_watermarks == [None, "3"]
+    assert watermarks.load(IngestionSource.ACCOUNTING_SYSTEM) == "3"
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from common.ingestion_types import InvoiceMetadata
+from domain.near_duplicate_policy import NearDuplicatePolicy
+
+
+def _metadata(invoice_number: str, supplier: str, amount: float = 120.0, day: int = 10) -> InvoiceMetadata:
+    return InvoiceMetadata(invoice_number=invoice_number, supplier=supplier, amount=amount, invoice_date=datetime(2026, 2, day))
+
+
+def test_near_duplicate_policy_blocks_on_supplier_token_and_amount() -> None:
+    assert NearDuplicatePolicy.blocking_key(_metadata("INV-001", "Acme Ltd")) == "acme|12000"
+    assert NearDuplicatePolicy.blocking_key(_metadata("INV001", "ACME Limited")) == "acme|12000"
+    assert NearDuplicatePolicy.supplier_token("Blue Sky Trading Co.") == "blueskytrading"
+
+
+def test_near_duplicate_policy_matches_formatting_and_one_day_drift() -> None:
+    original = _metadata("INV-001", "Acme Ltd")
+
+    assert NearDuplicatePolicy.matches(original, _metadata("inv 001", "ACME Limited", day=11))
+    assert not NearDuplicatePolicy.matches(original, _metadata("INV-001", "Acme Ltd", day=12))
+    assert not NearDuplicatePolicy.matches(original, _metadata("INV-002", "Acme Ltd"))
+    assert not NearDuplicatePolicy.matches(original, _metadata("INV-001", "Acme Ltd", amount=120.5))
+    assert not NearDuplicatePolicy.matches(_metadata("", "Acme Ltd"), _metadata("", "Acme Ltd"))
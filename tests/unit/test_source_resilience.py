@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from common.source_resilience import CircuitBreaker, CircuitOpenError, CircuitState, RetryPolicy, call_resilient
+
+
+def test_retry_policy_caps_exponential_backoff_and_applies_jitter() -> None:
+    policy = RetryPolicy(max_attempts=6, base_delay=0.5, max_delay=3.0, jitter=lambda: 0.5)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.25, 0.5, 1.0, 1.5, 1.5]
+
+
+def test_call_resilient_sleeps_between_attempts_and_reraises_last_failure() -> None:
+    sleeps: list[float] = []
+    calls: list[int] = []
+
+    def operation() -> None:
+        calls.append(1)
+        raise ValueError(f"attempt {len(calls)}")
+
+    with pytest.raises(ValueError, match="attempt 3"):
+        call_resilient(operation, retry_policy=RetryPolicy(max_attempts=3, jitter=lambda: 1.0), sleep=sleeps.append)
+
+    assert sleeps == [0.2, 0.4]
+
+
+def test_half_open_circuit_admits_a_single_probe() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.acquire()
+    breaker.record_failure()
+
+    breaker.acquire()
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+def test_call_resilient_reports_each_circuit_transition_it_causes() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    transitions: list[tuple[CircuitState, CircuitState]] = []
+
+    def failing() -> None:
+        raise ValueError("upstream down")
+
+    with pytest.raises(ValueError):
+        call_resilient(failing, breaker, on_transition=lambda *change: transitions.append(change))
+    call_resilient(lambda: None, breaker, on_transition=lambda *change: transitions.append(change))
+
+    assert transitions == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]